@@ -0,0 +1,102 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# host side tooling: run the firmware in src/ under CPython
+#
+#   import host
+#   host.install()
+#   from robug_robot import robug
+#
+# install() puts the stand-ins in host/stubs (machine, micropython) and
+# src/ on sys.path and adds the MicroPython specific functions of the
+# time and asyncio modules (ticks_*, sleep_ms, sleep_us).
+# load_firmware() replaces constants of robug_constants.py before the
+# firmware is imported (host.sweep, Webots controllers).
+
+import os
+import re
+import sys
+import types
+import time
+import asyncio
+
+HOST_DIR  = os.path.dirname(os.path.abspath(__file__))
+STUBS_DIR = os.path.join(HOST_DIR, 'stubs')
+SRC_DIR   = os.path.join(os.path.dirname(HOST_DIR), 'src')
+CONSTANTS_FILE = os.path.join(SRC_DIR, 'robug_constants.py')
+
+# MicroPython ticks wrap around like on the rp2 port
+_TICKS_PERIOD = 1 << 30
+_TICKS_MAX    = _TICKS_PERIOD - 1
+_TICKS_HALF   = _TICKS_PERIOD // 2
+
+def ticks_ms():
+    return (time.perf_counter_ns() // 1000000) & _TICKS_MAX
+
+def ticks_us():
+    return (time.perf_counter_ns() // 1000) & _TICKS_MAX
+
+def ticks_cpu():
+    return time.perf_counter_ns() & _TICKS_MAX
+
+def ticks_diff(a, b):
+    return ((a - b + _TICKS_HALF) & _TICKS_MAX) - _TICKS_HALF
+
+def ticks_add(a, b):
+    return (a + b) & _TICKS_MAX
+
+def sleep_ms(ms):
+    time.sleep(ms / 1000)
+
+def sleep_us(us):
+    time.sleep(us / 1000000)
+
+def asyncio_sleep_ms(ms):
+    return asyncio.sleep(ms / 1000)
+
+def install():
+    for strPath in (SRC_DIR, STUBS_DIR):
+        if strPath not in sys.path:
+            sys.path.insert(0, strPath)
+    for strName, fn in (('ticks_ms', ticks_ms), ('ticks_us', ticks_us), ('ticks_cpu', ticks_cpu),
+                        ('ticks_diff', ticks_diff), ('ticks_add', ticks_add),
+                        ('sleep_ms', sleep_ms), ('sleep_us', sleep_us)):
+        if not hasattr(time, strName):
+            setattr(time, strName, fn)
+    if not hasattr(asyncio, 'sleep_ms'):
+        asyncio.sleep_ms = asyncio_sleep_ms
+
+def constants_source(dOverrides):
+    # robug_constants.py with the class body assignments replaced
+    with open(CONSTANTS_FILE) as f:
+        strSrc = f.read()
+    for strName, strExpr in dOverrides.items():
+        pat = re.compile(r'^(    ' + re.escape(strName) + r'\s*=).*$', re.M)
+        strSrc, n = pat.subn(lambda m: m.group(1) + ' ' + strExpr, strSrc, count=1)
+        if n == 0:
+            raise KeyError('no constant ' + strName + ' in robug_constants.py')
+    return strSrc
+
+def load_firmware(dOverrides):
+    # drop the firmware modules and load the constants with the overrides,
+    # the next import of the firmware sees them
+    for strName, mod in list(sys.modules.items()):
+        strFile = getattr(mod, '__file__', None) or ''
+        if strName in ('host.sim', 'host.webots') or os.path.dirname(os.path.abspath(strFile)) == SRC_DIR:
+            del sys.modules[strName]
+    mod = types.ModuleType('robug_constants')
+    mod.__file__ = CONSTANTS_FILE
+    exec(compile(constants_source(dOverrides), CONSTANTS_FILE, 'exec'), mod.__dict__)
+    sys.modules['robug_constants'] = mod
@@ -0,0 +1,437 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# host benchmarks of the firmware hot paths
+#
+#   python -m host.bench              run and compare with host/bench_baseline.json
+#   python -m host.bench --update     run and write the baseline
+#   python -m host.bench ik.solve     run selected benchmarks only
+#
+# every benchmark reports ops/sec (best of several runs), a score (ops/sec
+# relative to a fixed reference workload, see measure_speed) and the memory
+# allocated per op: the transient peak and the bytes still held after the
+# op (tracemalloc). the run fails (exit code 1) if the score of a benchmark
+# drops below the baseline by more than the tolerance or it allocates more.
+# the score mostly cancels out the host speed, refresh the baseline with
+# --update after intended changes or when switching python versions.
+
+import os
+import sys
+import json
+import time
+from math import sqrt
+import argparse
+import tracemalloc
+import contextlib
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import host
+host.install()
+
+from robug_constants import constants as c
+from robug_utils import v3
+from robug_ik import rbik
+from robug_gait import rbgait
+from robug_com import rbcom
+from robug_chan import rbchan
+from robug_robot import robug
+from robug_mocon import rbmocon
+from robug_sched import rbsched, rbfakeclock
+
+BASELINE_FILE = os.path.join(host.HOST_DIR, 'bench_baseline.json')
+
+# default allowed slow down vs. baseline
+TOLERANCE = 0.20
+
+# allocation increase that is ignored (bytes per op), tracemalloc noise
+ALLOC_SLACK = 64
+
+############################
+## benchmark setup
+############################
+
+def run_coro(coro):
+    # drive a coroutine without event loop: on the virtual clock the
+    # firmware only yields with sleep(0), so the loop overhead of
+    # asyncio.run() stays out of the numbers
+    try:
+        while True:
+            coro.send(None)
+    except StopIteration as e:
+        return e.value
+
+class null_out:
+    # discards output without buffering (no allocations of its own)
+    def write(self, s):
+        return len(s)
+    def flush(self):
+        pass
+
+NULL_OUT = null_out()
+
+def quiet():
+    # the firmware prints on the console, keep it out of the timing
+    return contextlib.redirect_stdout(NULL_OUT)
+
+def new_robot(bSoA=c._STATE_SOA):
+    # robot in start position with the motion controller on a virtual clock
+    with quiet():
+        r = robug(bSoA)
+        m = rbmocon(r, rbchan())
+    m.sched = rbsched(c._GAIT_LOOP_TIME * 1000, c._SCHED_POLICY, rbfakeclock(),
+                      c._SCHED_MAX_CATCHUP)
+    r.set_scheduler(m.sched)
+    if m.prof:
+        m.prof.sched = m.sched
+    r.reset_loop_counter()
+    r.calculate_foot_positions()
+    r.solve_ik()
+    r.set_joints()
+    return r, m
+
+def walk_to_support_end(m):
+    # gait loop frames of rbmocon.run() until leg 0 ends its support phase
+    r = m.r
+    while True:
+        r.inc_loop_counters()
+        r.calculate_foot_positions(bAbs=False)
+        r.solve_ik_gait()
+        r.set_joints()
+        if r.is_support_end(0):
+            break
+
+def neutral_stance(m):
+    # the pose the supervisor starts from (rbctrl.init_pose: resume, stop)
+    m.set_direction(rbcom.SUB_FWD)
+    walk_to_support_end(m)
+    with quiet():
+        run_coro(m.stop_animation(rbcom.SUB_FWD))
+
+def gait_points():
+    # foot positions in leg space over one gait cycle of all legs
+    lPoints = []
+    for i in range(4):
+        g = rbgait(i)
+        g.set_loop_counter(g.substeps-1)
+        for _ in range(g.substeps):
+            g.loop_inc()
+            g.calc_substep_z(False)
+            g.calc_substep_x(False)
+            lPoints.append(v3(g.xyz.x + c._GAIT_FOOT_X_OFFSET[i], 0, g.xyz.z))
+    return lPoints
+
+def bench_ik_solve():
+    ik = rbik()
+    lPoints = gait_points()
+    n = len(lPoints)
+    k = [0]
+    def op():
+        ik.solve(lPoints[k[0] % n])
+        k[0] += 1
+    return op
+
+def bench_ik_solve_legs():
+    r, m = new_robot()
+    def op():
+        r.solve_ik()
+    return op
+
+def bench_gait_substep():
+    g = rbgait(0)
+    g.set_loop_counter(0)
+    def op():
+        g.loop_inc()
+        g.calc_substep_z(False)
+        g.calc_substep_x(False)
+    return op
+
+def bench_robug_tick(bSoA=False):
+    # one frame of the gait loop in rbmocon.run()
+    r, m = new_robot(bSoA)
+    r.set_direction(1, 'x')
+    def op():
+        r.inc_loop_counters()
+        r.calculate_foot_positions(bAbs=False)
+        r.solve_ik_gait()
+        r.set_joints()
+    return op
+
+def bench_robug_tick_soa():
+    # same on the struct of arrays state (robug_state)
+    return bench_robug_tick(True)
+
+def bench_robug_idle_frame():
+    # frame of a standing robot: top-of-loop set_joints(), ticks unchanged
+    r, m = new_robot()
+    r.set_joints()
+    def op():
+        r.set_joints()
+    return op
+
+def bench_robug_phase_query():
+    # the phase checks rbmocon.run() polls while waiting for transitions
+    r, m = new_robot()
+    r.set_direction(1, 'x')
+    r.inc_loop_counters()
+    def op():
+        r.is_support_end(0)
+        r.is_support_start(0)
+        r.is_stable()
+        r.is_swing_phase_any()
+    return op
+
+def bench_mocon(strName, fnAnim):
+    # one op = one animation on the virtual clock (no real sleeping)
+    def setup():
+        r, m = new_robot()
+        neutral_stance(m)
+        def op():
+            with quiet():
+                run_coro(fnAnim(m))
+        return op
+    return strName, setup
+
+async def anim_start_stop(m):
+    # start pose, walk until the stop condition of rbmocon.run(), stop pose
+    await m.start_animation(rbcom.SUB_FWD)
+    walk_to_support_end(m)
+    await m.stop_animation(rbcom.SUB_FWD)
+
+async def anim_sit_stand(m):
+    # stand up first: sitting down from the neutral stance at the current
+    # _GAIT_HEIGHT would move the feet out of reach
+    await m.stand_up()
+    await m.sit_down()
+
+async def anim_turn(m):
+    await m.turn_l()
+    await m.turn_r()
+
+async def anim_kick(m):
+    await m.kick(rbcom.SUB_NA)
+
+async def anim_purr(m):
+    await m.purr()
+
+async def anim_rotate(m):
+    await m.rotate_body( 15)
+    await m.rotate_body(-15)
+
+# every message the supervisor can send
+COM_MESSAGES = ['START_POSE_FWD', 'START_POSE_BWD', 'RESUME_FWD', 'RESUME_BWD', 'PAUSE',
+                'STOP_POSE_FWD', 'STOP_POSE_BWD', 'TURN_LFT', 'TURN_RGT', 'WALK_LFT',
+                'WALK_RGT', 'WALK_STRGT', 'LIFT_LEGS', 'PUSH_LEGS', 'LOOK_DOWN', 'LOOK_UP',
+                'SIT_DOWN', 'STAND_UP', 'PURR', 'SHIFT_COM_FWD', 'SHIFT_COM_BWD',
+                'KICK', 'EXIT', 'UNKNOWN_MSG', '_NOP_']
+
+def bench_com(lMsg):
+    # one op = one message posted and decoded, idle polls included
+    chan = rbchan()
+    com = rbcom(chan)
+    n = len(lMsg)
+    k = [0]
+    def op():
+        msg = lMsg[k[0] % n]
+        seq = chan.post(msg) if msg != '_NOP_' else None
+        with quiet():
+            com.get_command()
+        # the motion controller replies in the full loop, drop the slot here
+        chan.dPending.pop(seq, None)
+        k[0] += 1
+    return op
+
+def bench_com_get_command():
+    # message strings (rbctrl before translation, compatibility path)
+    return bench_com(COM_MESSAGES)
+
+def bench_com_get_command_op():
+    # int codes as sent by rbctrl
+    return bench_com([rbcom.encode_msg(strMsg) if strMsg != '_NOP_' else strMsg
+                      for strMsg in COM_MESSAGES])
+
+def bench_com_idle():
+    # empty queue, the path taken in almost every frame
+    com = rbcom(rbchan())
+    def op():
+        com.get_command()
+    return op
+
+BENCHMARKS = [
+    ('ik.solve',          bench_ik_solve),
+    ('ik.solve_legs',     bench_ik_solve_legs),
+    ('gait.substep',      bench_gait_substep),
+    ('robug.tick',        bench_robug_tick),
+    ('robug.tick_soa',    bench_robug_tick_soa),
+    ('robug.idle_frame',  bench_robug_idle_frame),
+    ('robug.phase_query', bench_robug_phase_query),
+    bench_mocon('mocon.start_stop', anim_start_stop),
+    bench_mocon('mocon.sit_stand',  anim_sit_stand),
+    bench_mocon('mocon.turn',       anim_turn),
+    bench_mocon('mocon.kick',       anim_kick),
+    bench_mocon('mocon.purr',       anim_purr),
+    bench_mocon('mocon.rotate',     anim_rotate),
+    ('com.get_command',   bench_com_get_command),
+    ('com.get_command_op', bench_com_get_command_op),
+    ('com.idle',          bench_com_idle),
+]
+
+############################
+## measurement
+############################
+
+def ref_op():
+    # fixed pure python workload (float math, attribute and list access)
+    # as reference for the speed of the host
+    a = [0.5, 1.5, 2.5, 3.5]
+    x = 0.0
+    for i in range(4):
+        x += sqrt(a[i] * a[i] + 1.0) * 0.5
+    return x
+
+def calibrate(op, fTime):
+    # number of ops that take about fTime
+    n = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(n):
+            op()
+        dt = time.perf_counter() - t0
+        if dt >= fTime / 4:
+            break
+        n *= 4
+    return max(1, int(n * fTime / max(dt, 1e-9)))
+
+def timed(op, n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        op()
+    return n / (time.perf_counter() - t0)
+
+def measure_speed(op, fMinTime=0.05, iRuns=21):
+    # best ops/sec of iRuns, and the score: ops/sec relative to the
+    # reference workload, timed right after every run and taken as median.
+    # the score compensates for host speed and load changes during the run
+    n = calibrate(op, fMinTime)
+    nRef = calibrate(ref_op, fMinTime / 4)
+    fBest = 0.0
+    lScore = []
+    for _ in range(iRuns):
+        fOps = timed(op, n)
+        fBest = max(fBest, fOps)
+        lScore.append(fOps / timed(ref_op, nRef))
+    lScore.sort()
+    return fBest, lScore[len(lScore)//2]
+
+def measure_alloc(op, iOps=50):
+    # transient peak and retained bytes per op, after warm up
+    for _ in range(5):
+        op()
+    tracemalloc.start()
+    try:
+        iPeak = 0
+        iStart = tracemalloc.get_traced_memory()[0]
+        for _ in range(iOps):
+            iBefore = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            op()
+            iPeak = max(iPeak, tracemalloc.get_traced_memory()[1] - iBefore)
+        iRetained = (tracemalloc.get_traced_memory()[0] - iStart) / iOps
+    finally:
+        tracemalloc.stop()
+    return iPeak, round(iRetained, 1)
+
+def run(lNames=None, bQuick=False):
+    dResults = {}
+    for strName, setup in BENCHMARKS:
+        if lNames and strName not in lNames:
+            continue
+        op = setup()
+        fOps, fScore = measure_speed(op, iRuns=5 if bQuick else 21)
+        iPeak, fRetained = measure_alloc(op, iOps=10 if bQuick else 50)
+        dResults[strName] = {'ops_per_sec': round(fOps, 1),
+                             'score': round(fScore, 6),
+                             'alloc_peak_bytes': iPeak,
+                             'alloc_retained_bytes': fRetained}
+        print('{:<20}{:>14.1f} ops/s {:>10} B peak {:>10} B retained'.format(
+              strName, fOps, iPeak, fRetained))
+    return dResults
+
+def compare(dResults, dBaseline, fTolerance):
+    # list of regressions vs. baseline
+    lFailed = []
+    for strName, dRes in dResults.items():
+        dRef = dBaseline.get(strName)
+        if dRef is None:
+            print('{:<20} no baseline'.format(strName))
+            continue
+        fRatio = dRes['score'] / dRef['score']
+        strMsg = '{:<20}{:>+8.1f} % speed'.format(strName, (fRatio-1)*100)
+        if fRatio < 1 - fTolerance:
+            lFailed.append(strName)
+            strMsg += '  SLOWER'
+        for strKey in ('alloc_peak_bytes', 'alloc_retained_bytes'):
+            if dRes[strKey] > dRef[strKey] + ALLOC_SLACK:
+                lFailed.append(strName)
+                strMsg += '  MORE ALLOC ({}: {} -> {})'.format(strKey, dRef[strKey], dRes[strKey])
+        print(strMsg)
+    return lFailed
+
+def main():
+    parser = argparse.ArgumentParser(description='RoBug firmware hot path benchmarks')
+    parser.add_argument('names', nargs='*', help='benchmarks to run (default: all)')
+    parser.add_argument('--update', action='store_true', help='write results as new baseline')
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help='allowed slow down as fraction (default %(default)s)')
+    parser.add_argument('--quick', action='store_true', help='short runs, smoke test only')
+    args = parser.parse_args()
+
+    dResults = run(args.names, args.quick)
+
+    if args.quick:
+        # short runs are not comparable with the baseline of full runs
+        if args.update:
+            print('--quick results are not written as baseline')
+            return 1
+        print('OK')
+        return 0
+    if args.update:
+        dBaseline = {}
+        if args.names and os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                dBaseline = json.load(f)['results']
+        dBaseline.update(dResults)
+        with open(args.baseline, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'results': dBaseline}, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print('baseline written to', args.baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('no baseline, run with --update first')
+        return 0
+    with open(args.baseline) as f:
+        dBaseline = json.load(f)['results']
+    print()
+    lFailed = compare(dResults, dBaseline, args.tolerance)
+    if lFailed:
+        print('FAILED:', ', '.join(sorted(set(lFailed))))
+        return 1
+    print('OK')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# session replay on the headless clock (robug_replay)
+#
+#   python -m host.replay                    replay host/sessions/*.rbl
+#   python -m host.replay robot.rbl          replay other session logs
+#   python -m host.replay --record           record the host.sim scripts
+#   python -m host.replay --record walk turn   ... some of them
+#
+# a session log holds the commands with the frame they became visible to
+# the motion controller in and a digest of the frame stream (staged servo
+# duties, per chunk of c._REC_CHUNK frames). the replay feeds the commands
+# to an unmodified rbmocon.run() on the virtual clock and compares the
+# digests: any change of a duty in any frame fails, with the first chunk
+# that differs. the sessions in host/sessions are regression tests for
+# performance work on gait, ik and motion controller; record them again
+# after intended changes of the motion.
+# sessions recorded on the robot replay on the robot (rbreplayer in the
+# app); on the host they only match if calibration and float results agree.
+
+import os
+import sys
+import glob
+import time
+import asyncio
+import argparse
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import host
+host.install()
+
+from robug_constants import constants as c
+from robug_replay import rbrecorder, rbreplayer
+from host.sim import rbsim, SCRIPTS
+
+SESSIONS_DIR = os.path.join(host.HOST_DIR, 'sessions')
+
+def record(strScript, bSoA=c._STATE_SOA):
+    # session log of a host.sim script
+    sim = rbsim(bSoA)
+    rec = rbrecorder(sim.r, sim.m.sched, sim.chan)
+    sim.run(SCRIPTS[strScript])
+    return rec.pack()
+
+def replay(data, bSoA=c._STATE_SOA):
+    # result of rbreplayer: match, frames, recorded, diverged_frame
+    sim = rbsim(bSoA)
+    rp = rbreplayer(sim.r, sim.m.sched, sim.chan, data)
+    rp.start()
+    with sim.quiet():
+        asyncio.run(sim.m.run())
+    return rp.result()
+
+# --------------------------------------------------------
+# command line
+# --------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description='RoBug session replay')
+    parser.add_argument('sessions', nargs='*', help='session logs (default: host/sessions/*.rbl)')
+    parser.add_argument('--record', nargs='*', metavar='SCRIPT',
+                        help='record host.sim scripts into host/sessions (all if none given)')
+    parser.add_argument('--soa', action='store_true', help='struct of arrays state (_STATE_SOA)')
+    args = parser.parse_args()
+    bSoA = args.soa or c._STATE_SOA
+
+    if args.record is not None:
+        lScripts = args.record or list(SCRIPTS)
+        for strScript in lScripts:
+            if strScript not in SCRIPTS:
+                print('unknown script:', strScript)
+                return 1
+        os.makedirs(SESSIONS_DIR, exist_ok=True)
+        for strScript in lScripts:
+            data = record(strScript, bSoA)
+            strPath = os.path.join(SESSIONS_DIR, strScript + '.rbl')
+            with open(strPath, 'wb') as f:
+                f.write(data)
+            iChunk, iFrames, lCmd, lDigest = rbrecorder.unpack(data)
+            print('{:24s} {:6d} frames {:3d} commands {:5d} bytes'.format(
+                  os.path.relpath(strPath), iFrames, len(lCmd), len(data)))
+        return 0
+
+    lPaths = args.sessions or sorted(glob.glob(os.path.join(SESSIONS_DIR, '*.rbl')))
+    if not lPaths:
+        print('no sessions, see --record')
+        return 1
+    bOk = True
+    for strPath in lPaths:
+        with open(strPath, 'rb') as f:
+            data = f.read()
+        t0 = time.perf_counter()
+        d = replay(data, bSoA)
+        fWall = time.perf_counter() - t0
+        if d['match']:
+            strResult = 'OK'
+        else:
+            bOk = False
+            strResult = 'DIFFERS from frame {}'.format(d['diverged_frame'])
+        print('{:24s} {:6d} frames {:6.2f} s  {}'.format(os.path.basename(strPath), d['recorded'],
+              fWall, strResult))
+    print('OK' if bOk else 'FAILED')
+    return 0 if bOk else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
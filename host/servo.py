@@ -0,0 +1,118 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# host servo output backend: records committed duty frames
+#
+#   python -m host.servo                 walk, skew of the pwm and batch backends
+#   python -m host.servo --frames 2000
+#
+# rbservo_rec stands in for the servo hardware. every commit is recorded
+# with the time of the frame (clock, e.g. the virtual clock of rbsched),
+# the duties of all channels and the mask of the channels written.
+# optionally a pwm backend (rbservo_pwm / rbservo_batch on the machine
+# stubs) is driven as well: the write times of its channels give the
+# update skew of the frame, i.e. the time between the first and the last
+# servo taking the new frame.
+
+import os
+import sys
+import argparse
+from collections import deque
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import host
+host.install()
+
+from robug_constants import constants as c
+from robug_servo import rbservo, rbservo_pwm, rbservo_batch
+
+############################
+## class rbservo_rec
+############################
+class rbservo_rec(rbservo):
+
+    def __init__(self, backend=None, clock=None, iFrames=4096):
+        super().__init__()
+        self.backend = backend
+        self.clock = clock if clock is not None else host.ticks_us
+        # (t_us, duties, mask, skew_ns) per commit that wrote channels
+        self.lFrames = deque((), iFrames)
+
+    def output(self, iMask):
+        iSkew = 0
+        if self.backend is not None:
+            b = self.backend
+            for ch in range(self.n):
+                b.lOut[ch] = self.lOut[ch]
+            b.output(iMask)
+            lT = [b.lPwm[ch].iTimeNs for ch in range(self.n) if iMask & (1 << ch)]
+            iSkew = max(lT) - min(lT)
+        self.lFrames.append((self.clock(), tuple(self.lOut), iMask, iSkew))
+
+    def deinit(self, ch=None):
+        if self.backend is not None:
+            self.backend.deinit(ch)
+        super().deinit(ch)
+
+    def skew(self):
+        # (max, mean) update skew in ns over frames writing more than one channel
+        lSkew = [f[3] for f in self.lFrames if f[2] & (f[2]-1)]
+        if not lSkew:
+            return 0, 0.0
+        return max(lSkew), sum(lSkew) / len(lSkew)
+
+    def intervals(self):
+        # time between consecutive recorded frames (us)
+        lT = [f[0] for f in self.lFrames]
+        return [b - a for a, b in zip(lT, lT[1:])]
+
+    def channel(self, ch):
+        # (t_us, duty) of every write of one channel
+        return [(f[0], f[1][ch]) for f in self.lFrames if f[2] & (1 << ch)]
+
+# --------------------------------------------------------
+# update skew of the backends during a walk
+# --------------------------------------------------------
+
+def walk(backend, iFrames):
+    from host.bench import new_robot
+    r, m = new_robot()
+    rec = rbservo_rec(backend, m.sched.clock.ticks_us)
+    r.set_servo(rec)
+    r.set_direction(1, 'x')
+    for _ in range(iFrames):
+        r.inc_loop_counters()
+        r.calculate_foot_positions(bAbs=False)
+        r.solve_ik_gait()
+        r.set_joints()
+        m.sched.clock.advance(m.sched.iPeriod)
+    return rec
+
+def main():
+    parser = argparse.ArgumentParser(description='RoBug servo backend update skew')
+    parser.add_argument('--frames', type=int, default=1000)
+    args = parser.parse_args()
+    for strName, cls in (('pwm', rbservo_pwm), ('batch', rbservo_batch)):
+        rec = walk(cls(), args.frames)
+        iMax, fMean = rec.skew()
+        lInt = rec.intervals()
+        print('{:8s} frames {:5d}  writes {:6d}  saved {:6d}  skew max {:7.1f} us  mean {:6.1f} us  period {} us'.format(
+              strName, len(rec.lFrames), rec.iWrites, rec.iSaved, iMax / 1000, fMean / 1000,
+              min(lInt) if lInt else 0))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
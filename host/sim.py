@@ -0,0 +1,328 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# headless kinematic simulator: the firmware in src/ on CPython
+#
+#   python -m host.sim                      walk script, summary
+#   python -m host.sim turn --csv turn.csv  other script, all frames as csv
+#   python -m host.sim --list               available scripts
+#
+# rbsim runs the unmodified motion controller (rbmocon.run) together with a
+# scripted supervisor on the virtual clock of rbsched (rbfakeclock): a frame
+# takes as long as the host needs to compute it, not c._GAIT_LOOP_TIME.
+# at the end of every frame the joint ticks, the foot positions (leg space)
+# and a kinematic estimate of the body pose are recorded.
+#
+# body pose: the feet within CONTACT_MM of the lowest foot are on the
+# ground and do not slip. height is the mean distance of the body pivot
+# above them, pitch follows from front vs. rear feet, and the body moves
+# by the mean x motion of the feet that stay on the ground between frames.
+# no dynamics: a pose the real robot would tip over from is not detected.
+
+import os
+import sys
+import time
+import math
+import asyncio
+import argparse
+import contextlib
+from array import array
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import host
+host.install()
+
+from robug_constants import constants as c
+from robug_com import rbcom
+from robug_chan import rbchan
+from robug_robot import robug
+from robug_mocon import rbmocon
+from robug_sched import rbsched, rbfakeclock
+
+# supervisor scripts: strings are commands (rbcom.MSG, 'SPEED_<pct>',
+# 'MOTION_<name>'), ints wait that many ms of virtual time
+SCRIPTS = {
+    'walk':     ['START_POSE_FWD', 'RESUME_FWD', 3000, 'STOP_POSE_FWD'],
+    'walk_bwd': ['START_POSE_BWD', 'RESUME_BWD', 3000, 'STOP_POSE_BWD'],
+    'curve':    ['START_POSE_FWD', 'RESUME_FWD', 'WALK_LFT', 2000, 'WALK_RGT', 2000,
+                 'WALK_STRGT', 'STOP_POSE_FWD'],
+    'speed':    ['START_POSE_FWD', 'RESUME_FWD', 'SPEED_50', 2000, 'SPEED_100', 2000,
+                 'STOP_POSE_FWD'],
+    'turn':     ['TURN_LFT', 'TURN_RGT'],
+    'motions':  ['STAND_UP', 'SIT_DOWN', 'STAND_UP', 'PURR', 'KICK', 'LOOK_DOWN', 'LOOK_UP'],
+    'primitives': ['MOTION_shift_com_fwd', 'MOTION_shift_com_bwd', 'MOTION_attack', 'MOTION_kick'],
+}
+
+# start of every run, as rbctrl.init_pose()
+SCRIPT_INIT = ['RESUME_FWD', 100, 'STOP_POSE_FWD']
+
+# foot height above the lowest foot still taken as ground contact
+CONTACT_MM = 2.0
+
+class null_out:
+    def write(self, s):
+        return len(s)
+    def flush(self):
+        pass
+
+############################
+## class rbsimsched
+############################
+class rbsimsched(rbsched):
+
+    # frame scheduler on the virtual clock (or the clock given, host.webots),
+    # records the robot state at the end of every frame
+
+    def __init__(self, sim, clock=None):
+        super().__init__(c._GAIT_LOOP_TIME * 1000, c._SCHED_POLICY,
+                         rbfakeclock() if clock is None else clock, c._SCHED_MAX_CATCHUP)
+        self.sim = sim
+
+    async def wait(self):
+        self.sim.record()
+        return await super().wait()
+
+############################
+## class rbsim
+############################
+class rbsim:
+
+    # per frame row: time, body pose, joint ticks (delta, gamma per leg),
+    # foot position (x, y, z per leg)
+    T     = 0
+    POSE  = 1    # x, height, pitch
+    TICKS = 4
+    FOOT  = 12
+    ROW   = 24
+
+    COLUMNS = (['t_ms', 'x', 'height', 'pitch'] +
+               ['{}_{}'.format(n, j) for n in c._GAIT_NAME for j in ('delta', 'gamma')] +
+               ['{}_{}'.format(n, a) for n in c._GAIT_NAME for a in ('x', 'y', 'z')])
+
+    def __init__(self, bSoA=c._STATE_SOA, iMaxFrames=100000, bVerbose=False, clock=None):
+        self.iMaxFrames = iMaxFrames
+        self.out = None if bVerbose else null_out()
+        with self.quiet():
+            self.r = r = robug(bSoA)
+            self.chan = rbchan()
+            self.m = m = rbmocon(r, self.chan)
+        m.sched = rbsimsched(self, clock)
+        r.set_scheduler(m.sched)
+        if m.prof:
+            m.prof.sched = m.sched
+        if m.tele:
+            m.tele.sched = m.sched
+            m.sched.tele = m.tele
+        if m.rec:
+            m.rec.sched = m.sched
+            m.sched.rec = m.rec
+        # start position, as the apps before starting the motion controller
+        r.reset_loop_counter()
+        r.calculate_foot_positions()
+        r.solve_ik()
+        r.set_joints()
+        self.aData = array('f')
+        self.aRow = array('f', bytes(4*self.ROW))
+        # body pose and the feet in body frame of the last frame
+        self.fX = 0.0
+        self.fPitch = 0.0
+        self.lFootPrev = None
+        self.task = None
+        # (frame, command) of every command sent
+        self.lMarks = []
+
+    def quiet(self):
+        # the firmware prints on the console
+        if self.out is None:
+            return contextlib.nullcontext()
+        return contextlib.redirect_stdout(self.out)
+
+    #--------------------------------
+    #-- recording -------------------
+    #--------------------------------
+
+    def feet_body(self):
+        # (x, z) of the feet relative to the body pivot
+        l = []
+        for i in range(4):
+            p = self.r.lLeg[i].foot_pos
+            l.append((c._LEG_DIR[i] * (p.x + c._DIST_PIVOT_TO_HIP.x), p.z + c._DIST_PIVOT_TO_HIP.z))
+        return l
+
+    def body_pose(self):
+        lFoot = self.feet_body()
+        zMin = min(f[1] for f in lFoot)
+        lContact = [i for i in range(4) if lFoot[i][1] - zMin < CONTACT_MM]
+        fHeight = -sum(lFoot[i][1] for i in lContact) / len(lContact)
+        lFront = [i for i in lContact if c._LEG_DIR[i] > 0]
+        lRear = [i for i in lContact if c._LEG_DIR[i] < 0]
+        if lFront and lRear:
+            xf = sum(lFoot[i][0] for i in lFront) / len(lFront)
+            zf = sum(lFoot[i][1] for i in lFront) / len(lFront)
+            xr = sum(lFoot[i][0] for i in lRear) / len(lRear)
+            zr = sum(lFoot[i][1] for i in lRear) / len(lRear)
+            # nose up: the front feet reach further down
+            self.fPitch = math.degrees(math.atan2(zr - zf, xf - xr))
+        if self.lFootPrev is not None:
+            lStay = [i for i in lContact if self.lFootPrev[i][1] - zMin < CONTACT_MM]
+            if lStay:
+                self.fX -= sum(lFoot[i][0] - self.lFootPrev[i][0] for i in lStay) / len(lStay)
+        self.lFootPrev = lFoot
+        return self.fX, fHeight, self.fPitch
+
+    def record(self):
+        sched = self.m.sched
+        if sched.iFrame >= self.iMaxFrames:
+            raise RuntimeError('frame limit reached ({})'.format(self.iMaxFrames))
+        a = self.aRow
+        a[self.T] = sched.clock.ticks_us() / 1000
+        a[self.POSE], a[self.POSE+1], a[self.POSE+2] = self.body_pose()
+        r = self.r
+        # ticks staged by the next set_joints()
+        if c._IK_BATCH:
+            for j in range(8):
+                a[self.TICKS+j] = r.aTickBuf[r.iTick0+j]
+        for i in range(4):
+            leg = r.lLeg[i]
+            if not c._IK_BATCH:
+                a[self.TICKS+2*i] = leg.deltaTicks
+                a[self.TICKS+2*i+1] = leg.gammaTicks
+            a[self.FOOT+3*i] = leg.foot_pos.x
+            a[self.FOOT+3*i+1] = leg.foot_pos.y
+            a[self.FOOT+3*i+2] = leg.foot_pos.z
+        self.aData.extend(a)
+
+    def frames(self):
+        return len(self.aData) // self.ROW
+
+    def frame(self, k):
+        return self.aData[k*self.ROW:(k+1)*self.ROW]
+
+    def column(self, strName):
+        j = self.COLUMNS.index(strName)
+        return self.aData[j::self.ROW]
+
+    def save_csv(self, strPath):
+        with open(strPath, 'w') as f:
+            f.write(','.join(self.COLUMNS) + '\n')
+            for k in range(self.frames()):
+                f.write(','.join('{:.3f}'.format(v) for v in self.frame(k)) + '\n')
+
+    #--------------------------------
+    #-- supervisor ------------------
+    #--------------------------------
+
+    def encode(self, strCmd):
+        if strCmd.startswith('SPEED_'):
+            return rbcom.encode(rbcom.OP_SPEED, rbcom.SUB_NA, int(strCmd[6:]))
+        return rbcom.encode_msg(strCmd)
+
+    async def send(self, strCmd):
+        # post a command and wait for the reply, or for the controller to fail
+        seq = self.chan.post(self.encode(strCmd))
+        reply = asyncio.ensure_future(self.chan.wait(seq))
+        await asyncio.wait([reply, self.task], return_when=asyncio.FIRST_COMPLETED)
+        if not reply.done():
+            reply.cancel()
+            self.task.result()
+            raise RuntimeError('motion controller stopped at ' + strCmd)
+        return reply.result()
+
+    async def wait_ms(self, ms):
+        # whole frames of virtual time, the controller runs meanwhile
+        sched = self.m.sched
+        iFrame = sched.iFrame + (ms * 1000 + sched.iPeriod // 2) // sched.iPeriod
+        while sched.iFrame < iFrame:
+            if self.task.done():
+                self.task.result()
+                raise RuntimeError('motion controller stopped')
+            await asyncio.sleep(0)
+
+    async def supervisor(self, lScript):
+        self.task = asyncio.create_task(self.m.run())
+        lReplies = []
+        for item in SCRIPT_INIT + list(lScript):
+            if isinstance(item, int):
+                await self.wait_ms(item)
+            else:
+                self.lMarks.append((self.m.sched.iFrame, item))
+                lReplies.append((item, await self.send(item)))
+        await self.send('EXIT')
+        await self.task
+        # without the replies of the init commands
+        return lReplies[sum(1 for item in SCRIPT_INIT if isinstance(item, str)):]
+
+    def run(self, lScript):
+        # runs the script, returns [(command, reply)] of the script commands
+        with self.quiet():
+            return asyncio.run(self.supervisor(lScript))
+
+    def summary(self):
+        n = self.frames()
+        if n == 0:
+            return {'frames': 0}
+        lX = self.column('x')
+        lH = self.column('height')
+        lP = self.column('pitch')
+        fTime = self.column('t_ms')[-1] / 1000
+        return {'frames': n, 'virtual_s': fTime, 'distance_mm': lX[-1] - lX[0],
+                'speed_mm_s': (lX[-1] - lX[0]) / fTime if fTime else 0.0,
+                'height_min': min(lH), 'height_max': max(lH),
+                'pitch_min': min(lP), 'pitch_max': max(lP),
+                'misses': self.m.sched.iMisses}
+
+# --------------------------------------------------------
+# command line
+# --------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description='RoBug headless kinematic simulator')
+    parser.add_argument('script', nargs='?', default='walk', help='script name, see --list')
+    parser.add_argument('--list', action='store_true', help='list the scripts')
+    parser.add_argument('--csv', help='write all frames to this file')
+    parser.add_argument('--soa', action='store_true', help='struct of arrays state (_STATE_SOA)')
+    parser.add_argument('--max-frames', type=int, default=100000)
+    parser.add_argument('--verbose', action='store_true', help='firmware console output')
+    args = parser.parse_args()
+
+    if args.list:
+        for strName, lScript in SCRIPTS.items():
+            print('{:10s} {}'.format(strName, ' '.join(str(s) for s in lScript)))
+        return 0
+    if args.script not in SCRIPTS:
+        print('unknown script:', args.script)
+        return 1
+
+    sim = rbsim(args.soa or c._STATE_SOA, args.max_frames, args.verbose)
+    t0 = time.perf_counter()
+    lReplies = sim.run(SCRIPTS[args.script])
+    fWall = time.perf_counter() - t0
+    for strCmd, strReply in lReplies:
+        if strReply != 'DONE':
+            print('{:16s} {}'.format(strCmd, strReply))
+    d = sim.summary()
+    print('{} frames, {:.2f} s virtual in {:.2f} s ({:.0f}x real time)'.format(
+          d['frames'], d['virtual_s'], fWall, d['virtual_s'] / fWall if fWall else 0))
+    print('body x {:.1f} mm ({:.1f} mm/s), height {:.1f}..{:.1f} mm, pitch {:.2f}..{:.2f} deg'.format(
+          d['distance_mm'], d['speed_mm_s'], d['height_min'], d['height_max'],
+          d['pitch_min'], d['pitch_max']))
+    if args.csv:
+        sim.save_csv(args.csv)
+        print('frames written to', args.csv)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,206 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# host stand-in for the MicroPython 'machine' module
+# pins, pwm and adc keep their last value so host tools can inspect them,
+# the i2c bus serves a register model of the VL53L0X distance sensor.
+
+import time
+
+############################
+## class Pin
+############################
+class Pin:
+
+    IN        = 0
+    OUT       = 1
+    OPEN_DRAIN = 2
+    PULL_UP   = 1
+    PULL_DOWN = 2
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.mode = mode
+        self.pull = pull
+        # inputs with pull up read high (touch sensors not touched)
+        self.iValue = 1 if pull == Pin.PULL_UP else 0
+        if value is not None:
+            self.iValue = value
+
+    def init(self, mode=-1, pull=-1, value=None):
+        self.__init__(self.id, mode, pull, value)
+
+    def value(self, v=None):
+        if v is None:
+            return self.iValue
+        self.iValue = 1 if v else 0
+
+    def __call__(self, v=None):
+        return self.value(v)
+
+    def on(self):
+        self.iValue = 1
+
+    def off(self):
+        self.iValue = 0
+
+    def toggle(self):
+        self.iValue ^= 1
+
+############################
+## class PWM
+############################
+class PWM:
+
+    def __init__(self, pin, freq=None, duty_u16=None):
+        self.pin = pin
+        self.iFreq = freq if freq is not None else 0
+        self.iDuty = duty_u16 if duty_u16 is not None else 0
+        # time of the last duty write (ns), host tools measure update skew
+        self.iTimeNs = 0
+
+    def freq(self, f=None):
+        if f is None:
+            return self.iFreq
+        self.iFreq = f
+
+    def duty_u16(self, d=None):
+        if d is None:
+            return self.iDuty
+        self.iDuty = d
+        self.iTimeNs = time.perf_counter_ns()
+
+    def duty_ns(self, ns=None):
+        if ns is None:
+            return int(self.iDuty * 1e9 / (self.iFreq * 65536)) if self.iFreq else 0
+        self.iDuty = int(ns * self.iFreq * 65536 / 1e9)
+
+    def deinit(self):
+        self.iDuty = 0
+
+############################
+## class ADC
+############################
+class ADC:
+
+    def __init__(self, pin):
+        self.pin = pin
+        # about 7.4V battery voltage behind the 47k/100k divider
+        self.iValue = 46000
+
+    def read_u16(self):
+        return self.iValue
+
+############################
+## class vl53l0x_model
+############################
+class vl53l0x_model:
+
+    # register file of a VL53L0X, enough for the driver in tof_sensor.py:
+    # identification registers, ranging always complete, range in iRangeMm
+
+    _SYSRANGE_START          = 0x00
+    _RESULT_INTERRUPT_STATUS = 0x13
+    _RESULT_RANGE_MM         = 0x14 + 10
+
+    def __init__(self, iRangeMm=500):
+        self.aReg = bytearray(256)
+        self.aReg[0xC0] = 0xEE
+        self.aReg[0xC1] = 0xAA
+        self.aReg[0xC2] = 0x10
+        self.iPtr = 0
+        self.iRangeMm = iRangeMm
+
+    def read(self, iReg):
+        if iReg == self._SYSRANGE_START:
+            # single shot ranging completes immediately
+            return self.aReg[iReg] & 0xFE
+        if iReg == self._RESULT_INTERRUPT_STATUS:
+            return self.aReg[iReg] | 0x07
+        if iReg == 0x83:
+            # spad info ready
+            return self.aReg[iReg] | 0x01
+        if iReg == self._RESULT_RANGE_MM:
+            return (self.iRangeMm >> 8) & 0xFF
+        if iReg == self._RESULT_RANGE_MM + 1:
+            return self.iRangeMm & 0xFF
+        return self.aReg[iReg]
+
+    def writeto(self, buf):
+        # first byte sets the register pointer, the rest is written from there
+        self.iPtr = buf[0]
+        for k in range(1, len(buf)):
+            self.aReg[(self.iPtr + k - 1) & 0xFF] = buf[k]
+
+    def readfrom_into(self, buf):
+        for k in range(len(buf)):
+            buf[k] = self.read((self.iPtr + k) & 0xFF)
+
+############################
+## class I2C
+############################
+class I2C:
+
+    def __init__(self, id, scl=None, sda=None, freq=400000):
+        self.id = id
+        self.iFreq = freq
+        # devices on the bus by address
+        self.dDevices = {41: vl53l0x_model()}
+
+    def scan(self):
+        return sorted(self.dDevices)
+
+    def device(self, addr):
+        if addr not in self.dDevices:
+            raise OSError(19)
+        return self.dDevices[addr]
+
+    def writeto(self, addr, buf, stop=True):
+        self.device(addr).writeto(buf)
+        return 1
+
+    def readfrom_into(self, addr, buf, stop=True):
+        self.device(addr).readfrom_into(buf)
+
+    def readfrom(self, addr, nbytes, stop=True):
+        buf = bytearray(nbytes)
+        self.readfrom_into(addr, buf)
+        return bytes(buf)
+
+    def writeto_mem(self, addr, memaddr, buf):
+        self.writeto(addr, bytes([memaddr]) + bytes(buf))
+
+    def readfrom_mem_into(self, addr, memaddr, buf):
+        self.writeto(addr, bytes([memaddr]))
+        self.readfrom_into(addr, buf)
+
+# --------------------------------------------------------
+# module level functions
+# --------------------------------------------------------
+
+def freq(hz=None):
+    return 125000000
+
+def disable_irq():
+    return 0
+
+def enable_irq(state=0):
+    pass
+
+def unique_id():
+    return b'\x00' * 8
+
+def reset():
+    raise SystemExit('machine.reset()')
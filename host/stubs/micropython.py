@@ -0,0 +1,38 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# host stand-in for the MicroPython 'micropython' module
+
+def const(x):
+    return x
+
+# code emitters are plain python on the host
+def native(f):
+    return f
+
+def viper(f):
+    return f
+
+def opt_level(level=None):
+    return 0
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+def schedule(fn, arg):
+    fn(arg)
+
+def mem_info(verbose=False):
+    pass
@@ -0,0 +1,295 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# gait parameter sweep on the headless simulator (host.sim), all cores
+#
+#   python -m host.sweep --grid _GAIT_HEIGHT=-75,-85,-95 --grid _GAIT_SWING_TICKS=10,12,14
+#   python -m host.sweep --random _GAIT_HALF_STRIDE=25:40 --random _GAIT_SWING_AMPL=8:20 --samples 64
+#   python -m host.sweep --grid "_GAIT_FWD_GAIN=[1.0]*4,[1.5]*4" --out sweep.json
+#
+# every configuration overrides constants of robug_constants.py: the
+# assignment in the class body is replaced by the given python expression
+# (e.g. v3(0, 0, -6), [2.0, 1.0, 1.0, 0.4]), so the constants derived from
+# it follow. the firmware modules are loaded afresh per configuration in the
+# worker processes (multiprocessing, spawn), the parent never imports them.
+# the first configuration is the unmodified baseline (--no-baseline).
+#
+# metrics per configuration, walking part of the script (resume .. stop):
+#   speed_mm_tick, speed_mm_s  body travel per frame / per second
+#   clamped                    joint frames saturated to _SERVO_MIN/_SERVO_MAX
+#   reach_margin_mm            min. distance of a foot to the ik workspace border
+#   vel_peak_ticks             max. joint step per frame in servo ticks
+#   height_min/max, pitch_min/max
+#   error                      ik domain error or other failure ('' if none),
+#                              error_frame is the frame it happened in
+# results go to a columnar file: .json (one list per column) or .csv
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import itertools
+import multiprocessing
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import host
+host.install()
+
+METRICS = ['frames', 'speed_mm_tick', 'speed_mm_s', 'clamped', 'reach_margin_mm',
+           'vel_peak_ticks', 'height_min', 'height_max', 'pitch_min', 'pitch_max',
+           'error', 'error_frame', 'wall_s']
+
+############################
+## worker
+############################
+
+def walk_range(lMarks, n):
+    # frames from the (last) resume command to the following stop command
+    iStart, iEnd = 0, n
+    for iFrame, strCmd in lMarks:
+        if strCmd.startswith('RESUME'):
+            iStart, iEnd = iFrame, n
+        elif strCmd.startswith('STOP') and iFrame > iStart:
+            iEnd = iFrame
+    return iStart, min(iEnd, n)
+
+def metrics(sim, c):
+    d = dict.fromkeys(METRICS, 0)
+    n = sim.frames()
+    d['frames'] = n
+    if n == 0:
+        return d
+    iStart, iEnd = walk_range(sim.lMarks, n)
+    lX = sim.column('x')
+    if iEnd > iStart:
+        d['speed_mm_tick'] = (lX[iEnd-1] - lX[iStart]) / (iEnd - iStart)
+        d['speed_mm_s'] = d['speed_mm_tick'] * 1000 / c._GAIT_LOOP_TIME
+    lH = sim.column('height')
+    lP = sim.column('pitch')
+    d['height_min'], d['height_max'] = min(lH), max(lH)
+    d['pitch_min'], d['pitch_max'] = min(lP), max(lP)
+
+    # servo saturation, same transform as rbjoints.stage_angle_sid()
+    lJoints = [sim.r.lLeg[i].joints for i in range(4)]
+    fMin = c._L_TIBIA - c._L_FEMUR
+    fMax = c._L_TIBIA + c._L_FEMUR
+    iClamped = 0
+    fMargin = None
+    fVel = 0.0
+    aPrev = None
+    for k in range(n):
+        a = sim.frame(k)
+        for i in range(4):
+            j = lJoints[i]
+            for sid in range(2):
+                iDuty = (j.aDutyOffs[sid] + int(a[sim.TICKS+2*i+sid]) * j.aDutyGain[sid]) >> c._SERVO_DUTY_Q
+                if iDuty > j.iDutyMax or iDuty < j.iDutyMin:
+                    iClamped += 1
+            x = a[sim.FOOT+3*i]
+            z = a[sim.FOOT+3*i+2]
+            l3 = (x*x + z*z) ** 0.5
+            m = min(fMax - l3, l3 - fMin)
+            if fMargin is None or m < fMargin:
+                fMargin = m
+        if aPrev is not None:
+            for j in range(sim.TICKS, sim.TICKS+8):
+                fVel = max(fVel, abs(a[j] - aPrev[j]))
+        aPrev = a
+    d['clamped'] = iClamped
+    d['reach_margin_mm'] = fMargin
+    d['vel_peak_ticks'] = fVel
+    return d
+
+def run_config(job):
+    iIdx, dOverrides, strScript, iMaxFrames = job
+    t0 = time.perf_counter()
+    host.load_firmware(dOverrides)
+    from robug_constants import constants as c
+    from host.sim import rbsim, SCRIPTS
+    strError = ''
+    iErrorFrame = -1
+    sim = None
+    try:
+        sim = rbsim(iMaxFrames=iMaxFrames)
+        sim.run(SCRIPTS[strScript])
+    except (ValueError, ZeroDivisionError, RuntimeError, IndexError) as e:
+        # ValueError: ik domain error (acos / asin out of range)
+        strError = '{}: {}'.format(type(e).__name__, e)
+        if sim is not None:
+            iErrorFrame = sim.m.sched.iFrame
+    d = metrics(sim, c) if sim is not None else dict.fromkeys(METRICS, 0)
+    d['error'] = strError
+    d['error_frame'] = iErrorFrame
+    d['wall_s'] = time.perf_counter() - t0
+    return iIdx, d
+
+############################
+## search space
+############################
+
+def split_values(strValues):
+    # split at commas outside of brackets
+    l = []
+    iDepth = 0
+    strCur = ''
+    for ch in strValues:
+        if ch in '([{':
+            iDepth += 1
+        elif ch in ')]}':
+            iDepth -= 1
+        if ch == ',' and iDepth == 0:
+            l.append(strCur.strip())
+            strCur = ''
+        else:
+            strCur += ch
+    if strCur.strip():
+        l.append(strCur.strip())
+    return l
+
+def parse_param(strArg):
+    strName, sep, strValues = strArg.partition('=')
+    if not sep or not strName.startswith('_'):
+        raise ValueError('expected _NAME=values: ' + strArg)
+    return strName.strip(), strValues
+
+def configs(lGrid, lRandom, iSamples, iSeed, bBaseline):
+    # list of {name: expression}
+    lNames = []
+    lValues = []
+    for strArg in lGrid:
+        strName, strValues = parse_param(strArg)
+        lNames.append(strName)
+        lValues.append(split_values(strValues))
+    lGridCfg = [dict(zip(lNames, t)) for t in itertools.product(*lValues)]
+    lCfg = []
+    if lRandom:
+        rnd = random.Random(iSeed)
+        lRange = []
+        for strArg in lRandom:
+            strName, strRange = parse_param(strArg)
+            strLo, _, strHi = strRange.partition(':')
+            lRange.append((strName, strLo, strHi))
+        for _ in range(iSamples):
+            d = {}
+            for strName, strLo, strHi in lRange:
+                if '.' in strLo or '.' in strHi:
+                    d[strName] = repr(round(rnd.uniform(float(strLo), float(strHi)), 3))
+                else:
+                    d[strName] = str(rnd.randint(int(strLo), int(strHi)))
+            for dGrid in lGridCfg:
+                lCfg.append(dict(d, **dGrid))
+    else:
+        lCfg = [d for d in lGridCfg if d]
+    if bBaseline:
+        lCfg.insert(0, {})
+    return lCfg
+
+############################
+## output
+############################
+
+def columns(lCfg, lResults):
+    lParams = []
+    for d in lCfg:
+        for strName in d:
+            if strName not in lParams:
+                lParams.append(strName)
+    dCol = {'config': list(range(len(lCfg)))}
+    for strName in lParams:
+        # baseline / not swept: the value in robug_constants.py
+        dCol[strName] = [d.get(strName, '') for d in lCfg]
+    for strMetric in METRICS:
+        dCol[strMetric] = [r[strMetric] for r in lResults]
+    return dCol
+
+def write_columns(dCol, strPath):
+    if strPath.endswith('.json'):
+        with open(strPath, 'w') as f:
+            json.dump(dCol, f, indent=1)
+        return
+    lNames = list(dCol)
+    with open(strPath, 'w') as f:
+        f.write(','.join(lNames) + '\n')
+        for k in range(len(dCol['config'])):
+            l = []
+            for strName in lNames:
+                v = dCol[strName][k]
+                l.append('{:.4f}'.format(v) if isinstance(v, float) else '"{}"'.format(v) if isinstance(v, str) and ',' in v else str(v))
+            f.write(','.join(l) + '\n')
+
+def main():
+    parser = argparse.ArgumentParser(description='RoBug gait parameter sweep on the headless simulator')
+    parser.add_argument('--grid', action='append', default=[], metavar='_NAME=v1,v2,..',
+                        help='values (python expressions) of a constant, all combinations are run')
+    parser.add_argument('--random', action='append', default=[], metavar='_NAME=lo:hi',
+                        help='uniform random range of a constant (int if both ends are ints)')
+    parser.add_argument('--samples', type=int, default=32, help='random configurations')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--script', default='walk', help='host.sim script')
+    parser.add_argument('--max-frames', type=int, default=5000)
+    parser.add_argument('--jobs', type=int, default=0, help='worker processes, 0: all cores')
+    parser.add_argument('--no-baseline', action='store_true')
+    parser.add_argument('--out', default='sweep.csv', help='.csv or .json (columns)')
+    parser.add_argument('--top', type=int, default=10, help='fastest valid configurations shown')
+    args = parser.parse_args()
+
+    lCfg = configs(args.grid, args.random, args.samples, args.seed, not args.no_baseline)
+    if not lCfg:
+        print('nothing to sweep, see --grid / --random')
+        return 1
+    try:
+        for d in lCfg:
+            host.constants_source(d)
+    except KeyError as e:
+        print(e.args[0])
+        return 1
+    lJobs = [(k, d, args.script, args.max_frames) for k, d in enumerate(lCfg)]
+    iJobs = args.jobs or multiprocessing.cpu_count()
+
+    t0 = time.perf_counter()
+    lResults = [None] * len(lCfg)
+    if iJobs == 1:
+        for job in lJobs:
+            k, d = run_config(job)
+            lResults[k] = d
+    else:
+        # spawn: every worker starts without firmware modules loaded
+        with multiprocessing.get_context('spawn').Pool(iJobs) as pool:
+            for k, d in pool.imap_unordered(run_config, lJobs):
+                lResults[k] = d
+    fWall = time.perf_counter() - t0
+    print('{} configurations on {} processes in {:.1f} s'.format(len(lCfg), iJobs, fWall))
+
+    write_columns(columns(lCfg, lResults), args.out)
+    print('results written to', args.out)
+
+    # fastest configurations without errors and saturation
+    lValid = [k for k in range(len(lCfg)) if not lResults[k]['error'] and not lResults[k]['clamped']]
+    lValid.sort(key=lambda k: -lResults[k]['speed_mm_tick'])
+    for k in lValid[:args.top]:
+        d = lResults[k]
+        print('{:4d} {:7.3f} mm/tick  margin {:5.1f} mm  vel {:5.1f}  {}'.format(
+              k, d['speed_mm_tick'], d['reach_margin_mm'], d['vel_peak_ticks'],
+              ' '.join('{}={}'.format(n, v) for n, v in lCfg[k].items()) or 'baseline'))
+    iFailed = sum(1 for d in lResults if d['error'])
+    if iFailed:
+        print(iFailed, 'configurations failed, see the error column')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
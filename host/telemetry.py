@@ -0,0 +1,177 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# host side of the telemetry stream (robug_telemetry, c._TELE = True)
+#
+#   python -m host.telemetry --udp 192.168.1.50 --seconds 10 --out tele.npz
+#   python -m host.telemetry --file ble_capture.bin --out tele.npz
+#   python -m host.telemetry --sim walk          check against the simulator
+#
+# --udp asks the explorer app for the stream ('TELE ON' to port 5000) and
+# collects the datagrams, --file decodes a capture of the raw stream (e.g.
+# the concatenated BLE notifies). decode() turns the stream into NumPy
+# arrays, one entry per frame, saved with numpy.savez.
+# --sim runs a script of host.sim with telemetry compiled in and checks the
+# decoded stream (UDP datagrams and BLE chunks) against the recording of
+# the simulator.
+
+import os
+import sys
+import time
+import socket
+import argparse
+
+if __package__ in (None, ''):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import host
+host.install()
+
+from robug_telemetry import rbtelemetry as T
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def decode(data):
+    # stream bytes -> dict of arrays, see rbtelemetry for the row layout
+    if np is None:
+        raise ImportError('decode() needs numpy, rbtelemetry.unpack() returns plain rows')
+    lRows = T.unpack(data)
+    a = np.array(lRows, dtype=np.int32).reshape(-1, T.ROW)
+    return {
+        'frame':   a[:, T.FRAME],
+        'loop':    a[:, T.LOOP] / 16.0,
+        'phase':   a[:, T.PHASE],
+        'op':      a[:, T.CMD] >> 4,
+        'sub':     a[:, T.CMD] & 15,
+        'work_us': a[:, T.WORK],
+        'late_us': a[:, T.LATE],
+        'dist_mm': a[:, T.DIST],
+        'soc_v':   a[:, T.SOC] * 0.01,
+        'foot_mm': a[:, T.FOOT:T.FOOT+12].reshape(-1, 4, 3) / 10.0,
+        'ticks':   a[:, T.TICKS:T.TICKS+8].reshape(-1, 4, 2),
+    }
+
+#--------------------------------
+#-- capture ---------------------
+#--------------------------------
+
+def capture_udp(strHost, iPort, fSeconds):
+    # datagrams of the explorer's telemetry stream for fSeconds
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.settimeout(0.5)
+    sock.sendto(b'TELE ON', (strHost, iPort))
+    lData = []
+    t_end = time.time() + fSeconds
+    try:
+        while time.time() < t_end:
+            try:
+                data, addr = sock.recvfrom(4096)
+            except socket.timeout:
+                continue
+            if data == b'telemetry disabled':
+                raise RuntimeError('telemetry is compiled out (c._TELE = False)')
+            lData.append(data)
+    finally:
+        sock.sendto(b'TELE OFF', (strHost, iPort))
+        sock.close()
+    return b''.join(lData)
+
+#--------------------------------
+#-- check on the simulator ------
+#--------------------------------
+
+def check_sim(strScript, iChunk=20):
+    host.load_firmware({'_TELE': 'True'})
+    from host.sim import rbsim, SCRIPTS
+    from robug_telemetry import rbtelemetry
+    sim = rbsim()
+    m = sim.m
+    # the simulator outruns any stream period: keep every frame
+    m.tele = rbtelemetry(sim.r, m.sched, iFrames=sim.iMaxFrames)
+    m.sched.tele = m.tele
+    sim.run(SCRIPTS[strScript])
+    lDatagrams = []
+    d = m.tele.next_datagram()
+    while d is not None:
+        lDatagrams.append(bytes(d))
+        d = m.tele.next_datagram()
+    data = b''.join(lDatagrams)
+    lRows = T.unpack(data)
+    n = sim.frames()
+    assert len(lRows) == n, (len(lRows), n)
+    for k in range(n):
+        row = lRows[k]
+        rec = sim.frame(k)
+        assert row[T.FRAME] == k
+        for j in range(8):
+            assert abs(row[T.TICKS+j] - rec[sim.TICKS+j]) < 1.0, (k, j)
+        for j in range(12):
+            assert abs(row[T.FOOT+j] / 10 - rec[sim.FOOT+j]) < 0.101, (k, j)
+    iCmds = sum(1 for row in lRows if row[T.CMD])
+    # BLE: the same stream in notify chunks, one chunk lost
+    lChunks = [data[k:k+iChunk] for k in range(0, len(data), iChunk)]
+    assert T.unpack(b''.join(lChunks)) == lRows
+    iLost = len(lRows) - len(T.unpack(b''.join(lChunks[:5] + lChunks[6:])))
+    print('{} frames in {} datagrams ({} bytes), {} commands, a lost BLE chunk costs {} frames'.format(
+          n, len(lDatagrams), len(data), iCmds, iLost))
+    return lRows
+
+# --------------------------------------------------------
+# command line
+# --------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description='RoBug telemetry decoder')
+    parser.add_argument('--udp', metavar='HOST', help='capture the UDP stream of the explorer app')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--file', help='decode a capture of the raw stream')
+    parser.add_argument('--raw', help='write the captured stream to this file')
+    parser.add_argument('--out', help='write the arrays to this .npz file')
+    parser.add_argument('--sim', metavar='SCRIPT', help='check the stream on a host.sim script')
+    args = parser.parse_args()
+
+    if args.sim:
+        check_sim(args.sim)
+        return 0
+    if args.udp:
+        data = capture_udp(args.udp, args.port, args.seconds)
+    elif args.file:
+        with open(args.file, 'rb') as f:
+            data = f.read()
+    else:
+        parser.print_help()
+        return 1
+    if args.raw:
+        with open(args.raw, 'wb') as f:
+            f.write(data)
+    d = decode(data)
+    n = len(d['frame'])
+    if n:
+        iGaps = int(np.sum(np.diff(d['frame']) != 1))
+        print('{} frames {}..{}, {} gaps, work {}..{} us, late max {} us'.format(
+              n, d['frame'][0], d['frame'][-1], iGaps, d['work_us'].min(), d['work_us'].max(),
+              d['late_us'].max()))
+    else:
+        print('no frames')
+    if args.out:
+        np.savez(args.out, **d)
+        print('arrays written to', args.out)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
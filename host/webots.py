@@ -0,0 +1,134 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Webots backend: the firmware in src/ drives the robot of a Webots world
+#
+#   robot = Robot()
+#   host.install()
+#   host.load_firmware(dOverrides)
+#   from host.webots import rbwebots
+#   rbwebots(robot).run(lScript)
+#
+# dOverrides: constants of the world's model (host.load_firmware). the frame
+# period c._GAIT_LOOP_TIME should be the basic time step of the world, the
+# simulation only advances in whole steps.
+# the controllers in simulation/controllers run the same motion core as the
+# Pico, only the two hardware facing parts are replaced:
+#   rbservo_webots  - servo backend (robug_servo), the committed duty of each
+#                     channel goes back through the tick -> duty transform of
+#                     rbjoints to the joint angle for Motor.setPosition()
+#   rbwebotsclock   - frame clock (robug_sched), simulation time of the world,
+#                     waiting for a deadline steps the simulation
+# supervisor scripts and recording are those of host.sim (rbsim).
+
+import asyncio
+
+import host
+host.install()
+
+from robug_constants import constants as c
+from robug_servo import rbservo
+from host.sim import rbsim, SCRIPTS
+
+_Q = c._SERVO_DUTY_Q
+
+# motor device names of the channels, channel = 2*leg + joint
+MOTORS = ['leg_{}_{}_link_joint'.format(strJoint, strLeg)
+          for strLeg in c._GAIT_NAME for strJoint in ('femur', 'tibia')]
+
+############################
+## class rbwebotsclock
+############################
+class rbwebotsclock:
+
+    # simulation time of the world, sleep_us() steps the simulation until
+    # the time has passed. Webots ending the simulation ends the controller
+
+    def __init__(self, robot):
+        self.robot = robot
+        self.iStep = int(robot.getBasicTimeStep())
+
+    def ticks_us(self):
+        return int(self.robot.getTime() * 1000000 + 0.5)
+
+    def ticks_diff(self, a, b):
+        return a - b
+
+    def ticks_add(self, a, b):
+        return a + b
+
+    async def sleep_us(self, us):
+        t = self.ticks_us() + us
+        while self.ticks_us() < t:
+            if self.robot.step(self.iStep) == -1:
+                raise SystemExit(0)
+        await asyncio.sleep(0)
+
+############################
+## class rbservo_webots
+############################
+class rbservo_webots(rbservo):
+
+    # servo backend on the joint motors of the world. the duty is turned
+    # back into servo ticks with the transform of the channel's rbjoints
+    # (calibration included), angle = ticks * c._SERVO_K * c._SERVO_SGN as
+    # the joint axes of the model. duty quantisation is kept.
+
+    def __init__(self, robot, r, lNames=MOTORS):
+        super().__init__()
+        self.lMotor = [robot.getDevice(strName) for strName in lNames]
+        self.lJoints = [r.lLeg[ch >> 1].joints for ch in range(self.n)]
+
+    def output(self, iMask):
+        lOut = self.lOut
+        for ch in range(self.n):
+            if iMask & (1 << ch):
+                j = self.lJoints[ch]
+                sid = ch & 1
+                fTicks = ((lOut[ch] << _Q) + (1 << (_Q-1)) - j.aDutyOffs[sid]) / j.aDutyGain[sid]
+                self.lMotor[ch].setPosition(fTicks * c._SERVO_K * c._SERVO_SGN[ch])
+
+############################
+## class rbwebots
+############################
+class rbwebots(rbsim):
+
+    # rbsim on the world's clock and motors, the firmware console goes to
+    # the Webots console
+
+    def __init__(self, robot, bSoA=c._STATE_SOA, iMaxFrames=1 << 30):
+        self.robot = robot
+        super().__init__(bSoA, iMaxFrames, True, rbwebotsclock(robot))
+        self.r.set_servo(rbservo_webots(robot, self.r))
+
+    def run(self, lScript):
+        # script of host.sim by name or a list of commands / waits
+        if isinstance(lScript, str):
+            lScript = SCRIPTS[lScript]
+        try:
+            lReplies = super().run(lScript)
+        except SystemExit:
+            # simulation ended by Webots, the controller task ends with it
+            if self.task is not None and self.task.done():
+                self.task.exception()
+            print('simulation ended')
+            return None
+        for strCmd, strReply in lReplies:
+            if strReply != 'DONE':
+                print('{:16s} {}'.format(strCmd, strReply))
+        d = self.summary()
+        print('{} frames, {:.2f} s, body x {:.1f} mm (kinematic estimate)'.format(
+              d['frames'], d['virtual_s'], d['distance_mm']))
+        return lReplies
@@ -1,77 +1,43 @@
-"""RoBug controller."""
+"""RoBug controller (dynamic model): the firmware in src/ on the Webots robot."""
 
-# You may need to import some classes of the controller module. Ex:
-#  from controller import Robot, Motor, DistanceSensor
-from math import degrees, pi, sin
-from time import sleep
-import math
-import asyncio
-from robug_utils import v3
-from robug_constants_dyn import constants as c
-from robug_robot import robug
+import os
+import sys
 from controller import Robot
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+import host
 
-async def loop_timer(loop_ms):
-    await asyncio.sleep(loop_ms*0.001)   
- 
-async def walk():
+# gait of the dynamic model, replaces the constants of src/robug_constants.py
+CONSTANTS = {
+    '_GAIT_HEIGHT':        '-100',
+    '_GAIT_SWING_TICKS':   '14',
+    '_GAIT_SUPPORT_TICKS': '50',
+    '_GAIT_SWING_AMPL':    '20',
+    '_GAIT_HALF_STRIDE':   '35',
+    '_GAIT_PUSH_STRENGTH': 'v3(0, 0, -5)',
+    '_GAIT_TURN_X':        '28',
+    '_GAIT_TURN_Y':        '9',
+    '_SYM_XSHIFT':         '15',
+    '_ASYM_XSHIFT':        '5',
+}
 
-    while robot.step(fLoop) != -1:
-    
-        timer = asyncio.create_task(loop_timer(fLoop))
-        
-        for ID in range(4):
-            j = 2*ID
-            k = 2*ID+1 
-            delta = (r.lLeg[ID].delta-pi/2) * c._SERVO_SGN[j]
-            gamma = (r.lLeg[ID].gamma-pi/2) * c._SERVO_SGN[k]        
-            lServo[j].setPosition(delta)
-            lServo[k].setPosition(gamma)
-           
-        # increment loop counter of all legs       
-        r.inc_loop_counters()
-        
-        # pre-caluculate new joint angles for next iteration
-        r.calculate_joint_angles(bAbs=False)
-        
-        # wait for timer completion
-        await timer
-
-
-async def main():
-    # dispatch async. walk task
-    task1 = asyncio.create_task(walk())
-    await task1
+# supervisor script (host.sim): commands, ints wait that many ms
+SCRIPT = ['START_POSE_FWD', 'RESUME_FWD', 600000, 'STOP_POSE_FWD']
 
 
 if __name__ == "__main__":
 
     # RoBug PHYSICAL MODEL instance
     robot = Robot()
-    # get loop time from world info
-    fLoop = int(robot.getBasicTimeStep())
-    
-    # RoBug BEHAVIORAL controller
-    r = robug()
-    r.set_loop_counter_resume()
-    r.instant_update()
-    
-    # build virtual servo map
-    lServo = []
-    lServo.append(robot.getDevice('leg_femur_FL_link_joint'))
-    lServo.append(robot.getDevice('leg_tibia_FL_link_joint'))
-    lServo.append(robot.getDevice('leg_femur_RL_link_joint'))
-    lServo.append(robot.getDevice('leg_tibia_RL_link_joint'))
-    lServo.append(robot.getDevice('leg_femur_FR_link_joint'))
-    lServo.append(robot.getDevice('leg_tibia_FR_link_joint'))
-    lServo.append(robot.getDevice('leg_femur_RR_link_joint'))
-    lServo.append(robot.getDevice('leg_tibia_RR_link_joint'))
+    # one frame per basic time step of the world
+    CONSTANTS['_GAIT_LOOP_TIME'] = str(int(robot.getBasicTimeStep()))
+
+    # RoBug motion core of the firmware
+    host.install()
+    host.load_firmware(CONSTANTS)
+    from host.webots import rbwebots
 
-    # start async. walk task
     try:
-        asyncio.run(main())
+        rbwebots(robot).run(SCRIPT)
     except KeyboardInterrupt:
         print("Controller stopped.")
-    
-
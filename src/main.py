@@ -17,13 +17,13 @@ from math import degrees, pi, sin
 from time import sleep
 import math
 import asyncio
-from collections import deque
 import json
 from machine import Pin, PWM, I2C, ADC
 
 from robug_constants import constants as c
 from robug_robot import robug
 from robug_ctrl import rbctrl
+from robug_chan import rbchan
 from robug_mocon import rbmocon
 from robug_ble import rbble
 from robug_app_calibrator import calibration
@@ -47,13 +47,8 @@ async def pulse_leds():
         await asyncio.sleep_ms(7)
         
 async def get_distance():
-    # median of 6 measurements
-    lTmp = []
-    for i in range(6):
-        lTmp.append(r.get_distance())
-        await asyncio.sleep_ms(50)
-    lTmp.sort()
-    return int((lTmp[2]+lTmp[3])/2)
+    # filtered estimate of the ranging task, returns at once
+    return r.tof.value()
 
 async def get_soc():
     # store voltage of multiples of 10mV
@@ -71,7 +66,18 @@ async def serve_sensor_data():
         soc = await get_soc()
         ble.dist = distance
         ble.soc = soc
+        if m.tele:
+            m.tele.iSoc = soc
         await asyncio.sleep_ms(250)
+
+async def print_profile():
+    # motion loop stage timings on the console
+    while True:
+        await asyncio.sleep_ms(c._PROF_PRINT_MS)
+        m.prof.print_report()
+        iWrites, iSaved = r.get_servo_writes()
+        print('servo writes:', iWrites, 'saved:', iSaved)
+        print('motion frame cache:', m.motion.stats())
              
 # --------------------------------------------------------
 # application: bluetooth low energy remote control
@@ -79,6 +85,8 @@ async def serve_sensor_data():
 async def fpv_rc(b):
     global RoBugState, distance
     RoBugState = 'init'
+    # last throttle sent to the motion controller
+    iThrottle = None
     
     while True:
         
@@ -89,6 +97,12 @@ async def fpv_rc(b):
         btn_rgt = b.btn_rgt
         btn_kck = b.btn_fn0
         btns_idle = not(btn_fwd or btn_bwd or btn_lft or btn_rgt or btn_kck)
+
+        # speed from the remote control (if it sends a throttle), the
+        # gait is retimed while walking
+        if b.throttle is not None and b.throttle != iThrottle and RoBugState != 'init':
+            iThrottle = b.throttle
+            await rc.set_speed(iThrottle)
         
         # -------------------------------------------------
         if   RoBugState == 'init':
@@ -192,6 +206,7 @@ async def main_rc():
     #start ble task
     task_ble  = asyncio.create_task(ble.msg_handler())
     # start sensor tasks
+    task_tof  = asyncio.create_task(r.tof.run())
     task_dist = asyncio.create_task(serve_sensor_data())
     # start any tasks that need to run concurrently
     task_led = asyncio.create_task(pulse_leds())
@@ -199,9 +214,15 @@ async def main_rc():
     task_mc = asyncio.create_task(m.run())
     # start application
     task_rc = asyncio.create_task(fpv_rc(ble))
+    # report profiler statistics if compiled in
+    if m.prof:
+        task_prof = asyncio.create_task(print_profile())
     # wait for termination
     await task_rc
+    if m.prof:
+        task_prof.cancel()
     task_ble.cancel()    
+    task_tof.cancel()
     task_dist.cancel()
     task_led.cancel()
     task_mc.cancel()          
@@ -252,10 +273,13 @@ if __name__ == "__main__":
         # and scaling to 3.3V
         cf = (3.3 / 65536) * (147/47)
         # set up motion controller
-        MsgQueue  = deque([], 4)
-        RplyQueue = deque([], 4)
-        rc = rbctrl(MsgQueue, RplyQueue)
-        m = rbmocon(r, MsgQueue, RplyQueue)
+        chan = rbchan()
+        rc = rbctrl(chan)
+        m = rbmocon(r, chan)
+        # profiler report on request over BLE
+        ble.prof = m.prof
+        # telemetry stream over BLE
+        ble.tele = m.tele
         # start tasks
         asyncio.run(main_rc())
         
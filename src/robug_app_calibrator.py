@@ -50,13 +50,13 @@ async def calibration(robug, bluetoothLE):
                 # op 0 / op1 -> offset
                 # op 8 / op9 -> gain
                 if op == 0:
-                    r.lLeg[leg].joints.lServoCal[joint] += 5
+                    r.lLeg[leg].joints.adjust_cal(joint, 5, 0)
                 elif op == 1:
-                    r.lLeg[leg].joints.lServoCal[joint] -= 5
+                    r.lLeg[leg].joints.adjust_cal(joint, -5, 0)
                 elif op == 8:
-                    r.lLeg[leg].joints.lServoGain[joint] -= 0.02
+                    r.lLeg[leg].joints.adjust_cal(joint, 0, -0.02)
                 elif op == 9:
-                    r.lLeg[leg].joints.lServoGain[joint] += 0.02                    
+                    r.lLeg[leg].joints.adjust_cal(joint, 0, 0.02)                    
                 # update leg
                 deltaTicks = r.lLeg[leg].rad2ticks(delta)
                 gammaTicks = r.lLeg[leg].rad2ticks(gamma)                
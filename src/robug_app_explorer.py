@@ -20,13 +20,13 @@ import asyncio
 import random
 import network
 import socket
-from collections import deque
-from machine import Pin, PWM, I2C
+from machine import Pin, PWM, I2C, ADC
 from robug_utils import v3
 from robug_constants import constants as c
 from robug_robot import robug
 from robug_mocon import rbmocon
-from tof_sensor import vl53l0x
+from robug_chan import rbchan
+from robug_filter import rbfilter
 
 async def loop_timer(loop_ms):
     await asyncio.sleep_ms(loop_ms)
@@ -47,6 +47,8 @@ async def pulse_leds():
     
 async def serve_sensor_data():
     print("sensor server up and running")
+    # telemetry stream to the client that asked for it (rbtelemetry)
+    task_tele = None
 
     while True:
         try:
@@ -55,49 +57,74 @@ async def serve_sensor_data():
             # print('client address: ', client_address)
             
             if client_request.decode() == 'GET DIST':
-                dist = str(vl53.range).encode()
+                dist = str(r.tof.iRange).encode()
                 pico_socket.sendto(dist, client_address)
                 
             if client_request.decode() == 'GET STATE':
                 state = RoBugState.encode()
                 pico_socket.sendto(state, client_address)                
 
+            if client_request.decode() == 'GET PROF':
+                if m.prof:
+                    pico_socket.sendto(m.prof.format_report().encode(), client_address)
+                else:
+                    pico_socket.sendto(b'profiler disabled', client_address)
+
+            if client_request.decode() == 'TELE ON':
+                if m.tele:
+                    if task_tele is not None:
+                        task_tele.cancel()
+                    task_tele = asyncio.create_task(m.tele.stream_udp(pico_socket, client_address))
+                else:
+                    pico_socket.sendto(b'telemetry disabled', client_address)
+
+            if client_request.decode() == 'TELE OFF':
+                if task_tele is not None:
+                    task_tele.cancel()
+                    task_tele = None
+
         except OSError:
             # no package available this time
             pass
 
+        if m.tele:
+            # battery voltage in multiples of 10mV for the telemetry rows
+            m.tele.iSoc = max(0, int((adc.read_u16() * cf) / 0.01))
+
         await asyncio.sleep(0.25)    
  
 # simple room explorer
 # walks straight until obstacle detected
 # then search for exit by turning in an arbitrary direction
-# note that the I2C distance sensor driver is synchronous, i.e. blocking
+# distances come from the ranging task (r.tof), reading them does not block
 
-async def wait_for_reply():   
-    while True:
-        if len(RplyQueue) > 0:
-            strRply = RplyQueue.pop()
-            print(f'client received reply: {strRply}')
-            return strRply
-        await asyncio.sleep_ms(100)
+async def wait_for_reply(seq):
+    # woken by the reply to command seq, no polling
+    strRply = await chan.wait(seq)
+    print(f'client received reply: {strRply}')
+    return strRply
         
 async def send_cmd(strCMD):
-    global MsgQueue
-    MsgQueue.append(strCMD)
+    seq = chan.post(strCMD)
     print(f'supervisor sending {strCMD}')
-    reply = await wait_for_reply()
+    reply = await wait_for_reply(seq)
     if reply == 'DONE': return True
     else: return False
     
 async def get_distance():
-    tmp = 0
-    for i in range(3):
-        tmp += r.get_distance()
-        await asyncio.sleep_ms(50)
-    tmp /= 3
+    # current estimate, returns at once
+    tmp = dist_filter.value()
+    if tmp is None:
+        tmp = r.tof.value()
     print(tmp)
     return tmp    
 
+async def get_fresh_distance():
+    # estimate of samples taken after the last pose change
+    dist_filter.reset()
+    await r.tof.wait_samples(dist_filter.n)
+    return await get_distance()
+
 async def resume_fwd():
      await send_cmd('RESUME_FWD')
      
@@ -141,11 +168,11 @@ async def inspect():
     #print(r.lLeg[0].gait.get_loop_counter(), r.lLeg[0].foot_pos)
     await send_cmd('LOOK_DOWN')
     #print(r.lLeg[0].gait.get_loop_counter(), r.lLeg[0].foot_pos)            
-    dist_low = await get_distance()
+    dist_low = await get_fresh_distance()
     await send_cmd('LOOK_UP')
-    dist_straight = await get_distance()    
+    dist_straight = await get_fresh_distance()    
     await send_cmd('LOOK_UP')
-    dist_high = await get_distance()
+    dist_high = await get_fresh_distance()
     await send_cmd('LOOK_DOWN')
     # print(r.lLeg[0].gait.get_loop_counter(), r.lLeg[0].foot_pos)
     return dist_low, dist_straight, dist_high
@@ -215,7 +242,7 @@ async def explorer():
             
             for i in range(n):
                 await turn(dir,1)
-                dist_tmp = await get_distance()
+                dist_tmp = await get_fresh_distance()
                 if dist_tmp > min_dist + hysteresis:
                     await start_to_walk_fwd()
                     RoBugState = 'walk'
@@ -239,7 +266,7 @@ async def explorer():
             
             for i in range(n):
                 await turn(dir,1)
-                dist_tmp = await get_distance()
+                dist_tmp = await get_fresh_distance()
                 if dist_tmp > min_dist + hysteresis:
                     await start_to_walk_fwd()
                     RoBugState = 'walk'
@@ -278,7 +305,7 @@ async def explorer():
         # -------------------------------------------------
         
             await turn(dir,1)
-            dist = await get_distance()
+            dist = await get_fresh_distance()
             if dist < too_close:
                 RoBugState = 'avoid_phase_3'            
             elif dist < min_dist+hysteresis:
@@ -317,7 +344,8 @@ async def explorer():
 
 async def main():
     
-    # start sensor data server
+    # start ranging and sensor data server
+    task_tof = asyncio.create_task(r.tof.run())
     task0 = asyncio.create_task(serve_sensor_data())
 
     # start any sensor related tasks that need to run concurrently
@@ -334,13 +362,13 @@ async def main():
     task0.cancel()    
     task1.cancel()
     task2.cancel()
+    task_tof.cancel()
+    # session log for robug_app_replay (c._REC)
+    if m.rec:
+        m.rec.save(c._REC_FILE)
 
 if __name__ == "__main__":
     
-    # setup ToF distance sensor
-    vl53 = vl53l0x(I2C(c._I2C_BUS, sda=Pin(c._PIN_I2C_SDA), scl=Pin(c._PIN_I2C_SCL), freq=c._I2C_RATE))    
-    vl53.stop_continuous()    
-    
     # create your own secrets.py
     # see secrets_example.py
     ssid = SSID
@@ -375,10 +403,18 @@ if __name__ == "__main__":
     r.set_joints() 
     sleep(1)
     
+    # set up ADC
+    adc = ADC(c._PIN_ADC)
+    # voltage divider (47k/100k) backwards
+    # and scaling to 3.3V
+    cf = (3.3 / 65536) * (147/47)
+    
+    # 3 sample median of the distance, fed by the ranging task
+    dist_filter = r.tof.add_filter(rbfilter.create('median', 3))
+
     # set up motion controller
-    MsgQueue  = deque([], 4)
-    RplyQueue = deque([], 4)
-    m = rbmocon(r, MsgQueue, RplyQueue)
+    chan = rbchan()
+    m = rbmocon(r, chan)
     
     # declare global variables 
     RoBugState = ''
@@ -0,0 +1,63 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from time import sleep
+import asyncio
+
+from robug_constants import constants as c
+from robug_robot import robug
+from robug_chan import rbchan
+from robug_mocon import rbmocon
+from robug_replay import rbreplayer
+
+# --------------------------------------------------------
+# application: replay a recorded session (c._REC_FILE)
+# the commands go to the motion controller at the frames they were
+# recorded at, the frame stream is compared with the recorded digests
+# --------------------------------------------------------
+
+if __name__ == "__main__":
+
+    async def main():
+        # no supervisor: the replayer is the only source of commands
+        rp.start()
+        await m.run()
+        d = rp.result()
+        print('replay:', d)
+        return d['match']
+
+    # ----------------------------
+    # initialization
+    # ----------------------------
+
+    # init RoBug, set start position (as the recording app)
+    r = robug()
+    r.reset_loop_counter()
+    r.calculate_foot_positions()
+    r.solve_ik()
+    r.set_joints()
+    sleep(1)
+
+    # set up motion controller and replayer
+    chan = rbchan()
+    m = rbmocon(r, chan)
+    with open(c._REC_FILE, 'rb') as f:
+        rp = rbreplayer(r, m.sched, chan, f.read())
+
+    bMatch = asyncio.run(main())
+
+    # green: identical frame stream, red: differs
+    r.set_brightness_red(0 if bMatch else 100)
+    r.set_brightness_grn(100 if bMatch else 0)
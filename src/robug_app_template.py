@@ -17,13 +17,13 @@ from math import degrees, pi, sin
 from time import sleep
 import math
 import asyncio
-from collections import deque
 from machine import Pin, PWM
 
 from robug_utils import v3
 from robug_constants import constants as c
 from robug_robot import robug
 from robug_ctrl import rbctrl
+from robug_chan import rbchan
 from robug_mocon import rbmocon
 
 # --------------------------------------------------------
@@ -74,6 +74,9 @@ if __name__ == "__main__":
         await task2
         task0.cancel()
         task1.cancel()        
+        # session log for robug_app_replay (c._REC)
+        if m.rec:
+            m.rec.save(c._REC_FILE)
         
     # ----------------------------
     # initialization
@@ -88,10 +91,9 @@ if __name__ == "__main__":
     sleep(1)
     
     # set up motion controller
-    MsgQueue  = deque([], 4)
-    RplyQueue = deque([], 4)
-    rc = rbctrl(MsgQueue, RplyQueue)
-    m = rbmocon(r, MsgQueue, RplyQueue)
+    chan = rbchan()
+    rc = rbctrl(chan)
+    m = rbmocon(r, chan)
     
     # start tasks
     asyncio.run(main())
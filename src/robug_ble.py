@@ -27,6 +27,8 @@ class rbble:
         self.CHAR_UUID1   = bluetooth.UUID('ba3ca205-e3fb-4727-ad69-878bb3038b00')
         self.CHAR_UUID2   = bluetooth.UUID('ba3ca205-e3fb-4727-ad69-878bb3038b01')
         self.CHAR_UUID3   = bluetooth.UUID('ba3ca205-e3fb-4727-ad69-878bb3038b02')        
+        self.CHAR_UUID4   = bluetooth.UUID('ba3ca205-e3fb-4727-ad69-878bb3038b03')
+        self.CHAR_UUID5   = bluetooth.UUID('ba3ca205-e3fb-4727-ad69-878bb3038b04')
 
         # service + characteristic
         self.service = aioble.Service(self.SERVICE_UUID)
@@ -36,6 +38,10 @@ class rbble:
         self.char_notify_dist = aioble.Characteristic(self.service, self.CHAR_UUID2, read=True, notify=True)
         # read + notify characterisic for battery level
         self.char_notify_soc = aioble.Characteristic(self.service, self.CHAR_UUID3, read=True, notify=True)        
+        # write any value to request a profiler report (rbprof.pack), then read it
+        self.char_prof = aioble.Characteristic(self.service, self.CHAR_UUID4, read=True, write=True, notify=True)
+        # write 1 to start the telemetry stream (rbtelemetry), 0 to stop it
+        self.char_tele = aioble.Characteristic(self.service, self.CHAR_UUID5, write=True, notify=True)
         #register service with one characteristic: write
         aioble.register_services(self.service)
         
@@ -45,12 +51,18 @@ class rbble:
         self.btn_lft = False
         self.btn_rgt = False
         self.btn_fn0 = False        
+        # throttle 0..100 % (optional 2nd byte in rc mode), None if not sent
+        self.throttle = None
         
         self.cmd = 'STOP'
         self.dist = 9999
         self.soc  = 9999        
         self.mode = 'rc'
         self.code = 0xFF
+        # motion loop profiler (rbprof), None if compiled out
+        self.prof = None
+        # motion loop telemetry (rbtelemetry), None if compiled out
+        self.tele = None
         
     def handle_buttons(self,msg):
         if (msg & 0x01) == 0x01: self.btn_fwd = True
@@ -89,6 +101,32 @@ class rbble:
             self.char_notify_soc.notify(connection, data)
             await asyncio.sleep(2)            
 
+    async def send_data_prof(self, connection):
+        # statistics are only calculated on request
+        while connection.is_connected():
+            await self.char_prof.written()
+            if self.prof is not None:
+                data = self.prof.pack()
+                self.char_prof.write(data)
+                # notification is truncated to the negotiated MTU, read for the full report
+                self.char_prof.notify(connection, data)
+
+    async def send_data_tele(self, connection):
+        # telemetry datagrams in notify sized chunks, only while requested
+        task = None
+        try:
+            while connection.is_connected():
+                await self.char_tele.written()
+                data = self.char_tele.read()
+                if task is not None:
+                    task.cancel()
+                    task = None
+                if self.tele is not None and data and data[0]:
+                    task = asyncio.create_task(self.tele.stream_ble(self.char_tele, connection))
+        finally:
+            if task is not None:
+                task.cancel()
+
     async def receive_cmd(self, connection):
         while connection.is_connected():
             await self.char_cmd.written()
@@ -98,6 +136,8 @@ class rbble:
                 print(cmd)
                 if self.mode == 'rc':
                     self.handle_buttons(cmd)                    
+                    if len(data) > 1:
+                        self.throttle = min(data[1], 100)
                 elif self.mode == 'raw':
                     self.handle_command_raw(cmd)
                                
@@ -111,7 +151,9 @@ class rbble:
                 tx_task0 = asyncio.create_task(self.send_data_dist(connection))
                 tx_task1 = asyncio.create_task(self.send_data_soc(connection))                
                 rx_task0 = asyncio.create_task(self.receive_cmd(connection))
-                await asyncio.gather(tx_task0, tx_task1, rx_task0)
+                rx_task1 = asyncio.create_task(self.send_data_prof(connection))
+                tx_task2 = asyncio.create_task(self.send_data_tele(connection))
+                await asyncio.gather(tx_task0, tx_task1, rx_task0, rx_task1, tx_task2)
                 
     def set_mode(self, mode):
         self.mode = mode
@@ -0,0 +1,121 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+from collections import deque
+from robug_constants import constants as c
+
+############################
+## class rbchan
+############################
+class rbchan:
+
+    # command / reply channel between supervisor (rbctrl) and motion
+    # controller (rbcom)
+    # every command gets a sequence id and an asyncio.Event. the motion
+    # controller takes the commands in FIFO order and replies to the one it
+    # is executing, which wakes the waiting caller at once. several commands
+    # may be in flight, each caller waits for the reply to its own id.
+
+    def __init__(self, iSize=c._CHAN_SIZE):
+        self.iSize = iSize
+        # (seq, msg) of commands not yet taken by the motion controller
+        self.qCmd = deque((), iSize)
+        # seq -> [event, reply] of commands waiting for their reply
+        self.dPending = {}
+        self.iSeq = 0
+        # seq of the command the motion controller is executing
+        self.iCurrent = None
+        # session recorder (robug_replay), None if not recording
+        self.rec = None
+
+    #--------------------------------
+    #-- supervisor side -------------
+    #--------------------------------
+
+    def post(self, msg):
+        # queue a command, returns its sequence id
+        if len(self.qCmd) >= self.iSize:
+            raise IndexError('command queue full')
+        if self.rec:
+            self.rec.log(msg)
+        self.iSeq = (self.iSeq + 1) & 0xFFFF
+        self.dPending[self.iSeq] = [asyncio.Event(), None]
+        self.qCmd.append((self.iSeq, msg))
+        return self.iSeq
+
+    async def wait(self, seq):
+        # reply to command seq
+        slot = self.dPending[seq]
+        await slot[0].wait()
+        del self.dPending[seq]
+        return slot[1]
+
+    async def request(self, msg):
+        # post and wait for the reply
+        return await self.wait(self.post(msg))
+
+    def in_flight(self):
+        return len(self.dPending)
+
+    #--------------------------------
+    #-- motion controller side ------
+    #--------------------------------
+
+    def take(self):
+        # next command in FIFO order, becomes the current command
+        seq, msg = self.qCmd.popleft()
+        self.iCurrent = seq
+        return msg
+
+    def reply(self, strRply, seq=None):
+        # reply to the current command (or seq), first reply wins
+        slot = self.dPending.get(self.iCurrent if seq is None else seq)
+        if slot is None or slot[0].is_set():
+            return
+        slot[1] = strRply
+        slot[0].set()
+
+# --------------------------------------------------------
+# host check: two commands in flight, replies in order
+# --------------------------------------------------------
+if __name__ == '__main__':
+
+    async def motion(chan, lTaken):
+        for _ in range(2):
+            while not chan.qCmd:
+                await asyncio.sleep(0)
+            msg = chan.take()
+            lTaken.append(msg)
+            await asyncio.sleep(0.01)
+            chan.reply('DONE ' + msg)
+
+    async def main():
+        chan = rbchan()
+        lTaken = []
+        task = asyncio.create_task(motion(chan, lTaken))
+        seq0 = chan.post('RESUME_FWD')
+        seq1 = chan.post('PAUSE')
+        assert seq0 != seq1 and chan.in_flight() == 2
+        # waiting for the later command first, each wait gets its own reply
+        assert await chan.wait(seq1) == 'DONE PAUSE'
+        assert chan.in_flight() == 1
+        assert await chan.wait(seq0) == 'DONE RESUME_FWD'
+        assert chan.in_flight() == 0
+        await task
+        assert lTaken == ['RESUME_FWD', 'PAUSE']
+        print('OK')
+
+    asyncio.run(main())
@@ -13,139 +13,185 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from robug_constants import constants as c
+
+############################
+## class rbcom
+############################
 class rbcom:
 
-    def __init__(self, MsgQueue, RplyQueue):
-        self.MsgQueue = MsgQueue
-        self.RplyQueue = RplyQueue
-        self.strMsg = ''
+    # command protocol between supervisor and motion controller
+    # a command is an opcode plus a sub-opcode. on the queue a message is
+    # the int code (op << 4) | sub, or for compatibility one of the message
+    # strings in MSG (rbctrl, BLE apps). get_command() decodes both with a
+    # single lookup into preallocated (op, sub) tuples.
+    # int codes may carry an argument above ARG_SHIFT (e.g. SPEED: throttle
+    # in %), available as iArg while the command is processed.
+    # 'MOTION_<name>' plays the motion primitive name (robug_motion), the
+    # name is available as strArg.
+
+    # opcodes
+    OP_NOP        = 0
+    OP_START_STEP = 1
+    OP_RESUME     = 2
+    OP_PAUSE      = 3
+    OP_STOP_STEP  = 4
+    OP_TURN_LFT   = 5
+    OP_TURN_RGT   = 6
+    OP_WALK_LFT   = 7
+    OP_WALK_RGT   = 8
+    OP_WALK_STRGT = 9
+    OP_LIFT_LEGS  = 10
+    OP_PUSH_LEGS  = 11
+    OP_ROTATE_DN  = 12
+    OP_ROTATE_UP  = 13
+    OP_SIT_DOWN   = 14
+    OP_STAND_UP   = 15
+    OP_SHIFT_COM  = 16
+    OP_KICK       = 17
+    OP_PURR       = 18
+    OP_EXIT       = 19
+    OP_SPEED      = 20
+    OP_MOTION     = 21
+    OP_UNKNOWN    = 22
+    OP_COUNT      = 23
+
+    # sub-opcodes
+    SUB_NA  = 0
+    SUB_FWD = 1
+    SUB_BWD = 2
+    SUB_COUNT = 3
+
+    # argument of an int code, above opcode and sub-opcode
+    ARG_SHIFT = 9
+    CODE_MASK = (1 << ARG_SHIFT) - 1
+
+    OP_NAMES  = ('NOP', 'START_STEP', 'RESUME', 'PAUSE', 'STOP_STEP', 'TURN_LFT', 'TURN_RGT',
+                 'WALK_LFT', 'WALK_RGT', 'WALK_STRGT', 'LIFT_LEGS', 'PUSH_LEGS', 'ROTATE_DN',
+                 'ROTATE_UP', 'SIT_DOWN', 'STAND_UP', 'SHIFT_COM', 'KICK', 'PURR', 'EXIT', 'SPEED', 'MOTION', 'UNKNOWN')
+    SUB_NAMES = ('NA', 'FWD', 'BWD')
+
+    # message strings -> (op, sub)
+    MSG = {
+        # transition stop pose (neutral stance) -> start pose
+        'START_POSE_FWD': (OP_START_STEP, SUB_FWD),
+        'START_POSE_BWD': (OP_START_STEP, SUB_BWD),
+        # transition start pose -> move
+        'RESUME_FWD':     (OP_RESUME,     SUB_FWD),
+        'RESUME_BWD':     (OP_RESUME,     SUB_BWD),
+        'PAUSE':          (OP_PAUSE,      SUB_NA),
+        # transition moving -> stop pose (neutral stance)
+        'STOP_POSE_FWD':  (OP_STOP_STEP,  SUB_FWD),
+        'STOP_POSE_BWD':  (OP_STOP_STEP,  SUB_BWD),
+        # turning at the spot or when walking
+        'TURN_LFT':       (OP_TURN_LFT,   SUB_NA),
+        'TURN_RGT':       (OP_TURN_RGT,   SUB_NA),
+        'WALK_LFT':       (OP_WALK_LFT,   SUB_NA),
+        'WALK_RGT':       (OP_WALK_RGT,   SUB_NA),
+        'WALK_STRGT':     (OP_WALK_STRGT, SUB_NA),
+        # scripted actions
+        'LIFT_LEGS':      (OP_LIFT_LEGS,  SUB_NA),
+        'PUSH_LEGS':      (OP_PUSH_LEGS,  SUB_NA),
+        'LOOK_DOWN':      (OP_ROTATE_DN,  SUB_NA),
+        'LOOK_UP':        (OP_ROTATE_UP,  SUB_NA),
+        'SIT_DOWN':       (OP_SIT_DOWN,   SUB_NA),
+        'STAND_UP':       (OP_STAND_UP,   SUB_NA),
+        'SHIFT_COM_FWD':  (OP_SHIFT_COM,  SUB_FWD),
+        'SHIFT_COM_BWD':  (OP_SHIFT_COM,  SUB_BWD),
+        'KICK':           (OP_KICK,       SUB_NA),
+        'PURR':           (OP_PURR,       SUB_NA),
+        # special case handling
+        '_NOP_':          (OP_NOP,        SUB_NA),
+        'EXIT':           (OP_EXIT,       SUB_NA),
+    }
+
+    CMD_NOP     = (OP_NOP, SUB_NA)
+    CMD_UNKNOWN = (OP_UNKNOWN, SUB_NA)
+    CMD_MOTION  = (OP_MOTION, SUB_NA)
+
+    def __init__(self, chan):
+        # command / reply channel (rbchan), commands in qCmd
+        self.chan = chan
+        self.qCmd = chan.qCmd
+        self.msg = None
+        # argument of the current command
+        self.iArg = 0
+        self.strArg = None
+        # int code -> (op, sub), codes of undefined ops decode to unknown
+        self.lDecode = [self.CMD_UNKNOWN] * (self.OP_COUNT << 4)
+        for op in range(self.OP_COUNT):
+            for sub in range(self.SUB_COUNT):
+                self.lDecode[self.encode(op, sub)] = (op, sub)
+
+    @classmethod
+    def encode(cls, op, sub=0, arg=0):
+        return (arg << cls.ARG_SHIFT) | (op << 4) | sub
+
+    @classmethod
+    def encode_msg(cls, msg):
+        # message string -> int code, other values are passed through
+        cmd = cls.MSG.get(msg) if isinstance(msg, str) else None
+        if cmd is None:
+            return msg
+        return cls.encode(cmd[0], cmd[1])
+
+    @classmethod
+    def name(cls, op, sub=0):
+        return cls.OP_NAMES[op] + '_' + cls.SUB_NAMES[sub]
+
+    def pending(self):
+        # a command is waiting
+        return len(self.qCmd) > 0
 
     def check_inbox(self):
-        strMsg = '_NOP_'
-        if len(self.MsgQueue) > 0:
-            strMsg = self.MsgQueue.pop()
-            print('motion server received: ', strMsg)
-        return strMsg
+        # None if no message is waiting
+        if not self.qCmd:
+            return None
+        self.msg = self.chan.take()
+        if c._COM_PRINT:
+            print('motion server received: ', self.msg)
+        return self.msg
 
     def command_complete(self):
-        self.RplyQueue.append('DONE')
+        self.chan.reply('DONE')
 
-    def command_unknown(self, strCmd):
-        print('unknown command: ', strCmd)
-        self.RplyQueue.append('UNKONWN_CMD')
+    def command_interrupted(self):
+        self.chan.reply('INTERRUPTED')
 
-    def subcommand_unknown(self):
-        self.RplyQueue.append('UNKONWN_SUBCMD')
-
-    def get_command(self):
+    def command_failed(self):
+        self.chan.reply('FAILED')
 
-        strMsg = self.check_inbox()
-
-        # transition stop pose (neutral stance) -> start pose
-        if   strMsg == 'START_POSE_FWD':
-            strCmd = '_cmd_START_STEP_'
-            strSubCmd = '_cmd_FWD_'
+    def command_unknown(self):
+        print('unknown command: ', self.msg)
+        self.chan.reply('UNKONWN_CMD')
 
-        elif strMsg == 'START_POSE_BWD':
-            strCmd = '_cmd_START_STEP_'
-            strSubCmd = '_cmd_BWD_'
-
-        # transition start pose -> move
-        elif strMsg == 'RESUME_FWD':
-            strCmd = '_cmd_RESUME_'
-            strSubCmd = '_cmd_FWD_'
-
-        elif strMsg == 'RESUME_BWD':
-            strCmd = '_cmd_RESUME_'
-            strSubCmd = '_cmd_BWD_'
-            
-        elif strMsg == 'PAUSE':
-            strCmd = '_cmd_PAUSE_'
-            strSubCmd = '_cmd_NA_'            
-
-        # transition moving -> stop pose (neutral stance)
-        elif strMsg == 'STOP_POSE_FWD':
-            strCmd = '_cmd_STOP_STEP_'
-            strSubCmd = '_cmd_FWD_'
-
-        elif strMsg == 'STOP_POSE_BWD':
-            strCmd = '_cmd_STOP_STEP_'
-            strSubCmd = '_cmd_BWD_'
-            
-        # turning at the spot or when walking
-        elif strMsg == 'TURN_LFT':
-            strCmd = '_cmd_TURN_LFT_'
-            strSubCmd = '_cmd_NA_'
-            
-        elif strMsg == 'TURN_RGT':
-            strCmd = '_cmd_TURN_RGT_'
-            strSubCmd = '_cmd_NA_'
-            
-        elif strMsg == 'WALK_LFT':
-            strCmd = '_cmd_WALK_LFT_'
-            strSubCmd = '_cmd_NA_'
-            
-        elif strMsg == 'WALK_RGT':
-            strCmd = '_cmd_WALK_RGT_'
-            strSubCmd = '_cmd_NA_'
-            
-        elif strMsg == 'WALK_STRGT':
-            strCmd = '_cmd_WALK_STRGT_'
-            strSubCmd = '_cmd_NA_'      
-
-        # scripted actions   
-        elif strMsg == 'LIFT_LEGS':
-            strCmd = '_cmd_LIFT_LEGS_'
-            strSubCmd = '_cmd_NA_'
-            
-        elif strMsg == 'PUSH_LEGS':
-            strCmd = '_cmd_PUSH_LEGS_'
-            strSubCmd = '_cmd_NA_'
-            
-        elif strMsg == 'LOOK_DOWN':
-            strCmd = '_cmd_ROTATE_DN_'
-            strSubCmd = '_cmd_NA_'
-            
-        elif strMsg == 'LOOK_UP':
-            strCmd = '_cmd_ROTATE_UP_'
-            strSubCmd = '_cmd_NA_'            
-            
-        elif strMsg == 'SIT_DOWN':
-            strCmd = '_cmd_SIT_DOWN_'
-            strSubCmd = '_cmd_NA_'
-
-        elif strMsg == 'STAND_UP':
-            strCmd = '_cmd_STAND_UP_'
-            strSubCmd = '_cmd_NA_'
-            
-        elif strMsg == 'SHIFT_COM_FWD':
-            strCmd = '_cmd_SHIFT_COM_'
-            strSubCmd = '_cmd_FWD_'
-            
-        elif strMsg == 'SHIFT_COM_BWD':
-            strCmd = '_cmd_SHIFT_COM_'
-            strSubCmd = '_cmd_BWD_'
-            
-        elif strMsg == 'KICK':
-            strCmd = '_cmd_KICK_'
-            strSubCmd = '_cmd_NA_'
-            
-        elif strMsg == 'PURR':
-            strCmd = '_cmd_PURR_'
-            strSubCmd = '_cmd_NA_'            
-            
-        # special case handling
-        elif strMsg == '_NOP_':
-            strCmd = '_cmd_NOP_'
-            strSubCmd = '_cmd_NOP_'
-
-        elif strMsg == 'EXIT':
-            strCmd = '_cmd_EXIT_'
-            strSubCmd = '_cmd_NOP_'
+    def subcommand_unknown(self):
+        self.chan.reply('UNKONWN_SUBCMD')
 
+    def get_command(self):
+        # (op, sub), idle path: one queue check, no allocation
+        if not self.qCmd:
+            return self.CMD_NOP
+        msg = self.check_inbox()
+        # arguments belong to this command only
+        self.iArg = 0
+        self.strArg = None
+        if isinstance(msg, int):
+            self.iArg = msg >> self.ARG_SHIFT
+            msg &= self.CODE_MASK
+            if 0 <= msg < len(self.lDecode):
+                cmd = self.lDecode[msg]
+            else:
+                cmd = self.CMD_UNKNOWN
+        else:
+            cmd = self.MSG.get(msg, self.CMD_UNKNOWN)
+            if cmd is self.CMD_UNKNOWN and isinstance(msg, str) and msg.startswith('MOTION_'):
+                cmd = self.CMD_MOTION
+                self.strArg = msg[7:]
+        if cmd[0] != self.OP_NOP:
+            if c._COM_PRINT:
+                print('translation: ', self.name(cmd[0], cmd[1]))
         else:
-            strCmd = '_cmd_UNKNOWN_'
-            strSubCmd = '_cmd_UNKNOWN_'
-        if strCmd != '_cmd_NOP_':
-            print(f'translation: {strCmd}, {strSubCmd}')
-        return strCmd, strSubCmd
+            # an explicit no-op has nothing to execute, release the caller
+            self.command_complete()
+        return cmd
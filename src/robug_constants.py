@@ -45,6 +45,17 @@ class constants:
     # servo limits
     _SERVO_MAX     = 2600
     _SERVO_MIN     =  400
+    # fraction bits of the fixed point tick -> duty transform (robug_joints)
+    _SERVO_DUTY_Q  = 10
+    # servo output backend (robug_servo)
+    # 'pwm': hardware pwm, channels written one after another
+    # 'batch': hardware pwm, whole frame written with interrupts disabled
+    # 'pio': one PIO state machine per leg (rp2), _SERVO_PIO_SM
+    _SERVO_BACKEND = 'pwm'
+    # state machine ids of the 'pio' backend, per leg, all in one PIO block
+    # (0-3: PIO0, 4-7: PIO1), the wireless driver of the Pico W claims one
+    # of the other block
+    _SERVO_PIO_SM  = [0, 1, 2, 3]
     
     # servo to gpio mapping
     # [0] front left femur
@@ -68,6 +79,8 @@ class constants:
         _PIN_I2C_SDA   = 20
         _PIN_I2C_SCL   = 21
         _PIN_ADC       = 26
+        # VL53L0X GPIO1 (new sample interrupt), None: not wired, polled
+        _PIN_TOF_INT   = None
 
     elif _HW == 'V100':
         _SERVO_MAP     = [12, 11, 4, 3, 15, 14, 1, 0]
@@ -80,6 +93,7 @@ class constants:
         _PIN_I2C_SDA   = 8
         _PIN_I2C_SCL   = 9
         _PIN_ADC       = 26        
+        _PIN_TOF_INT   = None
 
     else:
         print('unknown hardware version')
@@ -124,6 +138,15 @@ class constants:
     # speedy: 8
     _GAIT_LOOP_TIME = 9
     
+    # frame scheduler policy for overrun frames (robug_sched)
+    # 'skip': drop missed frames, 'catch_up': run them back to back, 'resync'
+    _SCHED_POLICY = 'skip'
+    # max. number of frames caught up before resync
+    _SCHED_MAX_CATCHUP = 3
+
+    # max. number of commands queued in the command channel (robug_chan)
+    _CHAN_SIZE = 8
+    
     # height over ground
     # ref: shoulder joint
     # +z points up, -z points down
@@ -208,6 +231,18 @@ class constants:
     # offset between diagonal legs for symmetric trott gait
     _GAIT_PHASE_OFFSET = (_GAIT_SUPPORT_TICKS + _GAIT_SWING_TICKS) / 2
     _GAIT_LEG_PHASE_OFFSET = [0, _GAIT_PHASE_OFFSET, _GAIT_PHASE_OFFSET, 0]
+
+    # gait speed: loop counter increment per tick, 1.0 = nominal timing
+    # (_GAIT_SUPPORT_TICKS + _GAIT_SWING_TICKS per cycle). the throttle
+    # 0..100 % maps to _GAIT_SPEED_MIN.._GAIT_SPEED_MAX, speedy (loop time
+    # 8 instead of 9) is about 1.125. the speed moves towards the set value
+    # by at most _GAIT_SPEED_SLEW per tick.
+    # speeds are multiples of 1/_GAIT_SPEED_RES: the loop counters of all
+    # legs stay exact binary fractions, the phase offset never drifts
+    _GAIT_SPEED_RES  = 256
+    _GAIT_SPEED_MIN  = 0.25
+    _GAIT_SPEED_MAX  = 1.125
+    _GAIT_SPEED_SLEW = 2 / _GAIT_SPEED_RES
    
     # neutral foot position offset
     # golden: + 15 (depends on body height i guess, here it was -100)
@@ -232,7 +267,146 @@ class constants:
     # FR: inherent +x is away from body , so fwd -> no correction req., DIR =  1
     # RR: inherent +x is away from body , so bwd -> correction req.,    DIR = -1        
     _LEG_DIR = [ 1, -1,  1, -1]
-    
+
+    # ------- gait tables -------
+
+    # play back precompiled per-tick foot positions and servo ticks
+    # (robug_gaitc) instead of calculating the trajectory every tick
+    _GAIT_TABLE = True
+
+    # max. number of compiled parameter sets kept in memory
+    _GAIT_TABLE_CACHE = 16
+
+    # ------- motion primitives -------
+
+    # keyframe motions (robug_motion), loaded on top of the built-in ones
+    _MOTION_FILE = 'robug_motions.json'
+
+    # frame cache of compiled motions (robug_framecache), allocated at boot,
+    # 34 bytes per frame: 16 KB hold all built-in motions for ~3 stances
+    _FRAME_CACHE_BYTES = 16384
+
+    # ------- robot state -------
+
+    # struct of arrays core (robug_state): the per tick state of all legs
+    # in one float array, rbleg / rbgait are views on it
+    _STATE_SOA = False
+
+    # ------- profiler -------
+
+    # per-frame stage timings of the motion loop (robug_prof)
+    # False: no profiler is created, probes reduce to 'if self.prof:'
+    _PROF = False
+
+    # ring buffer size in frames for min/mean/p99/max statistics
+    _PROF_FRAMES = 256
+
+    # interval of the console report in main.py
+    _PROF_PRINT_MS = 10000
+
+    # ------- telemetry -------
+
+    # per-frame telemetry ring of the motion loop (robug_telemetry),
+    # streamed over UDP (explorer: 'TELE ON') or BLE notify
+    # False: no recorder is created, the scheduler hook reduces to 'if self.tele:'
+    _TELE = False
+
+    # ring buffer size in frames
+    _TELE_FRAMES = 128
+
+    # frames per datagram, 60 bytes each: keep a datagram below the MTU
+    _TELE_BATCH = 16
+
+    # stream interval in ms, the ring must hold the frames of one interval
+    _TELE_PERIOD_MS = 100
+
+    # BLE notify size in bytes (negotiated MTU - 3)
+    _TELE_BLE_CHUNK = 20
+
+    # console trace of every command taken by the motion controller (rbcom),
+    # the telemetry stream records the commands as well
+    _COM_PRINT = True
+
+    # ------- session record / replay -------
+
+    # record the commands and a digest of the frame stream (robug_replay),
+    # saved with m.rec.save(), replayed with rbreplayer
+    _REC = False
+
+    # frames per digest of the frame stream
+    _REC_CHUNK = 64
+
+    # session log written by the apps, replayed by robug_app_replay
+    _REC_FILE = 'robug_session.rbl'
+
+    # ------- ik solver -------
+
+    # solve all legs in one batched call per frame (robug.solve_ik_batch)
+    _IK_BATCH = True
+
+    # ------- ik lookup table -------
+
+    # use precomputed ik table (robug_iktable) instead of analytic solver
+    _IK_TABLE = False
+
+    # max. interpolation error vs. analytic solver in servo ticks
+    # grid spacing is refined at build time until this bound holds
+    _IK_TABLE_MAX_ERR = 2.0
+
+    # max. share of cells allowed to fall back to the analytic solver
+    # because they violate the error bound (close to the workspace boundary)
+    _IK_TABLE_MAX_FALLBACK = 0.1
+
+    # table file on flash, rebuilt if missing or built for other parameters
+    _IK_TABLE_FILE = 'robug_iktable.bin'
+
+    # workspace covered by the table in leg space (gait envelope + margin)
+    # foot positions outside are solved by the analytic solver
+    _IK_TABLE_XMIN = _FOOT_XOFFSET - _ASYM_XSHIFT - 2*_GAIT_HALF_STRIDE
+    _IK_TABLE_XMAX = _FOOT_XOFFSET + _ASYM_XSHIFT + 2*_GAIT_HALF_STRIDE
+    _IK_TABLE_ZMIN = _GAIT_HEIGHT - 20
+    _IK_TABLE_ZMAX = _GAIT_HEIGHT + _GAIT_SWING_AMPL + 45
+
+    # ------- distance sensor -------
+
+    # ranging profiles (robug_tof): timing budget in us, inter measurement
+    # period in ms (> budget), signal rate limit in MCPS (lower: longer range)
+    _TOF_PROFILES = {
+        # walking: high sample rate, short range
+        'fast':     (20000,   25, 0.25),
+        # stationary scans: accurate, long range
+        'accurate': (100000, 110, 0.1),
+        # standing idle: low power
+        'idle':     (33000,  500, 0.25),
+    }
+
+    # profile at start, switched by the motion controller (rbmocon) from
+    # its state: walking 'fast', stationary 'accurate', idle 'idle'
+    _TOF_PROFILE = 'idle'
+
+    # stationary time without commands until the 'idle' profile in ms
+    _TOF_IDLE_MS = 3000
+
+    # interrupt status poll interval in ms if GPIO1 is not wired
+    _TOF_POLL_MS = 10
+
+    # distance filter fed by the ranging task (robug_filter)
+    # 'median': running median, 'ema': exponential moving average,
+    # 'outlier': mean of the window without outliers
+    _TOF_FILTER = 'median'
+
+    # window of the filter in samples
+    _TOF_FILTER_N = 6
+
+    # weight of the new sample ('ema')
+    _TOF_FILTER_ALPHA = 0.3
+
+    # max. deviation from the running median in mm ('outlier')
+    _TOF_OUTLIER_MM = 100
+
+    # rejects in a row taken as a real change of the distance ('outlier')
+    _TOF_OUTLIER_N = 3
+
     # LED control
     _LED_PWM_FREQ = 1000
 
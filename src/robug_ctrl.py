@@ -14,26 +14,28 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import asyncio
-from collections import deque
+from robug_com import rbcom
 
 class rbctrl:
     
-    def __init__(self, MsgQueue, RplyQueue):
-        self.txq = MsgQueue
-        self.rxq = RplyQueue
+    def __init__(self, chan):
+        # command / reply channel (rbchan) shared with the motion controller
+        self.chan = chan
         
-    async def wait_for_reply(self):   
-        while True:
-            if len(self.rxq) > 0:
-                strRply = self.rxq.pop()
-                print(f'client received reply: {strRply}\n')
-                return strRply
-            await asyncio.sleep_ms(100)
+    async def wait_for_reply(self, seq):
+        # woken by the reply to command seq, no polling
+        strRply = await self.chan.wait(seq)
+        print(f'client received reply: {strRply}\n')
+        return strRply
             
-    async def send_cmd(self, strCMD):
-        self.txq.append(strCMD)
+    def post_cmd(self, strCMD):
+        # queue a command without waiting, returns its sequence id
+        # message strings are translated to opcodes at the boundary
         print(f'supervisor sending {strCMD}')
-        reply = await self.wait_for_reply()
+        return self.chan.post(rbcom.encode_msg(strCMD))
+            
+    async def send_cmd(self, strCMD):
+        reply = await self.wait_for_reply(self.post_cmd(strCMD))
         if reply == 'DONE': return True
         else: return False
         
@@ -82,6 +84,14 @@ class rbctrl:
         
     async def walk_strgt(self):
         await self.send_cmd('WALK_STRGT')        
+
+    async def play_motion(self, strName):
+        # motion primitive by name (robug_motion, robug_motions.json)
+        return await self.send_cmd('MOTION_' + strName)
+
+    async def set_speed(self, iPct):
+        # throttle 0..100 %, opcode with argument (no message string)
+        await self.send_cmd(rbcom.encode(rbcom.OP_SPEED, rbcom.SUB_NA, iPct))
         
     async def sit_down(self):
         await self.send_cmd('SIT_DOWN')
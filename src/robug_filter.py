@@ -0,0 +1,224 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from array import array
+from robug_constants import constants as c
+
+try:
+    from time import ticks_ms, ticks_diff
+except ImportError:
+    # cpython
+    from time import monotonic_ns
+    def ticks_ms(): return monotonic_ns() // 1000000
+    def ticks_diff(a, b): return a - b
+
+############################
+## class rbfilter
+############################
+class rbfilter:
+
+    # streaming estimator on the last n samples (u16, e.g. distance in mm)
+    # in a fixed ring buffer. add() is called once per sample (rbtof) and
+    # updates the estimate incrementally, value() / age_ms() only read it.
+    # subclasses implement update(iSample, iOld) for the actual estimator:
+    # fold in the new sample, drop iOld (None while the ring fills up) and
+    # set iValue.
+
+    def __init__(self, n=c._TOF_FILTER_N):
+        self.n = n
+        self.aRing = array('H', bytes(2*n))
+        self.reset()
+
+    def reset(self):
+        # forget all samples, value() is None until the next add()
+        self.iCount = 0
+        self.iFill = 0
+        self.iValue = None
+        self.iTime = ticks_ms()
+
+    def add(self, iSample, iTime=None):
+        k = self.iCount % self.n
+        # sample leaving the window, None while the ring fills up
+        iOld = self.aRing[k] if self.iFill == self.n else None
+        self.aRing[k] = iSample
+        self.iCount += 1
+        if self.iFill < self.n:
+            self.iFill += 1
+        self.iTime = ticks_ms() if iTime is None else iTime
+        self.update(iSample, iOld)
+
+    #--------------------------------
+    #-- queries ---------------------
+    #--------------------------------
+
+    def value(self):
+        return self.iValue
+
+    def age_ms(self):
+        # age of the newest sample in the estimate
+        return ticks_diff(ticks_ms(), self.iTime)
+
+    def estimate(self):
+        # (value, age in ms)
+        return self.iValue, self.age_ms()
+
+    @staticmethod
+    def create(strKind=c._TOF_FILTER, n=c._TOF_FILTER_N):
+        if strKind == 'median':
+            return rbfilter_median(n)
+        if strKind == 'ema':
+            return rbfilter_ema(n)
+        if strKind == 'outlier':
+            return rbfilter_outlier(n)
+        raise ValueError('unknown filter: ' + strKind)
+
+############################
+## class rbfilter_median
+############################
+class rbfilter_median(rbfilter):
+
+    # running median: the window is kept sorted in aSort, each sample moves
+    # one entry out and one in (at most n shifts, no sort per query).
+    # even window: mean of the middle pair
+
+    def __init__(self, n=c._TOF_FILTER_N):
+        self.aSort = array('H', bytes(2*n))
+        super().__init__(n)
+
+    def update(self, iSample, iOld):
+        a = self.aSort
+        m = self.iFill
+        if iOld is None:
+            j = m - 1
+        else:
+            # remove iOld, the gap moves to the end
+            j = 0
+            while a[j] != iOld:
+                j += 1
+            while j < m - 1:
+                a[j] = a[j+1]
+                j += 1
+        # insert iSample into a[0:m-1]
+        while j > 0 and a[j-1] > iSample:
+            a[j] = a[j-1]
+            j -= 1
+        a[j] = iSample
+        self.iValue = (a[(m-1) >> 1] + a[m >> 1]) >> 1
+
+############################
+## class rbfilter_ema
+############################
+class rbfilter_ema(rbfilter):
+
+    # exponential moving average, weight c._TOF_FILTER_ALPHA of the new
+    # sample. the ring only serves history, the estimate needs no window.
+
+    def __init__(self, n=c._TOF_FILTER_N, fAlpha=c._TOF_FILTER_ALPHA):
+        self.fAlpha = fAlpha
+        super().__init__(n)
+
+    def reset(self):
+        super().reset()
+        self.fValue = 0.0
+
+    def update(self, iSample, iOld):
+        if self.iCount == 1:
+            self.fValue = iSample
+        else:
+            self.fValue += self.fAlpha * (iSample - self.fValue)
+        self.iValue = int(self.fValue + 0.5)
+
+############################
+## class rbfilter_outlier
+############################
+class rbfilter_outlier(rbfilter_median):
+
+    # mean of the window without outliers: a sample further than
+    # c._TOF_OUTLIER_MM from the running median is rejected (not added to
+    # the window). c._TOF_OUTLIER_N rejects in a row are a real change of
+    # the distance, the window restarts from the rejected samples.
+
+    def __init__(self, n=c._TOF_FILTER_N, iMaxDev=c._TOF_OUTLIER_MM, iMaxRejects=c._TOF_OUTLIER_N):
+        self.iMaxDev = iMaxDev
+        self.iMaxRejects = iMaxRejects
+        self.aRejects = array('H', bytes(2*iMaxRejects))
+        super().__init__(n)
+
+    def reset(self):
+        super().reset()
+        self.iSum = 0
+        self.iMedian = 0
+        self.iRejects = 0
+
+    def add(self, iSample, iTime=None):
+        if self.iFill and abs(iSample - self.iMedian) > self.iMaxDev:
+            self.aRejects[self.iRejects] = iSample
+            self.iRejects += 1
+            if self.iRejects < self.iMaxRejects:
+                return
+            # step change: restart from the rejected samples
+            n = self.iRejects
+            self.reset()
+            for k in range(n - 1):
+                super().add(self.aRejects[k], iTime)
+        self.iRejects = 0
+        super().add(iSample, iTime)
+
+    def update(self, iSample, iOld):
+        super().update(iSample, iOld)
+        self.iMedian = self.iValue
+        self.iSum += iSample - (0 if iOld is None else iOld)
+        self.iValue = (self.iSum + (self.iFill >> 1)) // self.iFill
+
+# --------------------------------------------------------
+# host check: estimators against a window recomputed per sample
+# --------------------------------------------------------
+if __name__ == '__main__':
+
+    import random
+
+    random.seed(1)
+    lSamples = [300 + random.randint(-10, 10) for k in range(40)]
+    lSamples[10] = 8190
+    lSamples[25:] = [150 + random.randint(-10, 10) for k in range(15)]
+
+    for strKind in ('median', 'ema', 'outlier'):
+        f = rbfilter.create(strKind, 6)
+        lOut = []
+        fEma = lSamples[0]
+        for k, iSample in enumerate(lSamples):
+            f.add(iSample)
+            if strKind == 'median':
+                l = sorted(lSamples[max(0, k-5):k+1])
+                assert f.value() == (l[(len(l)-1) >> 1] + l[len(l) >> 1]) >> 1
+            elif strKind == 'ema':
+                fEma += c._TOF_FILTER_ALPHA * (iSample - fEma)
+                assert f.value() == int(fEma + 0.5), k
+            lOut.append(f.value())
+        print(strKind, lOut[8:14], lOut[24:30])
+        if strKind == 'outlier':
+            # the spike at 10 is ignored, the step at 25 is followed once
+            # c._TOF_OUTLIER_N samples in a row were rejected
+            iStep = 25 + c._TOF_OUTLIER_N - 1
+            assert all(abs(v - 300) <= 10 for v in lOut[:iStep]), lOut[:iStep]
+            assert all(abs(v - 150) <= 10 for v in lOut[iStep:]), lOut[iStep:]
+
+    # age of the newest sample
+    f = rbfilter.create('median', 6)
+    assert f.estimate()[0] is None
+    f.add(300, ticks_ms() - 500)
+    iValue, iAge = f.estimate()
+    assert iValue == 300 and 500 <= iAge < 600, iAge
+    print('OK')
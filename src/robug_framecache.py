@@ -0,0 +1,171 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from array import array
+from robug_constants import constants as c
+
+############################
+## class rbframecache
+############################
+class rbframecache:
+
+    # cache of solved frame sequences in one fixed-size pool of 16 bit words
+    # allocated at boot. an entry is a contiguous run of words in the pool
+    # plus a small record (offset, words, last use, user data) in a dict.
+    # if the pool is full the least recently used entries are evicted and
+    # the remaining entries are moved together, so a miss costs at most one
+    # pass over the pool and a hit costs a dict lookup.
+
+    def __init__(self, iBytes=c._FRAME_CACHE_BYTES):
+        self.iSize = iBytes // 2
+        self.aPool = array('H', bytes(2 * self.iSize))
+        self.mv = memoryview(self.aPool)
+        # key -> [offset, words, last use, data]
+        self.dEntry = {}
+        self.iUsed = 0
+        self.iUse = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.iHits = 0
+        self.iMisses = 0
+        self.iEvictions = 0
+
+    def get(self, key):
+        # (pool, offset, data) or None
+        e = self.dEntry.get(key)
+        if e is None:
+            self.iMisses += 1
+            return None
+        self.iHits += 1
+        self.iUse += 1
+        e[2] = self.iUse
+        return self.aPool, e[0], e[3]
+
+    def put(self, key, aWords, data=None):
+        # store aWords under key, evicts least recently used entries,
+        # (pool, offset, data) or None if aWords does not fit into the pool
+        n = len(aWords)
+        if n > self.iSize:
+            return None
+        if key in self.dEntry:
+            self.remove(key)
+        if self.iSize - self.iUsed < n:
+            # holes of removed entries first, evict only what is still missing
+            self.compact()
+            if self.iSize - self.iUsed < n:
+                while self.iSize - self.iUsed < n:
+                    self.evict()
+                self.compact()
+        k = self.iUsed
+        self.mv[k:k+n] = memoryview(aWords)
+        self.iUsed += n
+        self.iUse += 1
+        self.dEntry[key] = [k, n, self.iUse, data]
+        return self.aPool, k, data
+
+    def remove(self, key):
+        # space is given back by the next compact()
+        e = self.dEntry.pop(key)
+        if e[0] + e[1] == self.iUsed:
+            self.iUsed = e[0]
+
+    def evict(self):
+        # iUsed counts the words of the entries left, valid on a compacted pool
+        lru = None
+        for key, e in self.dEntry.items():
+            if lru is None or e[2] < self.dEntry[lru][2]:
+                lru = key
+        e = self.dEntry.pop(lru)
+        self.iEvictions += 1
+        self.iUsed -= e[1]
+
+    def compact(self):
+        # move the entries to the start of the pool, in pool order
+        mv = self.mv
+        dst = 0
+        for e in sorted(self.dEntry.values()):
+            src, n = e[0], e[1]
+            e[0] = dst
+            # dst < src: copy in chunks that do not overlap
+            while src != dst and n > 0:
+                m = min(n, src - dst)
+                mv[dst:dst+m] = mv[src:src+m]
+                dst += m
+                src += m
+                n -= m
+            dst += n
+        self.iUsed = dst
+
+    def clear(self):
+        self.dEntry.clear()
+        self.iUsed = 0
+
+    def stats(self):
+        return {'hits': self.iHits, 'misses': self.iMisses, 'evictions': self.iEvictions,
+                'entries': len(self.dEntry), 'used_bytes': 2 * self.iUsed, 'pool_bytes': 2 * self.iSize}
+
+# --------------------------------------------------------
+# host check: eviction and compaction keep the entries intact
+# --------------------------------------------------------
+if __name__ == '__main__':
+
+    def check(fc, lKeys):
+        # entries in LRU order, packed from the start of the pool, words intact
+        assert sorted(fc.dEntry, key=lambda key: fc.dEntry[key][2]) == lKeys, fc.dEntry
+        k = 0
+        for e in sorted(fc.dEntry.values()):
+            assert e[0] == k, fc.dEntry
+            k += e[1]
+        assert fc.iUsed == k
+        for key in lKeys:
+            aPool, k, _ = fc.get(key)
+            assert list(aPool[k:k+4+key]) == [key] * (4+key), key
+
+    # 32 words, entry i has 4+i words of value i, 0 is used after every put
+    fc = rbframecache(64)
+    for i in range(6):
+        fc.put(i, array('H', [i] * (4 + i)))
+        fc.get(0)
+    # 5 did not fit: 1 and 2 evicted, 3 and 4 moved down
+    assert fc.stats()['evictions'] == 2 and fc.get(1) is None and fc.get(2) is None
+    assert [fc.dEntry[key][0] for key in (0, 3, 4, 5)] == [0, 4, 11, 19]
+    check(fc, [3, 4, 5, 0])
+    # check() used them in this order, 8 evicts the two least recent
+    fc.put(8, array('H', [8] * 12))
+    assert fc.get(3) is None and fc.get(4) is None
+    check(fc, [5, 0, 8])
+    # removed entries leave holes below the tail, a put of the whole pool
+    # compacts them away instead of evicting from an empty cache
+    fc.clear()
+    fc.put(0, array('H', [0] * 4))
+    fc.put(1, array('H', [1] * 5))
+    fc.remove(0)
+    fc.remove(1)
+    assert not fc.dEntry and fc.iUsed == 4
+    iEvictions = fc.iEvictions
+    aPool, k, _ = fc.put(28, array('H', [28] * 32))
+    assert k == 0 and fc.iEvictions == iEvictions
+    check(fc, [28])
+    # a re-put of an entry below the tail frees its old words the same way
+    fc.clear()
+    fc.put(0, array('H', [0] * 4))
+    fc.put(12, array('H', [12] * 16))
+    fc.put(0, array('H', [0] * 4))
+    fc.put(8, array('H', [8] * 12))
+    assert fc.iEvictions == iEvictions
+    check(fc, [12, 0, 8])
+    print(fc.stats())
+    print('OK')
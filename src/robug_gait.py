@@ -17,11 +17,70 @@ from math import pi, sin
 from robug_utils import v3
 from robug_constants import constants as c
 
+# phase bits of a leg, one bit set per phase (+ support mid)
+PH_START   = 0x01   # support start (phase 1)
+PH_SUPPORT = 0x02   # support (phase 2)
+PH_END     = 0x04   # support end (phase 3)
+PH_SWING   = 0x08   # swing (phase 4)
+PH_MID     = 0x10   # loop counter at support mid
+# leg k uses bits PH_SHIFT*k .. PH_SHIFT*k+4 of the robot phase mask,
+# bits * PH_ALL_LEGS selects them for all four legs
+PH_SHIFT    = 5
+PH_ALL_LEGS = 0x8421
+
+def tbl_at(aTbl, i, n, iStride=1, j=0):
+    # table entry j at loop counter i of a period of n entries,
+    # fractional loop counter -> linear interpolation to the next entry
+    k = int(i)
+    v = aTbl[iStride*k + j]
+    f = i - k
+    if f:
+        k += 1
+        if k >= n:
+            k = 0
+        v += (aTbl[iStride*k + j] - v) * f
+    return v
+
+def loop_step(g, i):
+    # one tick of the loop counter i of gait g, returns the new counter.
+    # the counter advances by incr (gait speed, 1 = nominal), a fractional
+    # incr retimes the gait. support start / end / mid are the ticks the
+    # counter passes 0 / ifwd / ifwd_mid. sets g.phase and g.iPhaseBits.
+    # shared by rbgait.loop_inc and rbstate.loop_inc (aos / soa state)
+    incr = g.incr
+    i += incr
+    if i < 0:
+        i += g.substeps
+    elif i >= g.substeps:
+        i -= g.substeps
+    if i < incr:
+        g.phase = 1
+        bits = PH_START
+    elif i < g.ifwd:
+        g.phase = 2
+        bits = PH_SUPPORT
+    elif i < g.ifwd + incr:
+        g.phase = 3
+        bits = PH_END
+    else:
+        g.phase = 4
+        bits = PH_SWING
+    if i >= g.ifwd_mid and i < g.ifwd_mid + incr:
+        bits |= PH_MID
+    g.iPhaseBits = bits
+    # switch tables at support start only, so the foot never jumps
+    if bits & PH_START and g.bTblPending:
+        g.activate_table()
+    return i
+
 ############################
 ## class rbgait
 ############################
 class rbgait:
 
+    _PH_KEYS = {'support_start': PH_START, 'support_phase': PH_SUPPORT,
+                'support_end': PH_END, 'swing_phase': PH_SWING, 'support_mid': PH_MID}
+
     def __init__(self, iLegID):
 
         # gait generator parameters
@@ -48,6 +107,8 @@ class rbgait:
 
         # internal state
         self.phase = 0
+        # PH_* bits of the current tick
+        self.iPhaseBits = 0
         self.xyz = v3(0.0, 0.0, 0.0)
         self.bPush = True
 
@@ -60,6 +121,13 @@ class rbgait:
         self.irtn_base = c._GAIT_SWING_TICKS
         self.state = 'move'
 
+        # compiled trajectory tables (robug_gaitc), None -> calculate
+        self.aTblX = None
+        self.aTblZ = None
+        self.aTblTicks = None
+        self.tblPending = None
+        self.bTblPending = False
+
         # set up dependent variables
         self.calc_gait_parameters()
         
@@ -81,22 +149,7 @@ class rbgait:
         self.daz = pi/self.irtn    
     
     def loop_inc(self):  
-        self.i += self.incr
-        if self.i < 0:
-            self.i = (self.substeps-1)
-        elif self.i >= self.substeps:
-            self.i = 0
-        if self.i == 0:
-            self.phase = 1
-        elif self.i > 0 and self.i < self.ifwd:
-            self.phase = 2
-        elif self.i == self.ifwd:
-            self.phase = 3
-        elif self.i > self.ifwd and self.i < self.substeps:
-            self.phase = 4
-        else:
-            print('error - unkown gait loop phase in calc_substep_x\n')
-            self.phase = 5    
+        self.i = loop_step(self, self.i)
     
     #-- x-axis handling ----------------------
     # _abs functions: calc x(i) absolute, independent from previous state        
@@ -144,6 +197,9 @@ class rbgait:
 
     def calc_substep_x(self,bAbs):
         if bAbs: self.calc_substep_x_abs()
+        elif self.aTblX is not None:
+            n = int(self.i)
+            self.xyz.x = self.aTblX[n] if n == self.i else tbl_at(self.aTblX, self.i, self.substeps)
         else: self.calc_substep_x_rel()
      
     #-- z-axis handling ----------------------
@@ -199,6 +255,9 @@ class rbgait:
         
     def calc_substep_z(self,bAbs):
         if bAbs: self.calc_substep_z_abs()
+        elif self.aTblZ is not None:
+            n = int(self.i)
+            self.xyz.z = self.aTblZ[n] if n == self.i else tbl_at(self.aTblZ, self.i, self.substeps)
         else: self.calc_substep_z_rel()
         
     #--------------------------------
@@ -212,26 +271,38 @@ class rbgait:
             phase = self.phase
         return self.xyz, phase
 
+    #-- table playback ----------------------
+    # relative trajectory precompiled by rbgaitc, indexed by loop counter,
+    # interpolated between entries if the loop counter is fractional
+
+    def set_table(self, tbl):
+        # tbl = (aX, aZ, aTicks) or None, becomes active at next support start
+        self.tblPending = tbl
+        self.bTblPending = True
+
+    def activate_table(self):
+        if self.tblPending is None:
+            self.aTblX, self.aTblZ, self.aTblTicks = None, None, None
+        else:
+            self.aTblX, self.aTblZ, self.aTblTicks = self.tblPending
+        self.tblPending = None
+        self.bTblPending = False
+
     #--------------------------------
     #-- gait status  ----------------
     #--------------------------------
             
     def set_loop_counter(self, i):
         self.i = i            
+        # phase follows with the next loop_inc, support mid at once
+        self.iPhaseBits = (self.iPhaseBits & ~PH_MID) | (PH_MID if i == self.ifwd_mid else 0)
             
     def get_loop_counter(self):
         return self.i            
             
     def is_loop_frame(self, strKey):
-        # mode
-        if   strKey == 'support_start': a = [1]
-        elif strKey == 'support_end':   a = [3]
-        elif strKey == 'support_phase': a = [2]
-        elif strKey == 'swing_phase':   a = [4]
-        elif strKey == 'support_mid': return self.is_support_mid()
-        # checking for keyframe
-        if int(self.phase) in a: return True
-        else: return False
+        # string keyed query, robug uses the PH_* bits directly
+        return (self.iPhaseBits & self._PH_KEYS[strKey]) != 0
 
     def is_support_mid(self):
         if self.i == self.ifwd_mid: return True
@@ -257,6 +328,14 @@ class rbgait:
     def get_support_mid(self):
         return self.ifwd_mid
 
+    def set_speed(self, fSpeed):
+        # loop counter increment per tick, fractional values need the
+        # compiled tables (the relative trajectory is calculated per tick)
+        self.incr = fSpeed
+
+    def get_speed(self):
+        return self.incr
+
     def set_dxfwd(self, dl, di):
         self.dxfwd = dl / di
         
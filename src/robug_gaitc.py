@@ -0,0 +1,92 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from array import array
+from robug_constants import constants as c
+from robug_gait import rbgait
+
+############################
+## class rbgaitc
+############################
+class rbgaitc:
+
+    # gait compiler
+    # with constant parameters the relative foot trajectory of a leg is
+    # periodic over substeps = support ticks + swing ticks. the compiler
+    # replays one period on a scratch gait generator and stores x/z (and
+    # optionally the servo ticks after ik) in tables indexed by the loop
+    # counter. compiled tables are cached per parameter set.
+
+    def __init__(self, iCacheSize=c._GAIT_TABLE_CACHE):
+        self.iCacheSize = iCacheSize
+        self.dCache = {}
+        self.iCompiled = 0
+
+    def key(self, gait, overlay):
+        # everything the relative trajectory depends on
+        return (gait.ID, gait.dirX, gait.gain, gait.bPush,
+                gait.ifwd, gait.irtn, gait.xmin, gait.xmax,
+                gait.zmin, gait.zampl, gait.xyzImpulse.z, overlay.x, overlay.z)
+
+    def compile(self, gait, overlay, ik=None):
+        # returns (aX, aZ, aTicks), aTicks is None without ik solver
+        k = self.key(gait, overlay)
+        tbl = self.dCache.get(k)
+        if tbl is None or (ik is not None and tbl[2] is None):
+            aX, aZ = self.build_xz(gait)
+            aTicks = None
+            if ik is not None:
+                aTicks = self.build_ticks(aX, aZ, overlay, ik)
+            tbl = (aX, aZ, aTicks)
+            if len(self.dCache) >= self.iCacheSize:
+                self.dCache.clear()
+            self.dCache[k] = tbl
+            self.iCompiled += 1
+        return tbl
+
+    def build_xz(self, gait):
+        # scratch generator with the same parameters
+        g = rbgait(gait.ID)
+        g.dirX = gait.dirX
+        g.gain = gait.gain
+        g.bPush = gait.bPush
+        g.xyzImpulse = gait.xyzImpulse
+        g.zmin = gait.zmin
+        g.zampl = gait.zampl
+        g.xmin = gait.xmin
+        g.xmax = gait.xmax
+        g.ifwd_base = gait.ifwd
+        g.irtn_base = gait.irtn
+        g.calc_gait_parameters()
+        n = g.substeps
+        aX = array('f', bytes(4*n))
+        aZ = array('f', bytes(4*n))
+        # start one tick before support start, x is reset at support start
+        g.set_loop_counter(n-1)
+        for _ in range(n):
+            g.loop_inc()
+            g.calc_substep_z_rel()
+            g.calc_substep_x_rel()
+            aX[g.i] = g.xyz.x
+            aZ[g.i] = g.xyz.z
+        return aX, aZ
+
+    def build_ticks(self, aX, aZ, overlay, ik):
+        # servo ticks [delta, gamma] per loop counter value
+        n = len(aX)
+        aTicks = array('f', bytes(8*n))
+        for i in range(n):
+            ik.solve_into(aX[i] + overlay.x, aZ[i] + overlay.z, aTicks, 2*i)
+        return aTicks
@@ -13,9 +13,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from machine import Pin, PWM
 from math import sqrt, asin, acos, degrees, pi
-from time import sleep
 from robug_utils import v3
 from robug_constants import constants as c
 
@@ -54,3 +52,35 @@ class rbik:
         self.pos = pos
         return fDelta, fGamma
 
+    def solve_into(self, x, z, aTicks, k):
+        # single leg, joint angles in servo ticks into aTicks[k], aTicks[k+1]
+        l3sqr  = x*x + z*z
+        l3     = sqrt(l3sqr)
+        fAlpha = asin(x/l3)
+        fBeta  = acos(-(c._L_TIBIA_PWR2 - c._L_FEMUR_PWR2 - l3sqr) / (c._L_FEMUR_X2 * l3))
+        fGamma = acos(-(l3sqr - c._L_FEMUR_PWR2 - c._L_TIBIA_PWR2) / c._L_FEMUR_X_TIBIA_X2)
+        aTicks[k]   = (pi-fBeta-fAlpha-c._PI0P5)/c._SERVO_K
+        aTicks[k+1] = (fGamma-c._PI0P5)/c._SERVO_K
+
+    def solve_legs(self, aPos, aTicks):
+        # batched solver for all four legs in one pass
+        # aPos:   foot positions [x0, y0, z0, x1, ...], array('f', 12)
+        # aTicks: joint angles in servo ticks [delta0, gamma0, delta1, ...], array('f', 8)
+        l1sqr  = c._L_FEMUR_PWR2
+        l2sqr  = c._L_TIBIA_PWR2
+        l1_x2  = c._L_FEMUR_X2
+        l1l2x2 = c._L_FEMUR_X_TIBIA_X2
+        # femur: pi-beta-alpha, shifted by the neutral position pi/2
+        fOffs  = pi - c._PI0P5
+        fK     = c._SERVO_K
+        for i in range(4):
+            x = aPos[3*i]
+            z = aPos[3*i+2]
+            l3sqr  = x*x + z*z
+            l3     = sqrt(l3sqr)
+            fAlpha = asin(x/l3)
+            fBeta  = acos(-( l2sqr - l1sqr - l3sqr) / (l1_x2 * l3))
+            fGamma = acos(-( l3sqr - l1sqr - l2sqr) / l1l2x2)
+            aTicks[2*i]   = (fOffs-fBeta-fAlpha)/fK
+            aTicks[2*i+1] = (fGamma-c._PI0P5)/fK
+
@@ -0,0 +1,276 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import struct
+from array import array
+from robug_constants import constants as c
+from robug_ik import rbik
+
+############################
+## class rbiktable
+############################
+class rbiktable:
+
+    # precomputed ik solver
+    # the joint angles (in servo ticks) of the analytic solver are sampled
+    # on a regular (x, z) grid in leg space and bilinearly interpolated
+    # at runtime. points outside the grid are solved analytically.
+
+    # file header: magic, nx, nz, x0, z0, step, max. error, l_femur, l_tibia
+    _HEADER = '<4sHHffffff'
+    _MAGIC  = b'RBIK'
+
+    def __init__(self, fMaxErr=c._IK_TABLE_MAX_ERR, strFile=c._IK_TABLE_FILE):
+        self.ik = rbik()
+        self.aTmp = array('f', [0.0, 0.0])
+        self.fMaxErr = fMaxErr
+        self.x0 = c._IK_TABLE_XMIN
+        self.z0 = c._IK_TABLE_ZMIN
+        self.xspan = c._IK_TABLE_XMAX - c._IK_TABLE_XMIN
+        self.zspan = c._IK_TABLE_ZMAX - c._IK_TABLE_ZMIN
+        if strFile is None or not self.load(strFile):
+            self.build()
+            if strFile is not None:
+                self.save(strFile)
+
+    #--------------------------------
+    #-- helper functions ------------
+    #--------------------------------
+
+    def rad2ticks(self, rad):
+        return (rad-c._PI0P5)/c._SERVO_K
+
+    def solve_exact(self, x, z):
+        # analytic solution in ticks, nan if not reachable
+        self.ik.pos.x = x
+        self.ik.pos.z = z
+        try:
+            fDelta, fGamma = self.ik.solve(self.ik.pos)
+        except ValueError:
+            return float('nan'), float('nan')
+        return self.rad2ticks(fDelta), self.rad2ticks(fGamma)
+
+    #--------------------------------
+    #-- table generation ------------
+    #--------------------------------
+
+    def sample(self, fStep):
+        self.step = fStep
+        self.inv_step = 1/fStep
+        self.nx = int(self.xspan/fStep + 0.999) + 1
+        self.nz = int(self.zspan/fStep + 0.999) + 1
+        self.aDelta = array('f', bytes(4*self.nx*self.nz))
+        self.aGamma = array('f', bytes(4*self.nx*self.nz))
+        k = 0
+        for iz in range(self.nz):
+            z = self.z0 + iz*fStep
+            for ix in range(self.nx):
+                self.aDelta[k], self.aGamma[k] = self.solve_exact(self.x0 + ix*fStep, z)
+                k += 1
+        # cells served by the table, others fall back to the analytic solver
+        self.aCell = bytearray((self.nx-1)*(self.nz-1))
+        self.nFallback = 0
+        k = 0
+        h = fStep/2
+        for iz in range(self.nz-1):
+            z = self.z0 + iz*fStep
+            for ix in range(self.nx-1):
+                x = self.x0 + ix*fStep
+                if self.cell_reachable(k + iz):
+                    # bilinear error peaks in the middle of cells and edges
+                    self.aCell[k] = 1
+                    if self.max_error(((x+h, z+h), (x+h, z), (x, z+h))) > self.fMaxErr:
+                        self.aCell[k] = 0
+                        self.nFallback += 1
+                k += 1
+
+    def max_error(self, lPoints):
+        # largest deviation from analytic solver over lPoints [(x, z), ...]
+        # points the table can not serve are skipped
+        fErr = 0.0
+        for x, z in lPoints:
+            fDeltaRef, fGammaRef = self.solve_exact(x, z)
+            fDelta, fGamma = self.lookup(x, z)
+            if fDelta != fDelta or fDeltaRef != fDeltaRef:
+                continue
+            fErr = max(fErr, abs(fDelta-fDeltaRef), abs(fGamma-fGammaRef))
+        return fErr
+
+    def cell_reachable(self, k0):
+        # all four corner nodes of the cell are reachable
+        for k in (k0, k0+1, k0+self.nx, k0+self.nx+1):
+            if self.aDelta[k] != self.aDelta[k]: return False
+        return True
+
+    def build(self):
+        # halve grid spacing until the cells violating the error bound
+        # (close to the workspace boundary) cover a small enough area
+        fStep = 8.0
+        while True:
+            self.sample(fStep)
+            nReachable = sum(self.aCell) + self.nFallback
+            if self.nFallback <= c._IK_TABLE_MAX_FALLBACK * nReachable or fStep <= 1.0:
+                break
+            fStep /= 2
+        print('ik table: {}x{} nodes, step {} mm, {} fallback cells'.format(self.nx, self.nz, self.step, self.nFallback))
+
+    #--------------------------------
+    #-- flash storage ---------------
+    #--------------------------------
+
+    def save(self, strFile):
+        try:
+            with open(strFile, 'wb') as f:
+                f.write(struct.pack(self._HEADER, self._MAGIC, self.nx, self.nz, self.x0, self.z0,
+                                    self.step, self.fMaxErr, c._L_FEMUR, c._L_TIBIA))
+                f.write(self.aDelta)
+                f.write(self.aGamma)
+                f.write(self.aCell)
+        except OSError:
+            print('ik table: could not write ', strFile)
+
+    def load(self, strFile):
+        try:
+            with open(strFile, 'rb') as f:
+                header = struct.unpack(self._HEADER, f.read(struct.calcsize(self._HEADER)))
+                magic, nx, nz, x0, z0, step, fMaxErr, lFemur, lTibia = header
+                # table must match the current geometry and workspace
+                lExpected = [self.x0, self.z0, self.fMaxErr, c._L_FEMUR, c._L_TIBIA]
+                lFound = [x0, z0, fMaxErr, lFemur, lTibia]
+                if magic != self._MAGIC:
+                    return False
+                for i in range(len(lFound)):
+                    if abs(lFound[i]-lExpected[i]) > 1e-3:
+                        return False
+                if (nx-1)*step < self.xspan or (nz-1)*step < self.zspan:
+                    return False
+                self.nx = nx
+                self.nz = nz
+                self.step = step
+                self.inv_step = 1/step
+                self.aDelta = array('f', bytes(4*nx*nz))
+                self.aGamma = array('f', bytes(4*nx*nz))
+                self.aCell = bytearray((nx-1)*(nz-1))
+                f.readinto(self.aDelta)
+                f.readinto(self.aGamma)
+                f.readinto(self.aCell)
+        except (OSError, ValueError):
+            return False
+        return True
+
+    #--------------------------------
+    #-- solver ----------------------
+    #--------------------------------
+
+    def interpolate(self, x, z, aTicks, k):
+        # bilinear interpolation into aTicks[k] (delta) and aTicks[k+1] (gamma)
+        # returns False if (x, z) is not served by the table
+        fx = (x - self.x0) * self.inv_step
+        fz = (z - self.z0) * self.inv_step
+        if fx < 0 or fz < 0:
+            return False
+        ix = int(fx)
+        iz = int(fz)
+        if ix >= self.nx-1 or iz >= self.nz-1:
+            return False
+        if not self.aCell[iz*(self.nx-1) + ix]:
+            return False
+        tx = fx - ix
+        tz = fz - iz
+        k0 = iz*self.nx + ix
+        k1 = k0 + self.nx
+        a = self.aDelta
+        d0 = a[k0] + (a[k0+1]-a[k0])*tx
+        d1 = a[k1] + (a[k1+1]-a[k1])*tx
+        aTicks[k] = d0 + (d1-d0)*tz
+        a = self.aGamma
+        g0 = a[k0] + (a[k0+1]-a[k0])*tx
+        g1 = a[k1] + (a[k1+1]-a[k1])*tx
+        aTicks[k+1] = g0 + (g1-g0)*tz
+        return True
+
+    def lookup(self, x, z):
+        # nan if not served by table
+        if self.interpolate(x, z, self.aTmp, 0):
+            return self.aTmp[0], self.aTmp[1]
+        return float('nan'), float('nan')
+
+    def solve(self, pos):
+        # joint angles in servo ticks
+        if self.interpolate(pos.x, pos.z, self.aTmp, 0):
+            return self.aTmp[0], self.aTmp[1]
+        # outside of table or close to workspace boundary
+        fDelta, fGamma = self.ik.solve(pos)
+        return self.rad2ticks(fDelta), self.rad2ticks(fGamma)
+
+    def solve_into(self, x, z, aTicks, k):
+        # single leg, see rbik.solve_into
+        if not self.interpolate(x, z, aTicks, k):
+            self.ik.solve_into(x, z, aTicks, k)
+
+    def solve_legs(self, aPos, aTicks):
+        # batched solver for all four legs, see rbik.solve_legs
+        for i in range(4):
+            if not self.interpolate(aPos[3*i], aPos[3*i+2], aTicks, 2*i):
+                self.ik.solve_into(aPos[3*i], aPos[3*i+2], aTicks, 2*i)
+
+# --------------------------------------------------------
+# host check: table vs. analytic solver over gait envelope
+# --------------------------------------------------------
+if __name__ == '__main__':
+
+    from robug_gait import rbgait
+
+    def gait_envelope():
+        # foot positions of all legs over full gait cycles for every
+        # gain set, both walking directions and both body lean settings
+        lGains = [c._GAIT_FWD_GAIN, c._GAIT_BWD_GAIN,
+                  c._GAIT_FWD_GAIN_LFT, c._GAIT_BWD_GAIN_LFT,
+                  c._GAIT_FWD_GAIN_RGT, c._GAIT_BWD_GAIN_RGT]
+        lPoints = []
+        for lGain in lGains:
+            for dir in (1, -1):
+                for i in range(4):
+                    g = rbgait(i)
+                    g.set_gain(lGain[i])
+                    g.set_direction(dir * c._LEG_DIR[i], 'x')
+                    g.set_loop_counter(g.substeps-1)
+                    for _ in range(2*g.substeps):
+                        g.loop_inc()
+                        g.calc_substep_z(False)
+                        g.calc_substep_x(False)
+                        for asym in (c._ASYM_XSHIFT, -c._ASYM_XSHIFT):
+                            lPoints.append((g.xyz.x + c._FOOT_XOFFSET + asym, g.xyz.z))
+        return lPoints
+
+    tbl = rbiktable(strFile=None)
+    lPoints = gait_envelope()
+    # refine the envelope: points in between consecutive gait ticks
+    lDense = []
+    for k in range(len(lPoints)-1):
+        (x0, z0), (x1, z1) = lPoints[k], lPoints[k+1]
+        for t in (0.0, 0.25, 0.5, 0.75):
+            lDense.append((x0 + (x1-x0)*t, z0 + (z1-z0)*t))
+    nOutside = 0
+    for x, z in lDense:
+        fDelta, _ = tbl.lookup(x, z)
+        if fDelta != fDelta: nOutside += 1
+    fErr = tbl.max_error(lDense)
+    print('gait envelope: {} points, {} outside of table'.format(len(lDense), nOutside))
+    print('max. error: {:.3f} ticks (bound {:.3f})'.format(fErr, tbl.fMaxErr))
+    if nOutside > 0 or fErr > tbl.fMaxErr:
+        print('FAILED')
+        raise SystemExit(1)
+    print('OK')
@@ -13,13 +13,19 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from machine import Pin, PWM
 from time import sleep
+from array import array
 from robug_constants import constants as c
+
+_Q = c._SERVO_DUTY_Q
         
 class rbjoints:
+
+    # calibration revision, counts every change of an output stage
+    # (frames of precalculated duties depend on it, robug_motion)
+    iCalRev = 0
     
-    def __init__(self, iLegID, lOffs, lGain):
+    def __init__(self, iLegID, lOffs, lGain, servo):
         self.ID   = iLegID
         self.name = c._GAIT_NAME[iLegID]
         # this remaps the femur joint to ID0 and the tibia joint to ID1
@@ -30,41 +36,78 @@ class rbjoints:
         self.lServoSgn  = [c._SERVO_SGN[ID0], c._SERVO_SGN[ID1]]
         self.lServoCal  = [lOffs[ID0], lOffs[ID1]]
         self.lServoGain = [lGain[ID0], lGain[ID1]]        
-        self.lServoPos  = [ 0, 0]
+        # servo output backend (rbservo) shared by all legs, channels ID0, ID1
+        self.servo = servo
+        self.iCh = ID0
         self.iPwmFreq = c._SERVO_PWM_FREQ
         self.iPwmCycle = 1/c._SERVO_PWM_FREQ
         self.iPwmCycle_us = self.iPwmCycle *1e6
         self.fDutyLsb = self.iPwmCycle_us / pow(2,16)
-        self.init_joints()
-    
-    def init_joints(self):
-        TmpPin0 = Pin(self.lServoMap[0])
-        TmpPin1 = Pin(self.lServoMap[1])            
-        TmpPwm0 = PWM(TmpPin0)
-        TmpPwm1 = PWM(TmpPin1)            
-        TmpPwm0.duty_u16(0)
-        TmpPwm1.duty_u16(0)            
-        TmpPwm0.freq(self.iPwmFreq)
-        TmpPwm1.freq(self.iPwmFreq)            
-        self.lServo = [TmpPwm0, TmpPwm1]
+        # output stage: duty = (offs + ticks * gain) >> _Q per channel,
+        # saturated to the servo limits
+        self.aDutyOffs = array('i', [0, 0])
+        self.aDutyGain = array('i', [0, 0])
+        self.iDutyMin = int(c._SERVO_MIN/self.fDutyLsb)
+        self.iDutyMax = int(c._SERVO_MAX/self.fDutyLsb)
+        self.compile()
 
     def deinit(self):
-        for servo in self.lServo:
-            servo.deinit()         
+        # outputs are off, written again by the next commit
+        self.servo.deinit(self.iCh)
+        self.servo.deinit(self.iCh+1)
                    
-    def safe_limits(self, iTicks):
-        if   iTicks > c._SERVO_MAX: return c._SERVO_MAX
-        elif iTicks < c._SERVO_MIN: return c._SERVO_MIN
-        else: return iTicks
+    def compile(self):
+        # fold neutral position, calibration offset, sign, gain and duty lsb
+        # into one integer transform per channel, called when calibration changes
+        fScale = (1 << _Q) / self.fDutyLsb
+        for sid in range(2):
+            # + 0.5 lsb: round to nearest duty
+            self.aDutyOffs[sid] = int((c._SERVO_NEUTRAL + self.lServoCal[sid]) * fScale) + (1 << (_Q-1))
+            self.aDutyGain[sid] = int(self.lServoSgn[sid] * self.lServoGain[sid] * fScale)
+        rbjoints.iCalRev += 1
+
+    def set_cal(self, sid, iOffs, fGain):
+        self.lServoCal[sid] = iOffs
+        self.lServoGain[sid] = fGain
+        self.compile()
+
+    def adjust_cal(self, sid, iOffsDelta, fGainDelta):
+        # calibrator: step offset / gain of one servo
+        self.set_cal(sid, self.lServoCal[sid] + iOffsDelta, self.lServoGain[sid] + fGainDelta)
+
+    def get_servo_pos(self):
+        # servo positions last written in ticks (us), None if not written
+        lOut = self.servo.lOut
+        return [int(lOut[ch]*self.fDutyLsb) if lOut[ch] >= 0 else None for ch in (self.iCh, self.iCh+1)]
             
+    def duty(self, sid, iAngleInTicks):
+        # duty of the output stage, same transform as stage_angle_sid()
+        iDuty = (self.aDutyOffs[sid] + int(iAngleInTicks) * self.aDutyGain[sid]) >> _Q
+        if iDuty > self.iDutyMax:
+            return self.iDutyMax
+        if iDuty < self.iDutyMin:
+            return self.iDutyMin
+        return iDuty
+
+    def stage_angle_sid(self, sid, iAngleInTicks):
+        # calculate duty into the frame of the backend, written by the next commit
+        iDuty = (self.aDutyOffs[sid] + int(iAngleInTicks) * self.aDutyGain[sid]) >> _Q
+        if iDuty > self.iDutyMax:
+            iDuty = self.iDutyMax
+        elif iDuty < self.iDutyMin:
+            iDuty = self.iDutyMin
+        self.servo.lFrame[self.iCh + sid] = iDuty
+
+    def stage_angles(self, iDeltaTicks, iGammaTicks):
+        self.stage_angle_sid(0,  iDeltaTicks)
+        self.stage_angle_sid(1,  iGammaTicks)
+
     def set_angle_sid(self, sid, iAngleInTicks):        
-        iTicks = (c._SERVO_NEUTRAL + self.lServoCal[sid]) + (iAngleInTicks * self.lServoSgn[sid] * self.lServoGain[sid])
-        iSafeTicks = self.safe_limits(iTicks)
-        iDutyCyle = int(iSafeTicks/self.fDutyLsb)
-        self.lServoPos[sid] = iSafeTicks
-        self.lServo[sid].duty_u16(iDutyCyle)
+        self.stage_angle_sid(sid, iAngleInTicks)
+        self.servo.commit_channel(self.iCh + sid)
 
     def set_angles(self, iDeltaTicks, iGammaTicks):
-        self.set_angle_sid(0,  iDeltaTicks)
-        self.set_angle_sid(1,  iGammaTicks)         
-
+        # this leg only, robug.commit_joints() commits all legs at once
+        self.stage_angles(iDeltaTicks, iGammaTicks)
+        self.servo.commit_channel(self.iCh)
+        self.servo.commit_channel(self.iCh+1)
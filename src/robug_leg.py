@@ -21,15 +21,19 @@ from robug_utils import v3
 from robug_ik import rbik
 from robug_gait import rbgait
 from robug_joints import rbjoints
+from robug_prof import rbprof
 
 class rbleg:
     
-    def __init__(self, iLegID, lOffs, lGain):
+    def __init__(self, iLegID, lOffs, lGain, servo):
         self.ID = iLegID
         self.name = c._GAIT_NAME[iLegID]
         self.gait = rbgait(iLegID)
         self.ik = rbik()
-        self.joints = rbjoints(iLegID, lOffs, lGain)
+        self.iktable = None
+        # hot path profiler, set by robug.set_profiler()
+        self.prof = None
+        self.joints = rbjoints(iLegID, lOffs, lGain, servo)
         self.delta = 0.0
         self.gamma = 0.0
         self.deltaTicks = 0
@@ -44,6 +48,9 @@ class rbleg:
         
     def rad2ticks(self, rad):
         return (rad-c._PI0P5)/c._SERVO_K
+
+    def ticks2rad(self, ticks):
+        return ticks*c._SERVO_K + c._PI0P5
     
     #--------------------------------
     #-- leg core functions ----------
@@ -53,32 +60,54 @@ class rbleg:
         self.gait.loop_inc()
         
     def calculate_foot_position(self, bAbs):
+        gait = self.gait
+        if self.prof: self.prof.start(rbprof.LEG_GAIT)
         # calculate new z value
-        pos, _ = self.gait.calc_substep('z', bAbs)
+        gait.calc_substep_z(bAbs)
         # calculate new x value and add to xyz
-        pos, _ = self.gait.calc_substep('x', bAbs)
+        gait.calc_substep_x(bAbs)
+        if self.prof: self.prof.stop(rbprof.LEG_GAIT)
         # add constant offset
-        self.foot_pos.set(pos)
-        self.foot_pos.add(self.overlay_pose)        
+        self.foot_pos.set(gait.xyz).add(self.overlay_pose)
     
     def solve(self):
         # print(self.ID, ' solve: ', self.foot_pos)
-        self.delta, self.gamma = self.ik.solve(self.foot_pos)
-        self.deltaTicks = self.rad2ticks(self.delta)
-        self.gammaTicks = self.rad2ticks(self.gamma)
+        if self.prof: self.prof.start(rbprof.LEG_SOLVE)
+        if self.iktable is not None:
+            # lookup table delivers servo ticks directly
+            self.deltaTicks, self.gammaTicks = self.iktable.solve(self.foot_pos)
+            self.delta = self.ticks2rad(self.deltaTicks)
+            self.gamma = self.ticks2rad(self.gammaTicks)
+        else:
+            self.delta, self.gamma = self.ik.solve(self.foot_pos)
+            self.deltaTicks = self.rad2ticks(self.delta)
+            self.gammaTicks = self.rad2ticks(self.gamma)
+        if self.prof: self.prof.stop(rbprof.LEG_SOLVE)
         
     def set_joints(self):
+        if self.prof: self.prof.start(rbprof.LEG_JOINTS)
         self.joints.set_angles(self.deltaTicks, self.gammaTicks)
+        if self.prof: self.prof.stop(rbprof.LEG_JOINTS)
+
+    def stage_joints(self):
+        # written by the next commit of the servo backend
+        if self.prof: self.prof.start(rbprof.LEG_JOINTS)
+        self.joints.stage_angles(self.deltaTicks, self.gammaTicks)
+        if self.prof: self.prof.stop(rbprof.LEG_JOINTS)
         
     #--------------------------------
     #-- getters and setters  --------
     #--------------------------------
         
+    def set_ik_table(self, iktable):
+        # None -> analytic solver
+        self.iktable = iktable
+
     def set_foot_pos(pos):
         self.foot_pos.set(pos)
     
     def get_foot_pos(self):
-        return(v3(self.foot_pos.x, self.foot_pos.y, self.foot_pos.z))
+        return self.foot_pos.copy()
         
     def set_delta(self, delta):
         self.delta = delta
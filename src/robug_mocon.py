@@ -20,44 +20,126 @@ from robug_utils import v3
 from robug_constants import constants as c
 from robug_robot import robug
 from robug_com import rbcom
+from robug_sched import rbsched
+from robug_prof import rbprof
+from robug_telemetry import rbtelemetry
+from robug_replay import rbrecorder
+from robug_motion import rbmotion
 
 ############################
 ## class rbmocon
 ############################
 class rbmocon:
 
-    def __init__(self, robot, MsgQueue, RplyQueue, debug=False):
-        self.com = rbcom(MsgQueue, RplyQueue)           
+    def __init__(self, robot, chan, debug=False):
+        # commands and replies through the command channel (rbchan)
+        self.com = rbcom(chan)
         self.r = robot
         self.fLoopTime  = c._GAIT_LOOP_TIME
+        # frame scheduler with absolute deadlines, shared with the robot
+        self.sched = rbsched(c._GAIT_LOOP_TIME * 1000, c._SCHED_POLICY, iMaxCatchUp=c._SCHED_MAX_CATCHUP)
+        self.r.set_scheduler(self.sched)
+        # hot path profiler, None if compiled out
+        self.prof = rbprof(sched=self.sched) if c._PROF else None
+        self.r.set_profiler(self.prof)
+        # per-frame telemetry, recorded by the scheduler, None if compiled out
+        self.tele = rbtelemetry(robot, self.sched) if c._TELE else None
+        self.sched.tele = self.tele
+        # session recorder (commands and frame digests), None if not recording
+        self.rec = rbrecorder(robot, self.sched, chan) if c._REC else None
         self.bRunLoop = False
         self.bAcceptNewCmd = True
         self.iPhase = 1
         self.pos_ls = []
-        
-    async def timeSlice(self, fLoopTime):
-        await asyncio.sleep_ms(fLoopTime)        
-        
+        # preallocated vectors for body rotation
+        self.lOF = [v3(), v3(), v3(), v3()]
+        self.vOrigin = v3()
+        # keyframe motions, built-in and from robug_motions.json
+        self.motion = rbmotion(robot)
+        # frame of the last motion, for the ranging profile
+        self.iActiveFrame = 0
+        self.iIdleFrames = c._TOF_IDLE_MS // c._GAIT_LOOP_TIME
+        self.init_handlers()
+        
+    def init_handlers(self):
+        # dispatch table indexed by opcode, handler(iSubCmd)
+        h = [self.cmd_unknown] * rbcom.OP_COUNT
+        h[rbcom.OP_START_STEP] = self.start_animation
+        h[rbcom.OP_RESUME]     = self.resume
+        h[rbcom.OP_PAUSE]      = lambda iSubCmd: self.pause()
+        h[rbcom.OP_STOP_STEP]  = self.stop_step
+        h[rbcom.OP_WALK_LFT]   = lambda iSubCmd: self.walk_gains('left')
+        h[rbcom.OP_WALK_RGT]   = lambda iSubCmd: self.walk_gains('right')
+        h[rbcom.OP_WALK_STRGT] = lambda iSubCmd: self.walk_gains('straight')
+        h[rbcom.OP_TURN_LFT]   = lambda iSubCmd: self.turn_l()
+        h[rbcom.OP_TURN_RGT]   = lambda iSubCmd: self.turn_r()
+        h[rbcom.OP_SIT_DOWN]   = lambda iSubCmd: self.sit_down()
+        h[rbcom.OP_STAND_UP]   = lambda iSubCmd: self.stand_up()
+        h[rbcom.OP_PURR]       = lambda iSubCmd: self.purr()
+        h[rbcom.OP_ROTATE_DN]  = lambda iSubCmd: self.rotate_body( 15)
+        h[rbcom.OP_ROTATE_UP]  = lambda iSubCmd: self.rotate_body(-15)
+        h[rbcom.OP_SHIFT_COM]  = self.shift_CoM
+        h[rbcom.OP_KICK]       = self.kick
+        h[rbcom.OP_SPEED]      = lambda iSubCmd: self.set_speed(self.com.iArg)
+        h[rbcom.OP_MOTION]     = lambda iSubCmd: self.play_motion(self.com.strArg)
+        self.lHandler = h
+
+    def cmd_unknown(self, iSubCmd):
+        self.bAcceptNewCmd = True
+        self.com.command_unknown()
+
+    def stop_step(self, iSubCmd):
+        # polled every frame until leg 0 ends its support phase
+        if self.r.is_support_end(0):
+            return self.stop_at_support_end(iSubCmd)
+
+    async def stop_at_support_end(self, iSubCmd):
+        # complete current frame first
+        await self.sched.wait()
+        await self.stop_animation(iSubCmd)
+
+    def set_speed(self, iPct):
+        # throttle in %, the gait is retimed while walking (robug.update_speed)
+        self.r.set_throttle(iPct)
+        self.bAcceptNewCmd = True
+        self.com.command_complete()
+
+    def walk_gains(self, strGains):
+        # polled every frame until the gait is stable
+        if self.r.is_stable():
+            self.r.set_gait_gains(strGains)
+            self.bAcceptNewCmd = True
+            self.com.command_complete()
+
+    def update_ranging(self, op):
+        # ranging profile of the distance sensor from the locomotion state:
+        # walking 'fast', stationary (scans) 'accurate', idle 'idle'
+        iFrame = self.sched.iFrame
+        if self.bRunLoop:
+            self.iActiveFrame = iFrame
+            strProfile = 'fast'
+        elif op != rbcom.OP_NOP or iFrame - self.iActiveFrame < self.iIdleFrames:
+            if op != rbcom.OP_NOP:
+                self.iActiveFrame = iFrame
+            strProfile = 'accurate'
+        else:
+            strProfile = 'idle'
+        self.r.tof.set_profile(strProfile)
+
     def sign(self, num):
         return -1 if num < 0 else 1        
         
     def rotate_point_center(self, p, theta):
-        # Calculate cosine and sine of the angle
-        cos_theta = math.cos(theta)
-        sin_theta = math.sin(theta)
-        tmp = v3()
-        # Apply rotation matrix
-        tmp.x = p.x * cos_theta - p.z * sin_theta
-        tmp.z = p.x * sin_theta + p.z * cos_theta
-        return tmp
+        # Apply rotation matrix in place
+        return p.rotate_xz(theta)
 
     def rotate_point_point(self, p, o, a):
         # Translate point to origin
         p.sub(o)
         # Rotate using the same formula
-        tmp = self.rotate_point_center(p, math.radians(a))
+        self.rotate_point_center(p, math.radians(a))
         # Translate back to original position
-        return tmp.add(o)
+        return p.add(o)
     
     async def rotate_body(self, theta):
         r = self.r
@@ -65,74 +147,64 @@ class rbmocon:
         sign = self.sign(theta)
         
         # determin vector from pivot to foot position
-        lOF = []
+        lOF = self.lOF
         for i in range(4):
-            tmp = r.lLeg[i].foot_pos
-            tmp.add(c._DIST_PIVOT_TO_HIP)
-            lOF.append(tmp)
+            r.lLeg[i].foot_pos.copy_into(lOF[i]).add(c._DIST_PIVOT_TO_HIP)
         
         j = 4
         thetaxj = (theta * j)
         for a in range(1, abs(thetaxj)+1):
             
-            # rotate foor position vector relative to body in opposite direction
-            r.lLeg[0].foot_pos = self.rotate_point_point(lOF[0], v3(0,0,0),  a * sign/j)
-            r.lLeg[1].foot_pos = self.rotate_point_point(lOF[1], v3(0,0,0), -a * sign/j)
-            r.lLeg[2].foot_pos = self.rotate_point_point(lOF[2], v3(0,0,0),  a * sign/j)
-            r.lLeg[3].foot_pos = self.rotate_point_point(lOF[3], v3(0,0,0), -a * sign/j)
-            
             for i in range(4):
+                # rotate foot position vector relative to body in opposite direction
+                # (front and rear legs point in opposite x directions)
+                pos = lOF[i].copy_into(r.lLeg[i].foot_pos)
+                self.rotate_point_point(pos, self.vOrigin, a * sign * c._LEG_DIR[i] / j)
                 # the ik solver solves reative to hip joint
                 # so calc new foot position relative to hip joint
-                r.lLeg[i].foot_pos.sub(c._DIST_PIVOT_TO_HIP)
-                # solve foot position
-                r.lLeg[i].solve()               
+                pos.sub(c._DIST_PIVOT_TO_HIP)
             
-            for i in range(4):
-                # set joint to new joint angles
-                r.lLeg[i].set_joints()
+            # solve foot positions of all legs
+            r.solve_ik()
+            # set joints to new joint angles
+            r.set_joints()
             
             # wait until foot position update done
-            await asyncio.sleep_ms(10)
+            await self.sched.wait()
             
         self.bAcceptNewCmd = True
         com.command_complete()
         
-    def set_direction(self, strSubCmd):
+    def set_direction(self, iSubCmd):
         r = self.r
-        if   strSubCmd == '_cmd_FWD_':
+        if   iSubCmd == rbcom.SUB_FWD:
             r.set_direction( 1, 'x')
-        elif strSubCmd == '_cmd_BWD_':
+        elif iSubCmd == rbcom.SUB_BWD:
             r.set_direction(-1, 'x')
-        else: com.subcommand_unknown()
+        else: self.com.subcommand_unknown()
         
-    def set_body_lean(self, strSubCmd):
+    def set_body_lean(self, iSubCmd):
         r = self.r
-        if   strSubCmd == '_cmd_FWD_':
+        if   iSubCmd == rbcom.SUB_FWD:
             r.set_body_lean( 1, c._ASYM_XSHIFT)
-        elif strSubCmd == '_cmd_BWD_':
+        elif iSubCmd == rbcom.SUB_BWD:
             r.set_body_lean(-1, c._ASYM_XSHIFT)
-        else: com.subcommand_unknown()        
+        else: self.com.subcommand_unknown()        
         
-    async def shift_CoM(self, strSubCmd):
+    async def shift_CoM(self, iSubCmd):
         print('shifting CoM')
-        r = self.r
-        com = self.com
-        if   strSubCmd == '_cmd_FWD_':
-            vTmp = v3(-15, 0, 0)
-            lRelPos = [vTmp, vTmp, vTmp, vTmp]            
-            await r.set_positions_relative(lRelPos, 25)
-        elif strSubCmd == '_cmd_BWD_':
-            vTmp = v3( 15, 0, 0)
-            lRelPos = [vTmp, vTmp, vTmp, vTmp]            
-            await r.set_positions_relative(lRelPos, 25)
-        self.bAcceptNewCmd = True
-        com.command_complete()               
+        if   iSubCmd == rbcom.SUB_FWD:
+            await self.play_motion('shift_com_fwd')
+        elif iSubCmd == rbcom.SUB_BWD:
+            await self.play_motion('shift_com_bwd')
+        else:
+            self.bAcceptNewCmd = True
+            self.com.command_complete()
                 
-    def resume(self, strSubCmd):
+    def resume(self, iSubCmd):
         r = self.r
         com = self.com
-        self.set_direction(strSubCmd)
+        self.set_direction(iSubCmd)
         self.bRunLoop = True
         self.bAcceptNewCmd = True
         com.command_complete()
@@ -145,12 +217,12 @@ class rbmocon:
             self.bAcceptNewCmd = True
             com.command_complete()         
                 
-    async def start_animation(self, strSubCmd):
+    async def start_animation(self, iSubCmd):
         r = self.r
         com = self.com
         self.bRunLoop = False
-        self.set_direction(strSubCmd)
-        self.set_body_lean(strSubCmd)
+        self.set_direction(iSubCmd)
+        self.set_body_lean(iSubCmd)
         r.push_disable()
 
         # capture current positions in leg space
@@ -162,7 +234,7 @@ class rbmocon:
         pos_ls_goal = [r.lLeg[i].get_foot_pos() for i in range(4)]
         # leg0 is reference leg, needs c._GAIT_SWING_TICKS/2
         # from support path midpoint to support path start
-        di = c._GAIT_SWING_TICKS/2
+        di = c._GAIT_SWING_TICKS//2
         # calculate dx[]
         dx = [(pos_ls_goal[i].x - pos_ls_current[i].x)/di for i in range(4)]
         x = [0, 0, 0, 0]
@@ -175,9 +247,6 @@ class rbmocon:
         # animation        
         for _ in range(di):
             
-            # start timer task
-            timer_task = asyncio.create_task(self.timeSlice(self.fLoopTime))
-            
             # z contribution of arc (halfsine)
             a += da
             daz = c._GAIT_SWING_AMPL * math.sin(a)
@@ -195,15 +264,15 @@ class rbmocon:
             r.solve_ik()
             # update joints of all legs                
             r.set_joints()
-            # wait for timer completion
-            await timer_task
+            # wait for end of frame
+            await self.sched.wait()
             
         # clean up
         r.push_enable()        
         self.bAcceptNewCmd = True
         com.command_complete()
                 
-    async def stop_animation(self, strSubCmd):
+    async def stop_animation(self, iSubCmd):
         r = self.r
         com = self.com
         self.bRunLoop = False 
@@ -212,7 +281,8 @@ class rbmocon:
         i_support_mid = r.lLeg[1].gait.get_support_mid()
         
         # all for legs have to reach the midpoint in di steps
-        di = i_support_mid - r.lLeg[1].gait.get_loop_counter()        
+        # (loop counters may be float, range() needs an int)
+        di = int(i_support_mid - r.lLeg[1].gait.get_loop_counter())
         
         # get current foot positions in leg space
         pos_ls = [r.lLeg[i].get_foot_pos() for i in range(4)]
@@ -235,9 +305,6 @@ class rbmocon:
         # animation        
         for _ in range(di):
             
-            # start timer task
-            timer_task = asyncio.create_task(self.timeSlice(self.fLoopTime))
-            
             # z contribution of arc (halfsine)
             a += da
             daz = c._GAIT_SWING_AMPL * math.sin(a)
@@ -257,8 +324,8 @@ class rbmocon:
             r.solve_ik()
             # update joints of all legs                
             r.set_joints()
-            # wait for timer completion
-            await timer_task
+            # wait for end of frame
+            await self.sched.wait()
 
         # debug output
         # for i in range(4):
@@ -268,252 +335,99 @@ class rbmocon:
         self.bAcceptNewCmd = True
         com.command_complete()
    
-    async def sit_down(self):
-        r = self.r
+    # scripted actions: keyframe motion primitives (robug_motion)
+
+    async def play_motion(self, strName):
+        # play a motion primitive, reply when done or interrupted
         com = self.com
-        lRelPos = [v3(  0,   0,  40), v3(  0,   0,  40), v3(  0,   0,  40), v3(  0,   0,  40)]
-        await r.set_positions_relative(lRelPos, 35)
+        if not self.motion.has(strName):
+            self.cmd_unknown(rbcom.SUB_NA)
+            return
+        try:
+            bDone = await self.motion.play(strName, com.pending, self.bRunLoop)
+        except ValueError as e:
+            print(e)
+            bDone = None
         self.bAcceptNewCmd = True
-        com.command_complete()
+        if bDone:
+            com.command_complete()
+        elif bDone is None:
+            com.command_failed()
+        else:
+            com.command_interrupted()
+
+    async def sit_down(self):
+        await self.play_motion('sit_down')
         
     async def stand_up(self):
-        r = self.r
-        com = self.com        
-        lRelPos = [v3(  0,   0, -40), v3(  0,   0, -40), v3(  0,   0, -40), v3(  0,   0, -40)]
-        await r.set_positions_relative(lRelPos, 35)
-        await asyncio.sleep(0.5)
-        self.bAcceptNewCmd = True
-        com.command_complete()
+        await self.play_motion('stand_up')
         
     async def purr(self):
-        r = self.r
-        com = self.com
-        for i in range(15):
-            lRelPos = [v3(  0,   0,  -2), v3(  0,   0,  -2), v3(  0,   0,  -2), v3(  0,   0,  -2)]
-            await r.set_positions_relative(lRelPos, 2)            
-            await asyncio.sleep_ms(5)
-            lRelPos = [v3(  0,   0,   2), v3(  0,   0,   2), v3(  0,   0,   2), v3(  0,   0,   2)]
-            await r.set_positions_relative(lRelPos, 2)            
-            await asyncio.sleep_ms(5)
-        self.bAcceptNewCmd = True
-        com.command_complete()            
+        await self.play_motion('purr')
             
     async def attack(self):
-        r = self.r
-        com = self.com
-        lTmpPos = []
-            
-        lRelPos = [v3(  0,   0,  10), v3(  0,   0,  10), v3(  0,   0,  10), v3(  0,   0,  10)]
-        await r.set_positions_relative(lRelPos, 14)             
-            
-        lRelPos = [v3(-20,   0, -30), v3(-20,   0, -40), v3(-20,   0, -30), v3(-20,   0, -40)]
-        await r.set_positions_relative(lRelPos, 3)
-        
-        await asyncio.sleep_ms(50)
-                     
-        lRelPos = [v3( 20,   0,  40), v3( 20,   0,  30), v3( 20,   0,  40), v3( 20,   0,  30)]
-        await r.set_positions_relative(lRelPos, 4)                         
-
-        self.bAcceptNewCmd = True
-        com.command_complete()
-        
-    async def kick(self,strSubCmd):
-        r = self.r
-        com = self.com
-        lTmpPos = []
-         
-        # lean back a little bit
-        lRelPos = [v3(  15,  0,  0), v3(  15,  0,  10), v3( 15,  0,  0), v3( 15,  0, 15)]
-        await r.set_positions_relative(lRelPos, 15)
-        
-        #await asyncio.sleep(1)        
-            
-        # lift front left leg
-        lRelPos = [v3( -20,  0,  10), v3(  0,  0,  0), v3(  0,  0,  0), v3(  0,  0,  0)]
-        await r.set_positions_relative(lRelPos, 15)
-        
-        # await asyncio.sleep(0.25)        
-        
-        # kick left
-        lRelPos = [v3(110,  0,  60), v3(  0,  0,  0), v3(  0,  0,  0), v3(  0,  0,  0)]
-        await r.set_positions_relative(lRelPos, 4)
+        await self.play_motion('attack')
         
-        await asyncio.sleep(0.050)
-        
-        lRelPos = [v3( -90,  0, -70), v3(   0,  0,   0), v3(   0,  0,  0), v3(   0,  0,   0)]
-        await r.set_positions_relative(lRelPos, 15)
-        
-        # await asyncio.sleep(1)        
-        
-        # go back to neutral stance
-        lRelPos = [v3( -15,  0,   0), v3( -15,  0, -10), v3( -15,  0,  0), v3( -15,  0, -15)]
-        await r.set_positions_relative(lRelPos, 15)        
-
-        self.bAcceptNewCmd = True
-        com.command_complete()        
+    async def kick(self, iSubCmd):
+        await self.play_motion('kick')
         
     async def turn_l(self):
-        r = self.r
-        com = self.com
-        lTmpPos = []
-        
-        yjump = c._GAIT_TURN_Y
-        xturn = c._GAIT_TURN_X
-        
-        # save foot positions
-        for i in range(4):
-            lTmpPos.append(r.lLeg[i].foot_pos.to_list())
-                            
-        # push
-        lRelPos = [v3(0, 0,  -1*yjump), v3(     0, 0, -1*yjump), v3(     0, 0, -1*yjump), v3(0, 0,  -1*yjump)]
-        await r.set_positions_relative(lRelPos, 5)                    
-        # push and turn
-        lRelPos = [v3(0, 0,  2*yjump), v3( xturn, 0, -1*yjump), v3(-xturn, 0, -1*yjump), v3(0, 0,  2*yjump)]        
-        await r.set_positions_relative(lRelPos, 6)
-        # land
-        lRelPos = [v3(0, 0, -1*yjump), v3(     0, 0,  2*yjump), v3(     0, 0,  2*yjump), v3(0, 0, -1*yjump)]
-        await r.set_positions_relative(lRelPos, 8) 
-
-        # lift tips before moving them on x axis
-        lRelPos = [v3(0, 0, 0), v3(     0, 0,  1*yjump), v3(    0, 0,  1*yjump), v3(0, 0, 0)]
-        await r.set_positions_relative(lRelPos, 5)                 
-        # lift and restore initial x position
-        lRelPos = [v3(0, 0, 0), v3(-xturn, 0,  2*yjump), v3(xturn, 0,  2*yjump), v3(0, 0, 0)]        
-        await r.set_positions_relative(lRelPos, 6) 
-        # make ground contact
-        lRelPos = [v3(0, 0, 0), v3(     0, 0, -3*yjump), v3(    0, 0, -3*yjump), v3(0, 0, 0)]        
-        await r.set_positions_relative(lRelPos, 8)         
-        await asyncio.sleep_ms(25)
-        
-        #restore foot positions
-        for i in range(4):
-            r.lLeg[i].foot_pos.set_from_list(lTmpPos[i])
-        r.solve_ik()
-        r.set_joints()
-
-        self.bAcceptNewCmd = True
-        com.command_complete()
+        await self.play_motion('turn_l')
         
     async def turn_r(self):
-        r = self.r
-        com = self.com
-        lTmpPos = []
-        
-        yjump = c._GAIT_TURN_Y
-        xturn = c._GAIT_TURN_X
-        
-        # save foot positions
-        for i in range(4):
-            lTmpPos.append(r.lLeg[i].foot_pos.to_list())
-                                
-        # push
-        lRelPos = [v3(     0, 0, -1*yjump), v3(0, 0, -1*yjump), v3(0, 0, -1*yjump), v3(     0, 0, -1*yjump)]
-        await r.set_positions_relative(lRelPos, 5)                    
-        # push and turn
-        lRelPos = [v3(-xturn, 0, -1*yjump), v3(0, 0,  2*yjump), v3(0, 0,  2*yjump), v3( xturn, 0, -1*yjump)]        
-        await r.set_positions_relative(lRelPos, 6)
-        # land
-        lRelPos = [v3(     0, 0,  2*yjump), v3(0, 0, -1*yjump), v3(0, 0, -1*yjump), v3(     0, 0,  2*yjump)]
-        await r.set_positions_relative(lRelPos, 8) 
-
-        # lift tips before moving them on x axis
-        lRelPos = [v3(     0, 0,  1*yjump), v3(0, 0, 0), v3(0, 0, 0), v3(     0, 0,  1*yjump)]
-        await r.set_positions_relative(lRelPos, 5)                 
-        # lift and restore initial x position
-        lRelPos = [v3( xturn, 0,  2*yjump), v3(0, 0, 0), v3(0, 0, 0), v3(-xturn, 0,  2*yjump)]        
-        await r.set_positions_relative(lRelPos, 6) 
-        # make ground contact
-        lRelPos = [v3(     0, 0, -3*yjump), v3(0, 0, 0), v3(0, 0, 0), v3(     0, 0, -3*yjump)]        
-        await r.set_positions_relative(lRelPos, 8)         
-        await asyncio.sleep_ms(25)
-        
-        #restore foot positions
-        for i in range(4):
-            r.lLeg[i].foot_pos.set_from_list(lTmpPos[i])
-        r.solve_ik()
-        r.set_joints()           
-
-        self.bAcceptNewCmd = True
-        com.command_complete()        
+        await self.play_motion('turn_r')
 
     async def run(self):
         
         # aliases for convenience
         r = self.r
         com = self.com
+        prof = self.prof
+        tele = self.tele
 
         while True:
-            timer_task = asyncio.create_task(self.timeSlice(self.fLoopTime))
+
+            if prof:
+                prof.begin()
 
             # execute prepared update from end of last loop
             r.set_joints()
 
+            if prof:
+                prof.start(rbprof.CMD)
+                iFrame = self.sched.iFrame
+
             # if no command is in progress get new command
             if self.bAcceptNewCmd:
-                strCmd, strSubCmd = com.get_command()
+                op, iSubCmd = com.get_command()
                 self.bAcceptNewCmd = False
+                if tele:
+                    tele.iCmd = (op << 4) | iSubCmd
                 
             # process current cmd/subcmd
-            if   strCmd == '_cmd_NOP_':        self.bAcceptNewCmd = True
-            
-            elif strCmd == '_cmd_START_STEP_': await self.start_animation(strSubCmd)            
-                  
-            elif strCmd == '_cmd_RESUME_':     self.resume(strSubCmd)
-            
-            elif strCmd == '_cmd_PAUSE_':      self.pause()            
-            
-            elif strCmd == '_cmd_STOP_STEP_':
-                if r.is_support_end(0):
-                    await timer_task
-                    await self.stop_animation(strSubCmd)
-                    
-            elif strCmd == '_cmd_WALK_LFT_':
-                if r.is_stable():
-                    r.set_gait_gains('left')
-                    self.bAcceptNewCmd = True
-                    com.command_complete()                    
-
-            elif strCmd == '_cmd_WALK_RGT_':
-                if r.is_stable():
-                    r.set_gait_gains('right')
-                    self.bAcceptNewCmd = True
-                    com.command_complete()                    
-            
-            elif strCmd == '_cmd_WALK_STRGT_':
-                if r.is_stable():
-                    r.set_gait_gains('straight')
-                    self.bAcceptNewCmd = True
-                    com.command_complete()                    
-            
-            elif strCmd == '_cmd_TURN_LFT_':   await self.turn_l()      
-            
-            elif strCmd == '_cmd_TURN_RGT_':   await self.turn_r()
-            
-            elif strCmd == '_cmd_SIT_DOWN_':   await self.sit_down()
-            
-            elif strCmd == '_cmd_STAND_UP_':   await self.stand_up()
-            
-            elif strCmd == '_cmd_PURR_':       await self.purr()
-            
-            elif strCmd == '_cmd_ROTATE_DN_':  await self.rotate_body( 15)
-            
-            elif strCmd == '_cmd_ROTATE_UP_':  await self.rotate_body(-15)
-            
-            elif strCmd == '_cmd_SHIFT_COM_':  await self.shift_CoM(strSubCmd)
-            
-            elif strCmd == '_cmd_KICK_':       await self.kick(strSubCmd)             
+            if op == rbcom.OP_NOP:
+                # idle, nothing to dispatch
+                self.bAcceptNewCmd = True
 
-            elif strCmd == '_cmd_EXIT_':
+            elif op == rbcom.OP_EXIT:
                 
                 strMotionState  = '_state_EXITING_'
-                print('exit, waiting for timing thread to complete')
-                await timer_task
+                print('exit, waiting for current frame to complete')
+                await self.sched.wait()
                 com.command_complete()
                 break
-            
-            else:               
-                self.bAcceptNewCmd = True
-                com.command_unknown(strCmd)
+
+            else:
+                # sync handlers return None, async handlers a coroutine
+                coro = self.lHandler[op](iSubCmd)
+                if coro is not None:
+                    await coro
+
+            if prof:
+                prof.stop(rbprof.CMD)
+                # command ran frames of its own (animation), restart this frame
+                if self.sched.iFrame != iFrame:
+                    prof.begin()
                 
             # calculate new joint angles
             if self.bRunLoop:
@@ -530,7 +444,13 @@ class rbmocon:
                 
                 r.inc_loop_counters()
                 r.calculate_foot_positions(bAbs=False)
-                r.solve_ik()
+                r.solve_ik_gait()
                 r.set_joints()
+
+            self.update_ranging(op)
+
+            if prof:
+                prof.end()
                 
-            await timer_task
+            # wait for end of frame (absolute deadline)
+            await self.sched.wait()
@@ -0,0 +1,302 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+from math import cos, pi
+from array import array
+from robug_constants import constants as c
+from robug_joints import rbjoints
+from robug_framecache import rbframecache
+
+# motion primitive format (python dict / json object):
+#
+#   'name': {
+#       'frames': [                    keyframes, played in order
+#           {'rel':  [[x, z], ...],    foot moves of the 4 legs, x in body
+#                                      direction (* _LEG_DIR) as in
+#                                      robug.set_positions_relative()
+#            'abs':  [[x, z], ...],    or foot positions in leg space
+#            'start': true,            or back to the pose the motion started from
+#            'ticks': 15,              frames to get there (default 1)
+#            'ease': 'linear',         'linear', 'sine', 'in', 'out'
+#            'hold_ms': 50},           hold the pose afterwards
+#           ...],
+#       'repeat': 1,                   play the keyframes n times
+#       'interruptible': false,        a new command stops the motion
+#       'blend': 0}                    frames to cross fade into the gait
+#                                      if the robot is walking
+
+# the scripted actions of rbmocon
+_Y = c._GAIT_TURN_Y
+_X = c._GAIT_TURN_X
+
+MOTIONS = {
+    'sit_down': {'frames': [
+        {'rel': [[0, 40], [0, 40], [0, 40], [0, 40]], 'ticks': 35}]},
+    'stand_up': {'frames': [
+        {'rel': [[0, -40], [0, -40], [0, -40], [0, -40]], 'ticks': 35, 'hold_ms': 500}]},
+    'purr': {'repeat': 15, 'frames': [
+        {'rel': [[0, -2], [0, -2], [0, -2], [0, -2]], 'ticks': 2, 'hold_ms': 5},
+        {'rel': [[0,  2], [0,  2], [0,  2], [0,  2]], 'ticks': 2, 'hold_ms': 5}]},
+    'shift_com_fwd': {'frames': [
+        {'rel': [[-15, 0], [-15, 0], [-15, 0], [-15, 0]], 'ticks': 25}]},
+    'shift_com_bwd': {'frames': [
+        {'rel': [[ 15, 0], [ 15, 0], [ 15, 0], [ 15, 0]], 'ticks': 25}]},
+    'attack': {'frames': [
+        {'rel': [[  0,  10], [  0,  10], [  0,  10], [  0,  10]], 'ticks': 14},
+        {'rel': [[-20, -30], [-20, -40], [-20, -30], [-20, -40]], 'ticks': 3, 'hold_ms': 50},
+        {'rel': [[ 20,  40], [ 20,  30], [ 20,  40], [ 20,  30]], 'ticks': 4}]},
+    'kick': {'frames': [
+        # lean back a little bit
+        {'rel': [[ 15,   0], [ 15,  10], [ 15,  0], [ 15,  15]], 'ticks': 15},
+        # lift front left leg
+        {'rel': [[-20,  10], [  0,   0], [  0,  0], [  0,   0]], 'ticks': 15},
+        # kick left
+        {'rel': [[110,  60], [  0,   0], [  0,  0], [  0,   0]], 'ticks': 4, 'hold_ms': 50},
+        {'rel': [[-90, -70], [  0,   0], [  0,  0], [  0,   0]], 'ticks': 15},
+        # go back to neutral stance
+        {'rel': [[-15,   0], [-15, -10], [-15,  0], [-15, -15]], 'ticks': 15}]},
+    'turn_l': {'frames': [
+        # push, push and turn, land
+        {'rel': [[0, -_Y], [  0, -_Y], [  0, -_Y], [0, -_Y]], 'ticks': 5},
+        {'rel': [[0, 2*_Y], [ _X, -_Y], [-_X, -_Y], [0, 2*_Y]], 'ticks': 6},
+        {'rel': [[0, -_Y], [  0, 2*_Y], [  0, 2*_Y], [0, -_Y]], 'ticks': 8},
+        # lift tips, restore x, ground contact
+        {'rel': [[0, 0], [  0, _Y], [  0, _Y], [0, 0]], 'ticks': 5},
+        {'rel': [[0, 0], [-_X, 2*_Y], [ _X, 2*_Y], [0, 0]], 'ticks': 6},
+        {'rel': [[0, 0], [  0, -3*_Y], [  0, -3*_Y], [0, 0]], 'ticks': 8, 'hold_ms': 25},
+        {'start': True}]},
+    'turn_r': {'frames': [
+        {'rel': [[  0, -_Y], [0, -_Y], [0, -_Y], [  0, -_Y]], 'ticks': 5},
+        {'rel': [[-_X, -_Y], [0, 2*_Y], [0, 2*_Y], [ _X, -_Y]], 'ticks': 6},
+        {'rel': [[  0, 2*_Y], [0, -_Y], [0, -_Y], [  0, 2*_Y]], 'ticks': 8},
+        {'rel': [[  0, _Y], [0, 0], [0, 0], [  0, _Y]], 'ticks': 5},
+        {'rel': [[ _X, 2*_Y], [0, 0], [0, 0], [-_X, 2*_Y]], 'ticks': 6},
+        {'rel': [[  0, -3*_Y], [0, 0], [0, 0], [  0, -3*_Y]], 'ticks': 8, 'hold_ms': 25},
+        {'start': True}]},
+}
+
+def ease(strEase, t):
+    # progress t 0..1 of a keyframe -> share of the move
+    if strEase == 'linear':
+        return t
+    if strEase == 'sine':
+        return 0.5 - 0.5 * cos(pi * t)
+    if strEase == 'in':
+        return t * t
+    if strEase == 'out':
+        return 1.0 - (1.0 - t) * (1.0 - t)
+    raise ValueError('unknown easing: ' + strEase)
+
+############################
+## class rbmotion
+############################
+class rbmotion:
+
+    # keyframe motion player
+    # a primitive is compiled for the pose it starts from: foot positions
+    # per frame, servo ticks after ik and the duties of the 8 channels
+    # after the output stage of rbjoints. the frames are kept in the frame
+    # cache (rbframecache), keyed by primitive, quantised start pose and
+    # calibration revision. a frame in the pool is FRAME words:
+    #   duty ch0 .. ch7, foot x0, z0 .. x3, z3 (* FOOT_Q + 0x8000), hold
+    # playing a cached primitive is a copy of 8 duties per frame and the
+    # servo commit, no ik and no output stage.
+
+    FRAME = 17
+    FRAME_FOOT = 8
+    FRAME_HOLD = 16
+    # foot position resolution in the pool, 1/64 mm
+    FOOT_Q = 64
+
+    def __init__(self, robot, strFile=c._MOTION_FILE, cache=None):
+        self.r = robot
+        self.cache = cache if cache is not None else rbframecache()
+        self.iCompiled = 0
+        self.dMotion = dict(MOTIONS)
+        if strFile:
+            self.load(strFile)
+
+    def load(self, strFile):
+        # primitives from a json file, same names replace the built-in ones
+        try:
+            with open(strFile, 'rt') as f:
+                dMotion = json.load(f)
+        except OSError:
+            return 0
+        except ValueError as e:
+            print('motion file', strFile, 'ignored:', e)
+            return 0
+        self.dMotion.update(dMotion)
+        self.cache.clear()
+        return len(dMotion)
+
+    def has(self, strName):
+        return strName in self.dMotion
+
+    def names(self):
+        return list(self.dMotion)
+
+    #--------------------------------
+    #-- compiler --------------------
+    #--------------------------------
+
+    def start_pose(self):
+        # current foot positions [x, z] of all legs in leg space
+        return [[leg.foot_pos.x, leg.foot_pos.z] for leg in self.r.lLeg]
+
+    def get(self, strName, lStart=None):
+        # (pool, offset, (frames, last)) of the primitive compiled for the
+        # start pose (current pose if None), last = exact ticks and foot
+        # positions of the last frame
+        if lStart is None:
+            lStart = self.start_pose()
+        key = (strName, rbjoints.iCalRev) + tuple(int(round(v * 10)) for p in lStart for v in p)
+        hit = self.cache.get(key)
+        if hit is None:
+            try:
+                aWords, data = self.compile(strName, lStart)
+            except (KeyError, IndexError, TypeError):
+                raise ValueError('motion ' + strName + ': bad keyframe format')
+            hit = self.cache.put(key, aWords, data)
+            if hit is None:
+                # larger than the pool, played uncached
+                hit = (aWords, 0, data)
+        return hit
+
+    def compile(self, strName, lStart):
+        # (words, (frames, last)), see FRAME
+        prim = self.dMotion[strName]
+        iPeriod = c._GAIT_LOOP_TIME * 1000
+        lFeet = []
+        lHold = []
+        lPos = [[p[0], p[1]] for p in lStart]
+        for _ in range(prim.get('repeat', 1)):
+            for kf in prim['frames']:
+                lFrom = [[p[0], p[1]] for p in lPos]
+                if kf.get('start'):
+                    lPos = [[p[0], p[1]] for p in lStart]
+                elif 'abs' in kf:
+                    lPos = [[p[0], p[1]] for p in kf['abs']]
+                elif 'rel' in kf:
+                    lRel = kf['rel']
+                    lPos = [[lFrom[i][0] + lRel[i][0] * c._LEG_DIR[i], lFrom[i][1] + lRel[i][1]]
+                            for i in range(4)]
+                else:
+                    raise ValueError('motion ' + strName + ': keyframe without rel / abs / start')
+                n = kf.get('ticks', 1)
+                strEase = kf.get('ease', 'linear')
+                for t in range(1, n+1):
+                    w = ease(strEase, t / n)
+                    for i in range(4):
+                        lFeet.append(lFrom[i][0] + (lPos[i][0] - lFrom[i][0]) * w)
+                        lFeet.append(lFrom[i][1] + (lPos[i][1] - lFrom[i][1]) * w)
+                    lHold.append(0)
+                # sched.sleep_ms(): whole frames closest to ms, at least one
+                ms = kf.get('hold_ms', 0)
+                if ms and lHold:
+                    lHold[-1] = max(1, (ms * 1000 + iPeriod // 2) // iPeriod)
+        n = len(lHold)
+        # foot positions and ticks as float32, like the robot state
+        aFeet = array('f', lFeet)
+        aTicks = array('f', bytes(4*8))
+        aWords = array('H', bytes(2*self.FRAME*n))
+        lLeg = self.r.lLeg
+        ik = self.r.ik
+        for f in range(n):
+            k = self.FRAME * f
+            for i in range(4):
+                x = aFeet[8*f+2*i]
+                z = aFeet[8*f+2*i+1]
+                try:
+                    ik.solve_into(x, z, aTicks, 2*i)
+                except ValueError:
+                    raise ValueError('motion ' + strName + ': foot out of reach')
+                aWords[k+2*i]   = lLeg[i].joints.duty(0, aTicks[2*i])
+                aWords[k+2*i+1] = lLeg[i].joints.duty(1, aTicks[2*i+1])
+                aWords[k+self.FRAME_FOOT+2*i]   = int(round(x * self.FOOT_Q)) + 0x8000
+                aWords[k+self.FRAME_FOOT+2*i+1] = int(round(z * self.FOOT_Q)) + 0x8000
+            aWords[k+self.FRAME_HOLD] = lHold[f]
+        # ticks and foot positions of the last frame
+        aLast = array('f', aTicks)
+        if n:
+            aLast.extend(aFeet[8*(n-1):])
+        self.iCompiled += 1
+        return aWords, (n, aLast)
+
+    #--------------------------------
+    #-- player ----------------------
+    #--------------------------------
+
+    async def play(self, strName, fnAbort=None, bGait=False):
+        # True if played to the end, False if interrupted: fnAbort() is
+        # polled every frame of interruptible primitives. bGait: the robot
+        # walks, cross fade into the gait afterwards ('blend' frames)
+        r = self.r
+        prim = self.dMotion[strName]
+        aPool, k0, data = self.get(strName)
+        n, aLast = data
+        if not prim.get('interruptible', False):
+            fnAbort = None
+        for f in range(n):
+            k = k0 + self.FRAME * f
+            r.set_duties_from(aPool, k)
+            await r.wait_frame()
+            for _ in range(aPool[k+self.FRAME_HOLD]):
+                await r.wait_frame()
+            if fnAbort is not None and fnAbort():
+                # foot positions of the frame, ticks solved again
+                for i in range(4):
+                    pos = r.lLeg[i].foot_pos
+                    pos.x = (aPool[k+self.FRAME_FOOT+2*i] - 0x8000) / self.FOOT_Q
+                    pos.z = (aPool[k+self.FRAME_FOOT+2*i+1] - 0x8000) / self.FOOT_Q
+                r.solve_ik()
+                return False
+        if n:
+            # exact ticks and foot positions of the last frame, the next
+            # motion or the gait starts from there
+            for i in range(4):
+                pos = r.lLeg[i].foot_pos
+                pos.x = aLast[8+2*i]
+                pos.z = aLast[8+2*i+1]
+            r.set_ticks(aLast, 0)
+            iBlend = prim.get('blend', 0)
+            if bGait and iBlend:
+                await self.blend_gait(aLast, 0, iBlend)
+        return True
+
+    def stats(self):
+        # frame cache hits / misses / evictions, compiled primitives
+        d = self.cache.stats()
+        d['compiled'] = self.iCompiled
+        return d
+
+    async def blend_gait(self, aFrom, k, iFrames):
+        # gait ticks run on, servo ticks fade from aFrom[k:k+8] to the gait
+        r = self.r
+        t = r.aJointTicks
+        for j in range(1, iFrames+1):
+            w = ease('sine', j / iFrames)
+            r.inc_loop_counters()
+            r.calculate_foot_positions(bAbs=False)
+            r.solve_ik_gait()
+            if not c._IK_BATCH:
+                for i in range(4):
+                    t[2*i]   = r.lLeg[i].deltaTicks
+                    t[2*i+1] = r.lLeg[i].gammaTicks
+            for q in range(8):
+                t[q] = aFrom[k+q] + (t[q] - aFrom[k+q]) * w
+            r.set_joints_from(t, 0)
+            await r.wait_frame()
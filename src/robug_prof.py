@@ -0,0 +1,182 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import struct
+from array import array
+from robug_constants import constants as c
+from robug_sched import ticks_us, ticks_diff
+
+############################
+## class rbprof
+############################
+class rbprof:
+
+    # per-frame hot path profiler
+    # stage timings in us are accumulated into one row per frame of a
+    # fixed size ring buffer (no allocation per sample). the statistics
+    # are only calculated on demand (report / pack / print_report).
+    # compiled out with c._PROF = False: no profiler object is created
+    # and every probe in the hot path costs a single 'if self.prof:'
+
+    # stage ids
+    CMD        = 0   # rbmocon: command fetch and dispatch
+    INC        = 1   # robug: inc_loop_counters (incl. lazy gait compile)
+    FOOT       = 2   # robug: calculate_foot_positions
+    IK         = 3   # robug: solve_ik / solve_ik_gait
+    JOINTS     = 4   # robug: set_joints (both calls per frame)
+    LEG_GAIT   = 5   # rbleg: gait substep x/z of all legs
+    LEG_SOLVE  = 6   # rbleg: per leg ik (not used by the batched solver)
+    LEG_JOINTS = 7   # rbleg: per leg joint update (not used by the batched solver)
+    FRAME      = 8   # rbmocon: work time of the whole frame
+
+    NAMES = ('cmd', 'inc', 'foot', 'ik', 'joints', 'leg_gait', 'leg_solve', 'leg_joints', 'frame')
+
+    # binary report: frames, overruns, sched misses, sched skipped,
+    # then min, mean, p99, max per stage (us, saturated to 16 bit)
+    _HEADER = '<IHHH'
+
+    def __init__(self, iFrames=c._PROF_FRAMES, iBudgetUs=c._GAIT_LOOP_TIME*1000, sched=None):
+        self.n = len(self.NAMES)
+        self.iSize = iFrames
+        self.iBudget = iBudgetUs
+        self.sched = sched
+        self.aBuf = array('i', bytes(4*self.n*iFrames))
+        self.lT0 = [0] * self.n
+        self.reset()
+
+    def reset(self):
+        for k in range(len(self.aBuf)):
+            self.aBuf[k] = 0
+        self.iRow = 0
+        self.iFrames = 0
+        self.iOverruns = 0
+        self.tFrame = ticks_us()
+
+    #--------------------------------
+    #-- probes (hot path) -----------
+    #--------------------------------
+
+    def begin(self):
+        # start of frame, clear the row of this frame
+        k = self.iRow * self.n
+        a = self.aBuf
+        for i in range(self.n):
+            a[k+i] = 0
+        self.tFrame = ticks_us()
+
+    def start(self, iStage):
+        self.lT0[iStage] = ticks_us()
+
+    def stop(self, iStage):
+        self.aBuf[self.iRow*self.n + iStage] += ticks_diff(ticks_us(), self.lT0[iStage])
+
+    def end(self):
+        # end of frame work, before waiting for the deadline
+        dt = ticks_diff(ticks_us(), self.tFrame)
+        self.aBuf[self.iRow*self.n + self.FRAME] = dt
+        if dt > self.iBudget:
+            self.iOverruns += 1
+        self.iFrames += 1
+        self.iRow += 1
+        if self.iRow == self.iSize:
+            self.iRow = 0
+
+    #--------------------------------
+    #-- statistics (on demand) ------
+    #--------------------------------
+
+    def stats(self, iStage):
+        # (min, mean, p99, max) in us over the frames in the buffer
+        nRows = min(self.iFrames, self.iSize)
+        if nRows == 0:
+            return 0, 0, 0, 0
+        l = sorted(self.aBuf[k*self.n + iStage] for k in range(nRows))
+        p99 = l[min(nRows-1, (99*nRows)//100)]
+        return l[0], sum(l)//nRows, p99, l[-1]
+
+    def sched_stats(self):
+        # deadline misses of the frame scheduler
+        if self.sched is None:
+            return 0, 0
+        return self.sched.iMisses, self.sched.iSkipped
+
+    def report(self):
+        dReport = {}
+        for i in range(self.n):
+            dReport[self.NAMES[i]] = self.stats(i)
+        iMisses, iSkipped = self.sched_stats()
+        dReport['frames'] = self.iFrames
+        dReport['overruns'] = self.iOverruns
+        dReport['misses'] = iMisses
+        dReport['skipped'] = iSkipped
+        return dReport
+
+    def pack(self):
+        # compact binary report for BLE / UDP, see _HEADER
+        iMisses, iSkipped = self.sched_stats()
+        data = bytearray(struct.calcsize(self._HEADER) + 8*self.n)
+        struct.pack_into(self._HEADER, data, 0, self.iFrames,
+                         min(self.iOverruns, 0xFFFF), min(iMisses, 0xFFFF), min(iSkipped, 0xFFFF))
+        k = struct.calcsize(self._HEADER)
+        for i in range(self.n):
+            lStats = self.stats(i)
+            struct.pack_into('<HHHH', data, k, min(lStats[0], 0xFFFF), min(lStats[1], 0xFFFF),
+                             min(lStats[2], 0xFFFF), min(lStats[3], 0xFFFF))
+            k += 8
+        return data
+
+    @classmethod
+    def unpack(cls, data):
+        # host side decoder of pack()
+        iFrames, iOverruns, iMisses, iSkipped = struct.unpack_from(cls._HEADER, data, 0)
+        dReport = {'frames': iFrames, 'overruns': iOverruns, 'misses': iMisses, 'skipped': iSkipped}
+        k = struct.calcsize(cls._HEADER)
+        for strName in cls.NAMES:
+            dReport[strName] = struct.unpack_from('<HHHH', data, k)
+            k += 8
+        return dReport
+
+    def format_report(self):
+        dReport = self.report()
+        lLines = ['frames: {}  overruns (> {} us): {}  sched misses: {}  skipped: {}'.format(
+                  dReport['frames'], self.iBudget, dReport['overruns'], dReport['misses'], dReport['skipped']),
+                  '{:<11}{:>7}{:>7}{:>7}{:>7}'.format('stage [us]', 'min', 'mean', 'p99', 'max')]
+        for strName in self.NAMES:
+            lStats = dReport[strName]
+            # stages that never ran in this configuration are left out
+            if lStats[3] == 0:
+                continue
+            lLines.append('{:<11}{:>7}{:>7}{:>7}{:>7}'.format(strName, *lStats))
+        return '\n'.join(lLines)
+
+    def print_report(self):
+        print(self.format_report())
+
+# --------------------------------------------------------
+# host check: synthetic frames
+# --------------------------------------------------------
+if __name__ == '__main__':
+
+    p = rbprof(iFrames=100, iBudgetUs=9000)
+    for f in range(250):
+        p.begin()
+        for iStage in (p.CMD, p.INC, p.FOOT, p.IK, p.JOINTS):
+            p.start(iStage)
+            p.stop(iStage)
+        p.end()
+    p.print_report()
+    dReport = rbprof.unpack(p.pack())
+    print(dReport)
+    assert dReport['frames'] == 250
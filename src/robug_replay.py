@@ -0,0 +1,218 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import struct
+import hashlib
+from array import array
+from robug_constants import constants as c
+from robug_com import rbcom
+
+############################
+## class rbrecorder
+############################
+class rbrecorder:
+
+    # session recorder: every command posted to the command channel with
+    # the frame it becomes visible to the motion controller in, and a digest
+    # of the frame stream (the staged duty frame of all servos at the end of
+    # every frame, sha256 per chunk of c._REC_CHUNK frames).
+    # the motion controller only sees the channel between two frames, so a
+    # command posted while a frame waits for its deadline is visible in the
+    # next frame, one posted before the first frame in frame 0.
+    # hooks: rbchan.post -> log(), rbsched.wait -> frame()
+
+    # log: header, commands (frame, kind, payload), chunk digests
+    MAGIC   = b'RBRL'
+    VERSION = 1
+    _HEADER = '<4sBHIII'    # magic, version, chunk, frames, commands, digests
+    _CMD    = '<IB'         # frame, kind (0: int code, 1: string)
+
+    def __init__(self, robot, sched, chan, iChunk=c._REC_CHUNK):
+        self.r = robot
+        self.sched = sched
+        self.iChunk = iChunk
+        self.n = robot.servo.n
+        # duty frames of the current chunk
+        self.aChunk = array('H', bytes(2*self.n*iChunk))
+        self.reset()
+        sched.rec = self
+        if chan is not None:
+            chan.rec = self
+
+    def reset(self):
+        # (frame, msg) of the commands, digest per chunk
+        self.lCmd = []
+        self.lDigest = []
+        self.iFrames = 0
+        # frame whose work is done (its wait is running), -1 before the first
+        self.iFrameEnd = -1
+
+    #--------------------------------
+    #-- hooks -----------------------
+    #--------------------------------
+
+    def log(self, msg):
+        iFrame = self.sched.iFrame
+        if iFrame == self.iFrameEnd:
+            iFrame += 1
+        self.lCmd.append((iFrame, msg))
+
+    def frame(self):
+        # end of frame work, before the wait for the deadline
+        self.iFrameEnd = self.sched.iFrame
+        lFrame = self.r.servo.lFrame
+        a = self.aChunk
+        k = (self.iFrames % self.iChunk) * self.n
+        for ch in range(self.n):
+            a[k+ch] = lFrame[ch] & 0xFFFF
+        self.iFrames += 1
+        if self.iFrames % self.iChunk == 0:
+            self.checkpoint(self.iChunk)
+
+    def checkpoint(self, nFrames):
+        # digest of the first nFrames of the chunk, one allocation per chunk
+        self.digest(self.chunk_digest(nFrames))
+
+    def chunk_digest(self, nFrames):
+        d = hashlib.sha256(memoryview(self.aChunk)[:nFrames*self.n]).digest()
+        return struct.unpack('<I', d[:4])[0]
+
+    def digest(self, iDigest):
+        self.lDigest.append(iDigest)
+
+    def digests(self):
+        # digests of the frames so far, the partial chunk included
+        nFrames = self.iFrames % self.iChunk
+        if nFrames == 0:
+            return self.lDigest
+        return self.lDigest + [self.chunk_digest(nFrames)]
+
+    #--------------------------------
+    #-- log -------------------------
+    #--------------------------------
+
+    def pack(self):
+        # a snapshot, recording goes on
+        lDigest = self.digests()
+        lData = [struct.pack(self._HEADER, self.MAGIC, self.VERSION, self.iChunk,
+                             self.iFrames, len(self.lCmd), len(lDigest))]
+        for iFrame, msg in self.lCmd:
+            if isinstance(msg, int):
+                lData.append(struct.pack(self._CMD + 'i', iFrame, 0, msg))
+            else:
+                b = msg.encode()
+                lData.append(struct.pack(self._CMD + 'B', iFrame, 1, len(b)) + b)
+        for iDigest in lDigest:
+            lData.append(struct.pack('<I', iDigest))
+        return b''.join(lData)
+
+    def save(self, strPath):
+        with open(strPath, 'wb') as f:
+            f.write(self.pack())
+
+    @classmethod
+    def unpack(cls, data):
+        # -> (chunk, frames, [(frame, msg)], [digest])
+        strMagic, iVersion, iChunk, iFrames, nCmd, nDigest = struct.unpack_from(cls._HEADER, data, 0)
+        if strMagic != cls.MAGIC or iVersion != cls.VERSION:
+            raise ValueError('not a session log')
+        k = struct.calcsize(cls._HEADER)
+        lCmd = []
+        for _ in range(nCmd):
+            iFrame, iKind = struct.unpack_from(cls._CMD, data, k)
+            k += struct.calcsize(cls._CMD)
+            if iKind == 0:
+                msg = struct.unpack_from('<i', data, k)[0]
+                k += 4
+            else:
+                n = data[k]
+                msg = bytes(data[k+1:k+1+n]).decode()
+                k += 1 + n
+            lCmd.append((iFrame, msg))
+        lDigest = list(struct.unpack_from('<' + 'I'*nDigest, data, k))
+        return iChunk, iFrames, lCmd, lDigest
+
+############################
+## class rbreplayer
+############################
+class rbreplayer(rbrecorder):
+
+    # feeds a recorded session back into the command channel, each command
+    # at the end of the frame before the one it was visible in (as if the
+    # supervisor had posted it during the wait), and compares the digests
+    # of the frame stream chunk by chunk. nothing else may post commands.
+    # a session that did not end with EXIT gets one after its last frame.
+
+    def __init__(self, robot, sched, chan, data):
+        iChunk, self.iEnd, self.lLog, self.lRef = rbrecorder.unpack(data)
+        super().__init__(robot, sched, None, iChunk)
+        self.chan = chan
+        self.bExit = False
+        for iFrame, msg in self.lLog:
+            # strings other than rbcom.MSG (e.g. 'MOTION_<name>') are no int code
+            if msg == 'EXIT' or (isinstance(msg, int) and
+                                 msg & rbcom.CODE_MASK == rbcom.encode(rbcom.OP_EXIT)):
+                self.bExit = True
+        self.iNext = 0
+        # commands posted, replies nobody waits for
+        self.lSeq = []
+        # first chunk that differs, -1 while all match
+        self.iDiverged = -1
+
+    def start(self):
+        # commands of frame 0, before the motion controller runs
+        self.feed(0)
+
+    def feed(self, iFrame):
+        lLog = self.lLog
+        while self.iNext < len(lLog) and lLog[self.iNext][0] <= iFrame:
+            self.lSeq.append(self.chan.post(lLog[self.iNext][1]))
+            self.iNext += 1
+
+    def frame(self):
+        # frames after the recorded ones (EXIT) are not compared
+        if self.iFrames < self.iEnd:
+            super().frame()
+            if self.iFrames == self.iEnd and self.iEnd % self.iChunk:
+                self.checkpoint(self.iEnd % self.iChunk)
+        self.feed(self.sched.iFrame + 1)
+        if not self.bExit and self.iNext == len(self.lLog) and self.iFrames >= self.iEnd:
+            self.bExit = True
+            self.lSeq.append(self.chan.post('EXIT'))
+        # drop the replies
+        dPending = self.chan.dPending
+        for seq in self.lSeq:
+            slot = dPending.get(seq)
+            if slot is not None and slot[0].is_set():
+                del dPending[seq]
+        self.lSeq = [seq for seq in self.lSeq if seq in dPending]
+
+    def digest(self, iDigest):
+        k = len(self.lDigest)
+        if self.iDiverged < 0 and k < len(self.lRef) and iDigest != self.lRef[k]:
+            self.iDiverged = k
+        self.lDigest.append(iDigest)
+
+    def result(self):
+        # frame stream compared over the recorded frames
+        if self.iDiverged >= 0:
+            iFrame = self.iDiverged * self.iChunk
+        elif self.iFrames < self.iEnd:
+            # ended early
+            iFrame = self.iFrames
+        else:
+            iFrame = -1
+        return {'match': iFrame < 0, 'frames': self.iFrames, 'recorded': self.iEnd,
+                'diverged_frame': iFrame}
@@ -15,14 +15,30 @@
 
 import math
 import asyncio
-import json
+from array import array
 from time import sleep_ms
 from machine import Pin, PWM, I2C
 
 from tof_sensor import vl53l0x
+from robug_tof import rbtof
 from robug_utils import v3
 from robug_constants import constants as c
 from robug_leg import rbleg
+from robug_ik import rbik
+from robug_iktable import rbiktable
+from robug_gaitc import rbgaitc
+from robug_prof import rbprof
+from robug_calibration import rbcal
+from robug_servo import rbservo
+from robug_state import rbstate, rblegsoa
+from robug_gait import tbl_at, PH_START, PH_SUPPORT, PH_END, PH_SWING, PH_MID, PH_SHIFT, PH_ALL_LEGS
+
+# phase masks of all legs
+_START_ANY   = PH_START * PH_ALL_LEGS
+_SUPPORT_ANY = PH_SUPPORT * PH_ALL_LEGS
+_END_ANY     = PH_END * PH_ALL_LEGS
+_SWING_ANY   = PH_SWING * PH_ALL_LEGS
+_MID_ANY     = PH_MID * PH_ALL_LEGS
 
 ############################
 ## class robot
@@ -30,12 +46,17 @@ from robug_leg import rbleg
 
 class robug:
 
-    def __init__(self):
+    def __init__(self, bSoA=c._STATE_SOA):
         
+        # struct of arrays core (robug_state), None -> per leg objects
+        self.state = rbstate() if bSoA else None
         self.create_robug()
         self.dirX  = 1
         self.dirZ  = 1
         self.lLegTicks =[[], [], [], []]
+        # frame scheduler and profiler, set by the motion controller
+        self.sched = None
+        self.prof = None
         
         # touch sensor setup
         self.touch_top = Pin(c._PIN_TOUCH_TOP, Pin.IN, Pin.PULL_UP)
@@ -44,6 +65,8 @@ class robug:
         # distance sensor setup
         self.vl53 = vl53l0x(I2C(c._I2C_BUS, sda=Pin(c._PIN_I2C_SDA), scl=Pin(c._PIN_I2C_SCL), freq=c._I2C_RATE))
         self.vl53.stop_continuous()
+        # asynchronous ranging, runs once the app starts tof.run()
+        self.tof = rbtof(self.vl53)
 
         # led setup
         self.freq = c._SERVO_PWM_FREQ
@@ -72,6 +95,9 @@ class robug:
         return self.touch_bot.value()   
         
     def get_distance(self):
+        # latest sample of the ranging task, blocking single shot otherwise
+        if self.tof.bRunning:
+            return self.tof.iRange
         return self.vl53.range
         
     def duty(self, pct):
@@ -88,30 +114,186 @@ class robug:
     #--------------------------------
         
     def create_robug(self):
-        with open('robug_calibration.json', 'rt') as f:
-            calib_data = json.load(f)
-            lOffs = calib_data['robug_calibration_data']['servo_offs']
-            lGain = calib_data['robug_calibration_data']['servo_gain']         
-        self.lLeg = [rbleg(0, lOffs, lGain),
-                     rbleg(1, lOffs, lGain),
-                     rbleg(2, lOffs, lGain),
-                     rbleg(3, lOffs, lGain)]
+        # calibration from robug_calibration.json, defaults if not calibrated yet
+        cal = rbcal()
+        lOffs = cal.servo_offs
+        lGain = cal.servo_gain
+        # servo output backend, one duty frame of all 8 servos
+        self.servo = rbservo.create(c._SERVO_BACKEND)
+        st = self.state
+        if st is None:
+            self.lLeg = [rbleg(0, lOffs, lGain, self.servo),
+                         rbleg(1, lOffs, lGain, self.servo),
+                         rbleg(2, lOffs, lGain, self.servo),
+                         rbleg(3, lOffs, lGain, self.servo)]
+            # batched ik: foot positions of all legs in, servo ticks of all joints out
+            self.aFootPos = array('f', [0.0] * 12)
+            self.aJointTicks = array('f', [0.0] * 8)
+            # buffer and offset set_joints() reads the ticks from
+            self.aTickBuf, self.iTick0 = self.aJointTicks, 0
+        else:
+            self.lLeg = [rblegsoa(0, lOffs, lGain, self.servo, st),
+                         rblegsoa(1, lOffs, lGain, self.servo, st),
+                         rblegsoa(2, lOffs, lGain, self.servo, st),
+                         rblegsoa(3, lOffs, lGain, self.servo, st)]
+            # views on the state array, the solver reads and writes in place
+            self.aFootPos = st.aFoot
+            self.aJointTicks = st.aTicks
+            self.aTickBuf, self.iTick0 = st.a, st.TICKS
+        self.lGait = [self.lLeg[i].gait for i in range(4)]
+        # PH_* bits of all legs (robug_gait), see is_phase()
+        self.iPhaseMask = 0
+        # gait speed (loop counter increment per tick) and its set value
+        self.fSpeed = 1.0
+        self.fSpeedSet = 1.0
+        if c._IK_TABLE:
+            # one table shared by all legs, loaded from flash if available
+            self.ik = rbiktable()
+            for i in range(4):
+                self.lLeg[i].set_ik_table(self.ik)
+        else:
+            self.ik = rbik()
+        # gait compiler, tables are (re)compiled when gait parameters change
+        self.gaitc = rbgaitc() if c._GAIT_TABLE else None
+        self.bGaitDirty = True
         
     def inc_loop_counters(self):
-        for i in range(4):
-            self.lLeg[i].inc_loop_counter()
+        if self.prof: self.prof.start(rbprof.INC)
+        if self.bGaitDirty:
+            self.compile_gait()
+        if self.fSpeed != self.fSpeedSet:
+            self.update_speed()
+        if self.state is not None:
+            self.state.loop_inc(self.lGait)
+        else:
+            for i in range(4):
+                self.lLeg[i].inc_loop_counter()
+        self.update_phase_mask()
+        if self.prof: self.prof.stop(rbprof.INC)
             
     def calculate_foot_positions(self, bAbs=True):
-        for i in range(4):
-            self.lLeg[i].calculate_foot_position(bAbs)
+        if self.prof: self.prof.start(rbprof.FOOT)
+        if bAbs or self.state is None or not self.state.foot_from_tables(self.lGait):
+            for i in range(4):
+                self.lLeg[i].calculate_foot_position(bAbs)
+        if self.prof: self.prof.stop(rbprof.FOOT)
             
     def solve_ik(self):
+        if self.prof: self.prof.start(rbprof.IK)
+        if c._IK_BATCH:
+            self.solve_ik_batch()
+        else:
+            for i in range(4):
+                self.lLeg[i].solve()
+        if self.prof: self.prof.stop(rbprof.IK)
+
+    def solve_ik_batch(self):
+        # fast path: one solver call per frame, results stay in aJointTicks
+        a = self.aFootPos
+        if self.state is not None:
+            # foot positions are already in place
+            self.ik.solve_legs(a, self.aJointTicks)
+            return
+        for i in range(4):
+            pos = self.lLeg[i].foot_pos
+            a[3*i]   = pos.x
+            a[3*i+1] = pos.y
+            a[3*i+2] = pos.z
+        self.ik.solve_legs(a, self.aJointTicks)
+
+    def solve_ik_gait(self):
+        # gait loop: take servo ticks from the compiled tables if all legs
+        # play back tables, foot positions then match the table entries
+        if not c._IK_BATCH:
+            self.solve_ik()
+            return
         for i in range(4):
-            self.lLeg[i].solve()        
+            if self.lLeg[i].gait.aTblTicks is None:
+                self.solve_ik()
+                return
+        if self.prof: self.prof.start(rbprof.IK)
+        if self.state is not None:
+            self.state.ticks_from_tables(self.lGait)
+        else:
+            t = self.aJointTicks
+            for i in range(4):
+                gait = self.lLeg[i].gait
+                k = int(gait.i)
+                if k == gait.i:
+                    t[2*i]   = gait.aTblTicks[2*k]
+                    t[2*i+1] = gait.aTblTicks[2*k+1]
+                else:
+                    t[2*i]   = tbl_at(gait.aTblTicks, gait.i, gait.substeps, 2, 0)
+                    t[2*i+1] = tbl_at(gait.aTblTicks, gait.i, gait.substeps, 2, 1)
+        if self.prof: self.prof.stop(rbprof.IK)
+
+    def compile_gait(self):
+        self.bGaitDirty = False
+        if self.gaitc is None:
+            return
+        ik = self.ik if c._IK_BATCH else None
+        for i in range(4):
+            leg = self.lLeg[i]
+            leg.gait.set_table(self.gaitc.compile(leg.gait, leg.overlay_pose, ik))
 
     def set_joints(self):
-        for i in range(4):        
-            self.lLeg[i].set_joints()
+        if self.prof: self.prof.start(rbprof.JOINTS)
+        if c._IK_BATCH:
+            t = self.aTickBuf
+            k = self.iTick0
+            for i in range(4):
+                self.lLeg[i].joints.stage_angles(t[k+2*i], t[k+2*i+1])
+        else:
+            for i in range(4):        
+                self.lLeg[i].stage_joints()
+        self.commit_joints()
+        if self.prof: self.prof.stop(rbprof.JOINTS)
+
+    def set_ticks(self, a, k):
+        # servo ticks [delta0, gamma0, .. gamma3] at a[k] become the current
+        # ticks of the robot (staged by the next set_joints)
+        t = self.aJointTicks
+        for j in range(8):
+            t[j] = a[k+j]
+        if not c._IK_BATCH:
+            for i in range(4):
+                self.lLeg[i].deltaTicks = t[2*i]
+                self.lLeg[i].gammaTicks = t[2*i+1]
+
+    def set_joints_from(self, a, k):
+        # one frame of servo ticks at a[k]
+        self.set_ticks(a, k)
+        self.set_joints()
+
+    def set_duties_from(self, a, k):
+        # one frame of precalculated duties of channels 0..7 at a[k]
+        # (cached motion frames), output only
+        if self.prof: self.prof.start(rbprof.JOINTS)
+        lFrame = self.servo.lFrame
+        for ch in range(8):
+            lFrame[ch] = a[k+ch]
+        self.commit_joints()
+        if self.prof: self.prof.stop(rbprof.JOINTS)
+
+    def commit_joints(self):
+        # bulk write of one frame, only servos whose duty changed
+        self.servo.commit()
+
+    def set_servo(self, servo):
+        # swap the servo output backend (e.g. host recorder), keeps the
+        # staged frame, all channels are written by the next commit
+        for ch in range(servo.n):
+            servo.lFrame[ch] = self.servo.lFrame[ch]
+        self.servo = servo
+        for i in range(4):
+            self.lLeg[i].joints.servo = servo
+
+    def get_servo_writes(self):
+        # (writes done, writes saved) of all servos
+        return self.servo.iWrites, self.servo.iSaved
+
+    def reset_servo_writes(self):
+        self.servo.reset_writes()
             
     async def set_positions_relative(self, lRelPos, iSteps):
         ldX = []
@@ -121,34 +303,87 @@ class robug:
             # iSteps > 1 -> smooth transition
             ldX.append(lRelPos[i].x/iSteps)
             ldZ.append(lRelPos[i].z/iSteps)
-        for i in range(iSteps):
+        for _ in range(iSteps):
             for i in range(4):            
                 self.lLeg[i].foot_pos.x += ldX[i] * c._LEG_DIR[i]
                 self.lLeg[i].foot_pos.z += ldZ[i]
-                self.solve_ik()
-                self.set_joints()
-            await asyncio.sleep_ms(c._GAIT_LOOP_TIME)
+            # solve once per step after all legs moved
+            self.solve_ik()
+            self.set_joints()
+            await self.wait_frame()
             
+    def set_scheduler(self, sched):
+        self.sched = sched
+
+    def set_profiler(self, prof):
+        # None -> profiling compiled out
+        self.prof = prof
+        for i in range(4):
+            self.lLeg[i].prof = prof
+
+    async def wait_frame(self):
+        # end of an animation frame
+        if self.sched is not None:
+            await self.sched.wait()
+        else:
+            await asyncio.sleep_ms(c._GAIT_LOOP_TIME)
+
     def push_enable(self):
         for i in range(4):
             self.lLeg[i].gait.push_enable()
+        self.bGaitDirty = True
 
     def push_disable(self):
         for i in range(4):
-            self.lLeg[i].gait.push_disable()            
+            self.lLeg[i].gait.push_disable()
+        self.bGaitDirty = True            
             
     def deinit_joints(self):
         for i in range(4):
             # store servo positions before deinit
-            self.lLegTicks[i] = self.lLeg[i].joints.lServoPos
+            self.lLegTicks[i] = self.lLeg[i].joints.get_servo_pos()
             self.lLeg[i].joints.deinit()            
             
     #--------------------------------
     #-- gait loop manipulation ------
     #--------------------------------            
 
+    # gait speed: all legs advance their loop counters by the same
+    # increment per tick, so the trot phase offset between the legs
+    # (c._GAIT_LEG_PHASE_OFFSET) is kept at any speed
+
+    def set_speed(self, fSpeed):
+        # set value, reached by update_speed() in steps of _GAIT_SPEED_SLEW
+        fSpeed = min(max(fSpeed, c._GAIT_SPEED_MIN), c._GAIT_SPEED_MAX)
+        self.fSpeedSet = round(fSpeed * c._GAIT_SPEED_RES) / c._GAIT_SPEED_RES
+
+    def set_throttle(self, iPct):
+        # 0..100 % -> _GAIT_SPEED_MIN.._GAIT_SPEED_MAX
+        iPct = min(max(iPct, 0), 100)
+        self.set_speed(c._GAIT_SPEED_MIN + (c._GAIT_SPEED_MAX - c._GAIT_SPEED_MIN) * iPct / 100)
+
+    def get_speed(self):
+        return self.fSpeed
+
+    def update_speed(self):
+        # one slew step towards the set value. fractional loop counters
+        # are played back from the compiled tables only, the speed waits
+        # until all legs have their tables
+        for i in range(4):
+            if self.lGait[i].aTblX is None:
+                return
+        d = self.fSpeedSet - self.fSpeed
+        if d > c._GAIT_SPEED_SLEW:
+            d = c._GAIT_SPEED_SLEW
+        elif d < -c._GAIT_SPEED_SLEW:
+            d = -c._GAIT_SPEED_SLEW
+        self.fSpeed += d
+        for i in range(4):
+            self.lGait[i].set_speed(self.fSpeed)
+
     def set_loop_counter(self, Id, i):
         self.lLeg[Id].gait.set_loop_counter(i)
+        self.update_phase_mask()
         
     def reset_loop_counter(self):
         # init diagonal legs with trott phase shift
@@ -166,62 +401,57 @@ class robug:
     #-- robot status ----------------
     #--------------------------------
             
+    # phase queries: one AND on the phase mask of all legs (PH_* bits of
+    # leg k at PH_SHIFT*k), updated once per tick in inc_loop_counters
+
+    def update_phase_mask(self):
+        g = self.lGait
+        self.iPhaseMask = (g[0].iPhaseBits | (g[1].iPhaseBits << PH_SHIFT)
+                           | (g[2].iPhaseBits << (2*PH_SHIFT)) | (g[3].iPhaseBits << (3*PH_SHIFT)))
+
+    def get_phase_mask(self):
+        return self.iPhaseMask
+
+    def is_phase(self, Id, iBits):
+        # leg Id in one of the phases iBits (PH_* of robug_gait)
+        return (self.iPhaseMask & (iBits << (PH_SHIFT*Id))) != 0
+
+    def is_phase_any(self, iBits):
+        return (self.iPhaseMask & (iBits * PH_ALL_LEGS)) != 0
+            
     def is_stable(self):
-        bTmp = True
-        for i in range(4):
-            if self.lLeg[i].gait.is_loop_frame('swing_phase'):
-                bTmp = False
-        return bTmp
+        # no leg in swing
+        return (self.iPhaseMask & _SWING_ANY) == 0
 
     def is_support_phase(self, Id):
-        return self.lLeg[Id].gait.is_loop_frame('support_phase')
+        return (self.iPhaseMask & (PH_SUPPORT << (PH_SHIFT*Id))) != 0
     
     def is_support_phase_any(self):
-        Tmp0 = self.lLeg[0].gait.is_loop_frame('support_phase')
-        Tmp1 = self.lLeg[1].gait.is_loop_frame('support_phase')
-        Tmp2 = self.lLeg[2].gait.is_loop_frame('support_phase')
-        Tmp3 = self.lLeg[3].gait.is_loop_frame('support_phase')
-        return (Tmp0 or Tmp1 or Tmp2 or Tmp3)    
+        return (self.iPhaseMask & _SUPPORT_ANY) != 0
 
     def is_swing_phase(self, Id):
-        return self.lLeg[Id].gait.is_loop_frame('swing_phase')
+        return (self.iPhaseMask & (PH_SWING << (PH_SHIFT*Id))) != 0
         
     def is_swing_phase_any(self):
-        Tmp0 = self.lLeg[0].gait.is_loop_frame('swing_phase')
-        Tmp1 = self.lLeg[1].gait.is_loop_frame('swing_phase')
-        Tmp2 = self.lLeg[2].gait.is_loop_frame('swing_phase')
-        Tmp3 = self.lLeg[3].gait.is_loop_frame('swing_phase')
-        return (Tmp0 or Tmp1 or Tmp2 or Tmp3)
+        return (self.iPhaseMask & _SWING_ANY) != 0
 
     def is_support_start(self, Id):
-        return self.lLeg[Id].gait.is_loop_frame('support_start')
+        return (self.iPhaseMask & (PH_START << (PH_SHIFT*Id))) != 0
 
     def is_support_start_any(self):
-        Tmp0 = self.lLeg[0].gait.is_loop_frame('support_start')
-        Tmp1 = self.lLeg[1].gait.is_loop_frame('support_start')
-        Tmp2 = self.lLeg[2].gait.is_loop_frame('support_start')
-        Tmp3 = self.lLeg[3].gait.is_loop_frame('support_start')
-        return (Tmp0 or Tmp1 or Tmp2 or Tmp3)
+        return (self.iPhaseMask & _START_ANY) != 0
 
     def is_support_end(self, Id):
-        return self.lLeg[Id].gait.is_loop_frame('support_end')
+        return (self.iPhaseMask & (PH_END << (PH_SHIFT*Id))) != 0
 
     def is_support_end_any(self):
-        Tmp0 = self.lLeg[0].gait.is_loop_frame('support_end')
-        Tmp1 = self.lLeg[1].gait.is_loop_frame('support_end')
-        Tmp2 = self.lLeg[2].gait.is_loop_frame('support_end')
-        Tmp3 = self.lLeg[3].gait.is_loop_frame('support_end')
-        return (Tmp0 or Tmp1 or Tmp2 or Tmp3)
+        return (self.iPhaseMask & _END_ANY) != 0
 
     def is_support_mid(self, Id):
-        return self.lLeg[Id].gait.is_loop_frame('support_mid')
+        return (self.iPhaseMask & (PH_MID << (PH_SHIFT*Id))) != 0
 
     def is_support_mid_any(self):
-        Tmp0 = self.lLeg[0].gait.is_loop_frame('support_mid')
-        Tmp1 = self.lLeg[1].gait.is_loop_frame('support_mid')
-        Tmp2 = self.lLeg[2].gait.is_loop_frame('support_mid')
-        Tmp3 = self.lLeg[3].gait.is_loop_frame('support_mid')
-        return (Tmp0 or Tmp1 or Tmp2 or Tmp3)            
+        return (self.iPhaseMask & _MID_ANY) != 0
 
     #--------------------------------
     #-- getters and setters  --------
@@ -242,18 +472,18 @@ class robug:
         for i in range(4):
             # dir * c._LEG_DIR[i] accouts for leg mounting orientation
             self.lLeg[i].gait.set_direction(dir * c._LEG_DIR[i], strAxis)
+        self.bGaitDirty = True
             
     def set_body_lean(self, dir, asym):
-        lXoffset = [c._FOOT_XOFFSET - asym * dir,
-                    c._FOOT_XOFFSET + asym * dir,
-                    c._FOOT_XOFFSET - asym * dir,
-                    c._FOOT_XOFFSET + asym * dir]
-        lOverlay = [v3(lXoffset[0], 0.0, 0.0),
-                    v3(lXoffset[1], 0.0, 0.0),
-                    v3(lXoffset[2], 0.0, 0.0),
-                    v3(lXoffset[3], 0.0, 0.0)]
         for i in range(4):
-            self.lLeg[i].overlay_pose.set(lOverlay[i])
+            # front legs (dir 1) and rear legs (dir -1) shift opposite
+            overlay = self.lLeg[i].overlay_pose
+            overlay.x = c._FOOT_XOFFSET - asym * dir * c._LEG_DIR[i]
+            overlay.y = 0.0
+            overlay.z = 0.0
+            # compiled servo ticks depend on the overlay, drop them at once
+            self.lLeg[i].gait.aTblTicks = None
+        self.bGaitDirty = True
       
     def get_direction(self, strAxis):
         if   strAxis == 'x': return self.dirX
@@ -279,6 +509,7 @@ class robug:
             
         for i in range(4):
             self.lLeg[i].gait.set_gain(gain[i])
+        self.bGaitDirty = True
             
     def get_gait_gains(self):
         return([self.lLeg[i].gait.get_gain() for i in range(4)])
\ No newline at end of file
@@ -0,0 +1,211 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+
+try:
+    from time import ticks_us, ticks_diff, ticks_add
+except ImportError:
+    # cpython
+    from time import perf_counter_ns
+    def ticks_us(): return perf_counter_ns() // 1000
+    def ticks_diff(a, b): return a - b
+    def ticks_add(a, b): return a + b
+
+try:
+    sleep_ms = asyncio.sleep_ms
+except AttributeError:
+    # cpython
+    def sleep_ms(ms): return asyncio.sleep(ms / 1000)
+
+############################
+## class rbclock
+############################
+class rbclock:
+
+    # microsecond clock of the board
+
+    def ticks_us(self):
+        return ticks_us()
+
+    def ticks_diff(self, a, b):
+        return ticks_diff(a, b)
+
+    def ticks_add(self, a, b):
+        return ticks_add(a, b)
+
+    async def sleep_us(self, us):
+        # sleep whole milliseconds, then yield until the deadline
+        deadline = ticks_add(ticks_us(), us)
+        if us >= 1000:
+            await sleep_ms(us // 1000)
+        while ticks_diff(deadline, ticks_us()) > 0:
+            await sleep_ms(0)
+
+############################
+## class rbfakeclock
+############################
+class rbfakeclock:
+
+    # virtual clock for host tests: time only moves by advance() / sleep_us()
+
+    def __init__(self, t0=0):
+        self.t = t0
+
+    def ticks_us(self):
+        return self.t
+
+    def ticks_diff(self, a, b):
+        return a - b
+
+    def ticks_add(self, a, b):
+        return a + b
+
+    def advance(self, us):
+        self.t += us
+
+    async def sleep_us(self, us):
+        if us > 0:
+            self.t += us
+        await sleep_ms(0)
+
+############################
+## class rbsched
+############################
+class rbsched:
+
+    # frame scheduler with absolute deadlines
+    # every frame ends with 'await sched.wait()', which sleeps until the
+    # deadline of the frame and sets the deadline of the next frame to
+    # deadline + period, so work time and wake up jitter do not add up.
+    # frames that overrun their deadline are handled by the policy:
+    #   'skip'     - drop missed frames, stay on the frame grid
+    #   'catch_up' - run missed frames back to back (max. iMaxCatchUp),
+    #                then resync
+    #   'resync'   - restart the grid at the current time
+
+    def __init__(self, iPeriodUs, strPolicy='skip', clock=None, iMaxCatchUp=3):
+        self.iPeriod = iPeriodUs
+        self.strPolicy = strPolicy
+        self.clock = clock if clock is not None else rbclock()
+        self.iMaxCatchUp = iMaxCatchUp
+        self.iDeadline = None
+        self.iFrame = 0
+        # end of the last wait, start of the frame work
+        self.iWake = None
+        # per-frame telemetry (robug_telemetry), None if compiled out
+        self.tele = None
+        # session recorder / replayer (robug_replay), None if not recording
+        self.rec = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.iFrames = 0
+        self.iMisses = 0
+        self.iSkipped = 0
+        self.iLateMin = 0
+        self.iLateMax = 0
+        self.iLateSum = 0
+        self.iLateLast = 0
+
+    def start(self):
+        # first deadline one period from now
+        self.iDeadline = self.clock.ticks_add(self.clock.ticks_us(), self.iPeriod)
+
+    async def wait(self):
+        # end of frame, returns lateness of this frame in us
+        clock = self.clock
+        if self.tele:
+            self.tele.record()
+        if self.rec:
+            self.rec.frame()
+        if self.iDeadline is None:
+            self.start()
+        deadline = self.iDeadline
+        dt = clock.ticks_diff(deadline, clock.ticks_us())
+        if dt > 0:
+            await clock.sleep_us(dt)
+        else:
+            # frame work overran the deadline
+            self.iMisses += 1
+        now = clock.ticks_us()
+        self.iWake = now
+        iLate = clock.ticks_diff(now, deadline)
+
+        # statistics
+        if self.iFrames == 0 or iLate < self.iLateMin: self.iLateMin = iLate
+        if self.iFrames == 0 or iLate > self.iLateMax: self.iLateMax = iLate
+        self.iLateSum += iLate
+        self.iLateLast = iLate
+        self.iFrames += 1
+        self.iFrame += 1
+
+        # next deadline
+        iMissed = iLate // self.iPeriod
+        if iMissed == 0:
+            self.iDeadline = clock.ticks_add(deadline, self.iPeriod)
+        elif self.strPolicy == 'skip':
+            self.iSkipped += iMissed
+            self.iDeadline = clock.ticks_add(deadline, (iMissed+1) * self.iPeriod)
+        elif self.strPolicy == 'catch_up' and iMissed <= self.iMaxCatchUp:
+            self.iDeadline = clock.ticks_add(deadline, self.iPeriod)
+        else:
+            self.iDeadline = clock.ticks_add(now, self.iPeriod)
+        return iLate
+
+    async def sleep_ms(self, ms):
+        # hold for the number of whole frames closest to ms (at least one)
+        n = max(1, (ms * 1000 + self.iPeriod // 2) // self.iPeriod)
+        for _ in range(n):
+            await self.wait()
+
+    def get_stats(self):
+        iMean = self.iLateSum // self.iFrames if self.iFrames else 0
+        return {'frames': self.iFrames, 'misses': self.iMisses, 'skipped': self.iSkipped,
+                'late_min_us': self.iLateMin, 'late_mean_us': iMean,
+                'late_max_us': self.iLateMax, 'late_last_us': self.iLateLast}
+
+# --------------------------------------------------------
+# host check: frame timing on a fake clock
+# --------------------------------------------------------
+if __name__ == '__main__':
+
+    async def run(strPolicy):
+        clock = rbfakeclock()
+        s = rbsched(9000, strPolicy, clock)
+        s.start()
+        lStart = []
+        # frame 5 overruns by 3 periods, all others take 4 ms
+        for i in range(10):
+            lStart.append(clock.ticks_us())
+            clock.advance(31000 if i == 5 else 4000)
+            await s.wait()
+        return lStart, s.get_stats()
+
+    # frame 5 ends at 76000, 22000 us (2 periods and more) after its deadline:
+    # skip drops the 2 missed periods, catch_up runs frames back to back until
+    # it is on the grid again, resync starts a new grid at the late frame
+    dExpected = {
+        'skip':     ([0, 9000, 18000, 27000, 36000, 45000, 76000, 81000, 90000, 99000], 1, 2),
+        'catch_up': ([0, 9000, 18000, 27000, 36000, 45000, 76000, 80000, 84000, 88000], 5, 0),
+        'resync':   ([0, 9000, 18000, 27000, 36000, 45000, 76000, 85000, 94000, 103000], 1, 0),
+    }
+    for strPolicy, (lExpected, iMisses, iSkipped) in dExpected.items():
+        lStart, stats = asyncio.run(run(strPolicy))
+        print(strPolicy, lStart, stats)
+        assert lStart == lExpected, strPolicy
+        assert stats['misses'] == iMisses and stats['skipped'] == iSkipped, strPolicy
+        assert stats['late_max_us'] == 22000, strPolicy
+    print('OK')
@@ -0,0 +1,338 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import machine
+from machine import Pin, PWM
+from robug_constants import constants as c
+
+try:
+    import rp2
+except ImportError:
+    rp2 = None
+
+############################
+## class rbservo
+############################
+class rbservo:
+
+    # servo output backend: one duty frame of all channels (duty_u16),
+    # channel = 2*leg + joint (0 femur, 1 tibia)
+    # rbjoints stages duties into lFrame, commit() hands the channels that
+    # changed since the last commit to output() in one call.
+    # subclasses implement output(iMask), writing lOut[ch] of all channels
+    # in iMask to the hardware, and extend deinit() to switch outputs off.
+
+    def __init__(self, lPins=c._SERVO_MAP, iFreq=c._SERVO_PWM_FREQ):
+        self.lPins = lPins
+        self.iFreq = iFreq
+        self.n = len(lPins)
+        # staged and committed duty per channel, -1 -> not set / not written
+        self.lFrame = [-1] * self.n
+        self.lOut = [-1] * self.n
+        # writes done, writes skipped because the duty did not change
+        self.iWrites = 0
+        self.iSaved = 0
+        self.iCommits = 0
+
+    def commit(self):
+        # commit the staged frame, dirty channels only
+        lFrame = self.lFrame
+        lOut = self.lOut
+        iMask = 0
+        for ch in range(self.n):
+            iDuty = lFrame[ch]
+            if iDuty < 0:
+                continue
+            if iDuty == lOut[ch]:
+                self.iSaved += 1
+            else:
+                lOut[ch] = iDuty
+                iMask |= 1 << ch
+                self.iWrites += 1
+        if iMask:
+            self.output(iMask)
+        self.iCommits += 1
+
+    def commit_channel(self, ch):
+        # commit a single channel, e.g. calibrator
+        iDuty = self.lFrame[ch]
+        if iDuty < 0:
+            return
+        if iDuty == self.lOut[ch]:
+            self.iSaved += 1
+            return
+        self.lOut[ch] = iDuty
+        self.iWrites += 1
+        self.output(1 << ch)
+
+    def deinit(self, ch=None):
+        # outputs off (all channels if ch is None), written again on next commit
+        for k in range(self.n):
+            if ch is None or k == ch:
+                self.lOut[k] = -1
+
+    def reset_writes(self):
+        self.iWrites = 0
+        self.iSaved = 0
+        self.iCommits = 0
+
+    @staticmethod
+    def create(strBackend=c._SERVO_BACKEND):
+        if strBackend == 'pwm':
+            return rbservo_pwm()
+        if strBackend == 'batch':
+            return rbservo_batch()
+        if strBackend == 'pio':
+            return rbservo_pio()
+        raise ValueError('unknown servo backend: ' + strBackend)
+
+############################
+## class rbservo_pwm
+############################
+class rbservo_pwm(rbservo):
+
+    # default backend: one hardware PWM slice channel per servo,
+    # channels are written one after another
+
+    def __init__(self, lPins=c._SERVO_MAP, iFreq=c._SERVO_PWM_FREQ):
+        super().__init__(lPins, iFreq)
+        self.lPwm = []
+        for iPin in lPins:
+            pwm = PWM(Pin(iPin))
+            pwm.duty_u16(0)
+            pwm.freq(iFreq)
+            self.lPwm.append(pwm)
+
+    def commit(self):
+        # channels are written while scanning the frame (no second pass)
+        lFrame = self.lFrame
+        lOut = self.lOut
+        lPwm = self.lPwm
+        for ch in range(self.n):
+            iDuty = lFrame[ch]
+            if iDuty < 0:
+                continue
+            if iDuty == lOut[ch]:
+                self.iSaved += 1
+            else:
+                lPwm[ch].duty_u16(iDuty)
+                lOut[ch] = iDuty
+                self.iWrites += 1
+        self.iCommits += 1
+
+    def output(self, iMask):
+        lPwm = self.lPwm
+        lOut = self.lOut
+        for ch in range(self.n):
+            if iMask & (1 << ch):
+                lPwm[ch].duty_u16(lOut[ch])
+
+    def deinit(self, ch=None):
+        for k in range(self.n):
+            if ch is None or k == ch:
+                self.lPwm[k].deinit()
+        super().deinit(ch)
+
+############################
+## class rbservo_batch
+############################
+class rbservo_batch(rbservo_pwm):
+
+    # PWM backend writing the whole frame with interrupts disabled: the
+    # writes of a frame are back to back, no interrupt or task comes
+    # between two legs. the slices run free and each latches its compare
+    # register at the end of its own period, so the legs take a frame up
+    # to one PWM period (1 / c._SERVO_PWM_FREQ) apart
+
+    # dirty scan first, then the writes back to back
+    commit = rbservo.commit
+
+    def output(self, iMask):
+        lPwm = self.lPwm
+        lOut = self.lOut
+        irq = machine.disable_irq()
+        for ch in range(self.n):
+            if iMask & (1 << ch):
+                lPwm[ch].duty_u16(lOut[ch])
+        machine.enable_irq(irq)
+
+############################
+## class rbservo_pio
+############################
+class rbservo_pio(rbservo):
+
+    # one PIO state machine per leg (rp2), driving the femur and tibia pin
+    # of the leg (adjacent gpios). both pulses of a period start together,
+    # the state machine counts the period down and drops the pins at the
+    # two thresholds of the word in its TX fifo; a new word is taken at the
+    # start of the next period, the last one is repeated until then.
+    # the state machines have the same period and are started in one write
+    # of the PIO CTRL register (enable and clock divider restart together),
+    # so their periods are aligned and a frame appears on all legs in the
+    # same period. a leg started again after deinit() starts all of them
+    # again in step, cutting the current period of the other legs short.
+    # 4 state machines of one PIO block (c._SERVO_PIO_SM), the other block
+    # stays free for the wireless driver of the Pico W.
+    # word (lsb first): pins at period start (2), first threshold (13),
+    # pins after it (2), second threshold (13), pins after it (2, 0)
+
+    # pio clock: 2 cycles per count -> 1 us per count
+    _PIO_FREQ = 2000000
+    # cycles of a period outside the count loop: counter = period - _OVERHEAD
+    _OVERHEAD = 12
+    # CTRL register of PIO0 / PIO1 and its atomic set / clear aliases
+    _PIO_CTRL = (0x50200000, 0x50300000)
+    _SET = 0x2000
+    _CLR = 0x3000
+
+    def __init__(self, lPins=c._SERVO_MAP, iFreq=c._SERVO_PWM_FREQ, lSm=c._SERVO_PIO_SM):
+        super().__init__(lPins, iFreq)
+        if rp2 is None:
+            raise OSError('servo backend pio needs the rp2 port')
+        nLegs = self.n // 2
+        if len(lSm) < nLegs:
+            raise ValueError('servo backend pio needs {} state machines, _SERVO_PIO_SM has {}'.format(nLegs, len(lSm)))
+        lSm = lSm[:nLegs]
+        for iSm in lSm:
+            if not 0 <= iSm < 8 or iSm >> 2 != lSm[0] >> 2:
+                raise ValueError('servo backend pio: state machines {} not in one PIO block'.format(lSm))
+        # out base and pin bit of each channel
+        self.lBase = []
+        self.lBit = []
+        for k in range(nLegs):
+            iBase = min(lPins[2*k], lPins[2*k+1])
+            if abs(lPins[2*k] - lPins[2*k+1]) != 1:
+                raise ValueError('servo backend pio: pins of leg {} not adjacent: {}'.format(k, lPins[2*k:2*k+2]))
+            self.lBase.append(iBase)
+            self.lBit.append(1 << (lPins[2*k] - iBase))
+            self.lBit.append(1 << (lPins[2*k+1] - iBase))
+        self.iPeriodUs = 1000000 // iFreq
+        self.iCounts = self.iPeriodUs - self._OVERHEAD
+        if not 0 < self.iCounts < (1 << 13) - 2:
+            raise ValueError('servo backend pio: period {} us out of range'.format(self.iPeriodUs))
+        self.prog = _pio_servo(self.iCounts)
+        self.lSmId = lSm
+        self.iCtrl = self._PIO_CTRL[lSm[0] >> 2]
+        self.lSm = [None] * nLegs
+        self.start((1 << nLegs) - 1)
+
+    def start(self, iLegs):
+        # (re)claims the pins of the legs in the bit mask iLegs and starts
+        # their state machines together with those already running, in step
+        iMask = 0
+        for k in range(len(self.lSm)):
+            iMask |= 1 << (self.lSmId[k] & 3)
+        machine.mem32[self.iCtrl + self._CLR] = iMask
+        iMask = 0
+        for k in range(len(self.lSm)):
+            if self.lSm[k] is None and not iLegs & (1 << k):
+                continue
+            # init: pc to the program start, fifos cleared, not enabled
+            sm = rp2.StateMachine(self.lSmId[k], self.prog, freq=self._PIO_FREQ, out_base=Pin(self.lBase[k]))
+            sm.put(self.word(k))
+            self.lSm[k] = sm
+            iMask |= 1 << (self.lSmId[k] & 3)
+        # SM_ENABLE and CLKDIV_RESTART in one write
+        machine.mem32[self.iCtrl + self._SET] = iMask | (iMask << 8)
+
+    def width(self, iDuty):
+        # duty_u16 -> pulse width in us, 0 for no pulse
+        if iDuty <= 0:
+            return 0
+        return min(max((iDuty * self.iPeriodUs) >> 16, 2), self.iCounts)
+
+    def word(self, k):
+        # fifo word of leg k from lOut, see the class comment
+        iCounts = self.iCounts
+        ws = self.width(self.lOut[2*k])
+        wl = self.width(self.lOut[2*k+1])
+        bs = self.lBit[2*k]
+        bl = self.lBit[2*k+1]
+        if ws > wl:
+            ws, wl, bs, bl = wl, ws, bl, bs
+        iPins = (bs if ws else 0) | (bl if wl else 0)
+        if not ws:
+            ws = wl if wl else 2
+        if wl - ws > 1:
+            t1 = iCounts - ws + 2
+            t2 = iCounts - wl + 3
+            iPins1 = bl
+        else:
+            # one edge for both, a pair 1 us apart loses that us
+            t1 = iCounts - ws + 2
+            t2 = t1 - 1
+            iPins1 = 0
+        return iPins | (t1 << 2) | (iPins1 << 15) | (t2 << 17)
+
+    def output(self, iMask):
+        lSm = self.lSm
+        iLegs = 0
+        for k in range(len(lSm)):
+            if iMask & (3 << 2*k) and lSm[k] is None:
+                iLegs |= 1 << k
+        if iLegs:
+            # legs back after deinit: all start again with the new words
+            self.start(iLegs)
+            return
+        for k in range(len(lSm)):
+            if iMask & (3 << 2*k):
+                lSm[k].put(self.word(k))
+
+    def deinit(self, ch=None):
+        super().deinit(ch)
+        lOut = self.lOut
+        for k in range(len(self.lSm)):
+            sm = self.lSm[k]
+            if sm is None or not (ch is None or ch >> 1 == k):
+                continue
+            if lOut[2*k] < 0 and lOut[2*k+1] < 0:
+                # both channels off: stop, pins low
+                sm.active(0)
+                self.lSm[k] = None
+                Pin(self.lBase[k], Pin.OUT, value=0)
+                Pin(self.lBase[k] + 1, Pin.OUT, value=0)
+            else:
+                # the other channel of the leg goes on
+                sm.put(self.word(k))
+
+if rp2 is not None:
+
+    def _pio_servo(iCounts):
+        # x: threshold, y: period counter, isr: counter start, then the
+        # word for the next pull(noblock) (which repeats x when the fifo is empty)
+        @rp2.asm_pio(out_init=(rp2.PIO.OUT_LOW, rp2.PIO.OUT_LOW),
+                     out_shiftdir=rp2.PIO.SHIFT_RIGHT, in_shiftdir=rp2.PIO.SHIFT_LEFT)
+        def prog():
+            pull(noblock)
+            mov(x, osr)
+            mov(isr, null)
+            set(y, (iCounts >> 10) & 31)
+            in_(y, 5)
+            set(y, (iCounts >> 5) & 31)
+            in_(y, 5)
+            set(y, iCounts & 31)
+            in_(y, 5)
+            mov(y, isr)
+            mov(isr, x)
+            out(pins, 2)    [1]
+            out(x, 13)
+            label('count')
+            jmp(x_not_y, 'next')
+            out(pins, 2)
+            out(x, 13)
+            label('next')
+            jmp(y_dec, 'count')
+            mov(x, isr)     [1]
+        return prog
@@ -0,0 +1,177 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from array import array
+from robug_utils import v3view
+from robug_gait import rbgait, tbl_at, loop_step
+from robug_leg import rbleg
+
+############################
+## class rbstate
+############################
+class rbstate:
+
+    # struct of arrays core: the per tick state of all four legs in one
+    # preallocated float array, leg k at offset + k (scalars), + 3*k
+    # (vectors) or + 2*k (joints). rbleg / rbgait become views on it
+    # (rblegsoa / rbgaitsoa), the gait loop of robug runs on the array.
+    # the whole state is copied with snapshot() / restore().
+
+    I     = 0    # loop counter
+    PHASE = 4    # gait phase 1..4
+    XYZ   = 8    # gait generator output x, y, z
+    OVL   = 20   # overlay pose x, y, z
+    FOOT  = 32   # foot position x, y, z (ik input)
+    ANG   = 44   # delta, gamma in rad
+    TICKS = 52   # delta, gamma in servo ticks (ik output)
+    SIZE  = 60
+
+    def __init__(self):
+        self.a = array('f', bytes(4*self.SIZE))
+        # ik input / output of all legs (batched solver) without copying
+        mv = memoryview(self.a)
+        self.aFoot = mv[self.FOOT:self.FOOT+12]
+        self.aTicks = mv[self.TICKS:self.TICKS+8]
+
+    def snapshot(self, aInto=None):
+        # copy of the whole state, into aInto if given (no allocation)
+        if aInto is None:
+            return array('f', self.a)
+        for j in range(self.SIZE):
+            aInto[j] = self.a[j]
+        return aInto
+
+    def restore(self, aSnap):
+        for j in range(self.SIZE):
+            self.a[j] = aSnap[j]
+
+    #--------------------------------
+    #-- gait loop on the arrays -----
+    #--------------------------------
+
+    def loop_inc(self, lGait):
+        # rbgait.loop_inc() of all legs, counters in the array
+        a = self.a
+        for k in range(4):
+            a[k] = loop_step(lGait[k], a[k])
+
+    def foot_from_tables(self, lGait):
+        # relative foot positions of all legs from the compiled tables,
+        # False if a leg has no table (calculated per leg then)
+        a = self.a
+        for k in range(4):
+            if lGait[k].aTblX is None:
+                return False
+        for k in range(4):
+            g = lGait[k]
+            b = self.XYZ + 3*k
+            i = a[k]
+            n = int(i)
+            if n == i:
+                a[b]   = g.aTblX[n]
+                a[b+2] = g.aTblZ[n]
+            else:
+                a[b]   = tbl_at(g.aTblX, i, g.substeps)
+                a[b+2] = tbl_at(g.aTblZ, i, g.substeps)
+        for j in range(12):
+            a[self.FOOT+j] = a[self.XYZ+j] + a[self.OVL+j]
+        return True
+
+    def ticks_from_tables(self, lGait):
+        # servo ticks of all legs from the compiled tables
+        a = self.a
+        for k in range(4):
+            aTbl = lGait[k].aTblTicks
+            i = a[k]
+            n = int(i)
+            if n == i:
+                a[self.TICKS+2*k]   = aTbl[2*n]
+                a[self.TICKS+2*k+1] = aTbl[2*n+1]
+            else:
+                a[self.TICKS+2*k]   = tbl_at(aTbl, i, lGait[k].substeps, 2, 0)
+                a[self.TICKS+2*k+1] = tbl_at(aTbl, i, lGait[k].substeps, 2, 1)
+
+############################
+## class rbgaitsoa
+############################
+class rbgaitsoa(rbgait):
+
+    # rbgait with loop counter, phase and xyz in the rbstate array
+
+    def __init__(self, iLegID, state):
+        self.a = state.a
+        self.k = iLegID
+        super().__init__(iLegID)
+        self.xyz = v3view(state.a, state.XYZ + 3*iLegID).set(self.xyz)
+
+    def _get_i(self):
+        return self.a[self.k]
+
+    def _set_i(self, v):
+        self.a[self.k] = v
+
+    def _get_phase(self):
+        return self.a[rbstate.PHASE + self.k]
+
+    def _set_phase(self, v):
+        self.a[rbstate.PHASE + self.k] = v
+
+    i = property(_get_i, _set_i)
+    phase = property(_get_phase, _set_phase)
+
+############################
+## class rblegsoa
+############################
+class rblegsoa(rbleg):
+
+    # rbleg with foot position, overlay, joint angles and ticks in the
+    # rbstate array
+
+    def __init__(self, iLegID, lOffs, lGain, servo, state):
+        self.a = state.a
+        self.k = iLegID
+        super().__init__(iLegID, lOffs, lGain, servo)
+        self.gait = rbgaitsoa(iLegID, state)
+        self.foot_pos = v3view(state.a, state.FOOT + 3*iLegID).set(self.foot_pos)
+        self.overlay_pose = v3view(state.a, state.OVL + 3*iLegID).set(self.overlay_pose)
+
+    def _get_delta(self):
+        return self.a[rbstate.ANG + 2*self.k]
+
+    def _set_delta(self, v):
+        self.a[rbstate.ANG + 2*self.k] = v
+
+    def _get_gamma(self):
+        return self.a[rbstate.ANG + 2*self.k + 1]
+
+    def _set_gamma(self, v):
+        self.a[rbstate.ANG + 2*self.k + 1] = v
+
+    def _get_delta_ticks(self):
+        return self.a[rbstate.TICKS + 2*self.k]
+
+    def _set_delta_ticks(self, v):
+        self.a[rbstate.TICKS + 2*self.k] = v
+
+    def _get_gamma_ticks(self):
+        return self.a[rbstate.TICKS + 2*self.k + 1]
+
+    def _set_gamma_ticks(self, v):
+        self.a[rbstate.TICKS + 2*self.k + 1] = v
+
+    delta = property(_get_delta, _set_delta)
+    gamma = property(_get_gamma, _set_gamma)
+    deltaTicks = property(_get_delta_ticks, _set_delta_ticks)
+    gammaTicks = property(_get_gamma_ticks, _set_gamma_ticks)
@@ -0,0 +1,200 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import struct
+import asyncio
+from array import array
+from robug_constants import constants as c
+
+try:
+    sleep_ms = asyncio.sleep_ms
+except AttributeError:
+    # cpython
+    def sleep_ms(ms): return asyncio.sleep(ms / 1000)
+
+############################
+## class rbtelemetry
+############################
+class rbtelemetry:
+
+    # per-frame telemetry of the motion loop
+    # record() is called by the frame scheduler at the end of every frame
+    # (rbsched.wait, animation frames included) and writes one row of
+    # int16 words into a preallocated ring, no allocation per frame.
+    # the stream tasks send the rows not sent yet in batches: one datagram
+    # per batch over UDP, the same datagram in notify sized chunks over BLE.
+    # compiled out with c._TELE = False: no recorder is created and the
+    # scheduler hook costs a single 'if self.tele:'
+
+    # row layout (int16 words)
+    FRAME = 0    # frame number, 15 low bits, 15 high bits
+    LOOP  = 2    # loop counter of leg 0 in 1/16 ticks
+    PHASE = 3    # PH_* bits of all legs (robug.iPhaseMask), 15 low bits, high bits
+    CMD   = 5    # (op << 4) | sub of the command taken in this frame, 0 none
+    WORK  = 6    # work time of the frame in us
+    LATE  = 7    # wake up lateness of the frame in us (rbsched)
+    DIST  = 8    # latest range in mm (rbtof)
+    SOC   = 9    # battery voltage in 10 mV, set by the app
+    FOOT  = 10   # foot positions x, y, z per leg in 0.1 mm
+    TICKS = 22   # servo ticks delta, gamma per leg staged for the next frame
+    ROW   = 30
+
+    # datagram: header words magic ('RB'), words per row, rows, sequence
+    # number, then the rows. little endian like the rp2
+    MAGIC  = 0x4252
+    HEADER = 4
+    _HEADER = '<hhhh'
+
+    def __init__(self, robot, sched, iFrames=c._TELE_FRAMES, iBatch=c._TELE_BATCH):
+        self.r = robot
+        self.sched = sched
+        self.iSize = iFrames
+        self.iBatch = iBatch
+        self.aRing = array('h', bytes(2*self.ROW*iFrames))
+        self.aOut = array('h', bytes(2*(self.HEADER + self.ROW*iBatch)))
+        # command of the current frame, battery voltage (set by the app)
+        self.iCmd = 0
+        self.iSoc = 0
+        self.reset()
+
+    def reset(self):
+        # rows written, rows sent, rows overwritten before they were sent
+        self.iCount = 0
+        self.iSent = 0
+        self.iDropped = 0
+        self.iSeq = 0
+
+    #--------------------------------
+    #-- probe (hot path) ------------
+    #--------------------------------
+
+    def record(self):
+        r = self.r
+        sched = self.sched
+        clock = sched.clock
+        a = self.aRing
+        k = (self.iCount % self.iSize) * self.ROW
+        iFrame = sched.iFrame
+        a[k] = iFrame & 0x7FFF
+        a[k+1] = (iFrame >> 15) & 0x7FFF
+        a[k+self.LOOP] = min(int(r.lGait[0].i * 16), 0x7FFF)
+        iMask = r.iPhaseMask
+        a[k+self.PHASE] = iMask & 0x7FFF
+        a[k+self.PHASE+1] = iMask >> 15
+        a[k+self.CMD] = self.iCmd
+        self.iCmd = 0
+        iWork = 0 if sched.iWake is None else clock.ticks_diff(clock.ticks_us(), sched.iWake)
+        a[k+self.WORK] = min(iWork, 0x7FFF)
+        a[k+self.LATE] = min(sched.iLateLast, 0x7FFF)
+        a[k+self.DIST] = r.tof.iRange
+        a[k+self.SOC] = self.iSoc
+        j = k + self.FOOT
+        for i in range(4):
+            p = r.lLeg[i].foot_pos
+            a[j] = int(p.x * 10)
+            a[j+1] = int(p.y * 10)
+            a[j+2] = int(p.z * 10)
+            j += 3
+        j = k + self.TICKS
+        if c._IK_BATCH:
+            b = r.aTickBuf
+            t0 = r.iTick0
+            for i in range(8):
+                a[j+i] = int(b[t0+i])
+        else:
+            for i in range(4):
+                leg = r.lLeg[i]
+                a[j] = int(leg.deltaTicks)
+                a[j+1] = int(leg.gammaTicks)
+                j += 2
+        self.iCount += 1
+
+    #--------------------------------
+    #-- streaming -------------------
+    #--------------------------------
+
+    def next_datagram(self):
+        # the next batch of unsent rows as one datagram, None if there is none.
+        # rows overwritten before they were sent are counted in iDropped
+        n = self.iCount - self.iSent
+        if n <= 0:
+            return None
+        if n > self.iSize:
+            self.iDropped += n - self.iSize
+            self.iSent = self.iCount - self.iSize
+            n = self.iSize
+        k = self.iSent % self.iSize
+        # a batch does not wrap around the end of the ring
+        n = min(n, self.iBatch, self.iSize - k)
+        d = self.aOut
+        d[0] = self.MAGIC
+        d[1] = self.ROW
+        d[2] = n
+        d[3] = self.iSeq & 0x7FFF
+        d[self.HEADER:self.HEADER + n*self.ROW] = self.aRing[k*self.ROW:(k+n)*self.ROW]
+        self.iSent += n
+        self.iSeq += 1
+        return memoryview(d)[:self.HEADER + n*self.ROW]
+
+    async def stream_udp(self, sock, addr, iPeriodMs=c._TELE_PERIOD_MS):
+        # non-blocking socket, a datagram the socket refuses is lost
+        self.iSent = self.iCount
+        while True:
+            d = self.next_datagram()
+            while d is not None:
+                try:
+                    sock.sendto(d, addr)
+                except OSError:
+                    self.iDropped += d[2]
+                d = self.next_datagram()
+            await sleep_ms(iPeriodMs)
+
+    async def stream_ble(self, char, connection, iPeriodMs=c._TELE_PERIOD_MS, iChunk=c._TELE_BLE_CHUNK):
+        # datagrams split into notifies of iChunk bytes, the receiver
+        # concatenates them (see unpack)
+        self.iSent = self.iCount
+        while connection.is_connected():
+            d = self.next_datagram()
+            while d is not None:
+                data = bytes(d)
+                for k in range(0, len(data), iChunk):
+                    char.notify(connection, data[k:k+iChunk])
+                    await sleep_ms(0)
+                d = self.next_datagram()
+            await sleep_ms(iPeriodMs)
+
+    @classmethod
+    def unpack(cls, data):
+        # host side decoder: datagrams (UDP) or their concatenation (BLE)
+        # -> list of rows (tuples of ROW words, FRAME and PHASE joined).
+        # scans for the magic, broken or cut datagrams are skipped
+        data = bytes(data)
+        bMagic = struct.pack('<h', cls.MAGIC)
+        lRows = []
+        k = data.find(bMagic)
+        while k >= 0 and k + 2*cls.HEADER <= len(data):
+            iMagic, iRow, n, iSeq = struct.unpack_from(cls._HEADER, data, k)
+            j = k + 2*cls.HEADER
+            if iRow != cls.ROW or n <= 0 or j + 2*n*cls.ROW > len(data):
+                k = data.find(bMagic, k + 1)
+                continue
+            a = array('h', data[j:j + 2*n*cls.ROW])
+            for i in range(0, len(a), cls.ROW):
+                row = list(a[i:i+cls.ROW])
+                row[cls.FRAME] |= row[cls.FRAME+1] << 15
+                row[cls.PHASE] |= row[cls.PHASE+1] << 15
+                lRows.append(tuple(row))
+            k = data.find(bMagic, j + 2*n*cls.ROW)
+        return lRows
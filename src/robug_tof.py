@@ -0,0 +1,246 @@
+# Copyright (c) 2026 RobotsForAll
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+
+try:
+    from machine import Pin
+except ImportError:
+    # cpython, host check below: stand-ins of the host tooling (host/stubs)
+    import os, sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import host
+    host.install()
+    from machine import Pin
+from robug_constants import constants as c
+from robug_filter import rbfilter
+
+try:
+    from time import ticks_ms, ticks_diff
+except ImportError:
+    # cpython
+    from time import monotonic_ns
+    def ticks_ms(): return monotonic_ns() // 1000000
+    def ticks_diff(a, b): return a - b
+
+try:
+    sleep_ms = asyncio.sleep_ms
+except AttributeError:
+    # cpython
+    def sleep_ms(ms): return asyncio.sleep(ms / 1000)
+
+############################
+## class rbtof
+############################
+class rbtof:
+
+    # asynchronous ranging on the VL53L0X driver (tof_sensor.vl53l0x).
+    # run() starts continuous timed ranging and waits for each result
+    # with await: on the GPIO1 interrupt if the pin is wired, else by
+    # polling the interrupt status every c._TOF_POLL_MS. the result is
+    # published into the sample slot (range, time stamp, count) and fed to
+    # the filters (robug_filter), readers take the sample or the filtered
+    # estimate from there and never touch the I2C bus or wait for the sensor.
+    # set_profile() selects timing budget and rate (c._TOF_PROFILES), the
+    # ranging task applies it between two results.
+
+    # sensor reading for 'no target', until the first sample arrives
+    NO_RANGE = 8190
+
+    def __init__(self, vl53, strProfile=c._TOF_PROFILE, iPin=c._PIN_TOF_INT):
+        self.vl53 = vl53
+        # active profile, profile waiting for the ranging task (or None)
+        self.strProfile = None
+        self.strPending = strProfile
+        self.iPeriodMs = c._TOF_PROFILES[strProfile][1]
+        self.iSwitches = 0
+        # sample slot: latest range in mm, its ticks_ms, samples so far
+        self.iRange = self.NO_RANGE
+        self.iTime = ticks_ms()
+        self.iCount = 0
+        self.iErrors = 0
+        # default filter (c._TOF_FILTER), more with add_filter()
+        self.filter = rbfilter.create()
+        self.lFilter = [self.filter]
+        # set on every sample, see wait_samples()
+        self.evt = asyncio.Event()
+        self.bRunning = False
+        self.flag = None
+        if iPin is not None:
+            # GPIO1 goes low on a new sample (active low, see driver init)
+            self.flag = asyncio.ThreadSafeFlag()
+            self.pin = Pin(iPin, Pin.IN, Pin.PULL_UP)
+            self.pin.irq(self._irq, Pin.IRQ_FALLING)
+
+    def _irq(self, pin):
+        self.flag.set()
+
+    #--------------------------------
+    #-- ranging task ----------------
+    #--------------------------------
+
+    async def run(self):
+        vl53 = self.vl53
+        self.apply_profile()
+        self.bRunning = True
+        try:
+            while True:
+                if self.flag is not None:
+                    if self.strPending is None:
+                        await self.flag.wait()
+                else:
+                    # the next result is due one period after the last one,
+                    # a profile change cuts the wait short
+                    iWait = self.iPeriodMs - c._TOF_POLL_MS
+                    while iWait > 0 and self.strPending is None:
+                        await sleep_ms(c._TOF_POLL_MS)
+                        iWait -= c._TOF_POLL_MS
+                if self.strPending is not None:
+                    if not self.apply_profile():
+                        await sleep_ms(self.iPeriodMs)
+                    continue
+                try:
+                    # the pin may have fired on a stale result, poll anyway
+                    while not vl53.data_ready():
+                        await sleep_ms(c._TOF_POLL_MS)
+                    self.publish(vl53.read_range_result())
+                except OSError:
+                    # I2C error, the slot keeps the last sample
+                    self.iErrors += 1
+                    await sleep_ms(self.iPeriodMs)
+        finally:
+            self.bRunning = False
+            vl53.stop_continuous()
+
+    #--------------------------------
+    #-- ranging profiles ------------
+    #--------------------------------
+
+    def set_profile(self, strProfile):
+        # cheap if unchanged, called by the motion controller every frame
+        if strProfile == self.strProfile:
+            self.strPending = None
+        elif strProfile != self.strPending:
+            if strProfile not in c._TOF_PROFILES:
+                raise ValueError('unknown ranging profile: ' + strProfile)
+            self.strPending = strProfile
+            if self.flag is not None:
+                self.flag.set()
+
+    def get_profile(self):
+        return self.strProfile
+
+    def apply_profile(self):
+        # continuous ranging restarted with the pending profile. setting the
+        # budget takes a few dozen register accesses, on profile changes only
+        strProfile = self.strPending
+        self.strPending = None
+        iBudgetUs, iPeriodMs, fRateLimit = c._TOF_PROFILES[strProfile]
+        vl53 = self.vl53
+        try:
+            if self.bRunning:
+                vl53.stop_continuous()
+            vl53.signal_rate_limit = fRateLimit
+            vl53.measurement_timing_budget = iBudgetUs
+            vl53.start_continuous(iPeriodMs)
+        except OSError:
+            # I2C error, retried by the ranging task
+            self.iErrors += 1
+            self.strPending = strProfile
+            return False
+        self.strProfile = strProfile
+        self.iPeriodMs = iPeriodMs
+        self.iSwitches += 1
+        return True
+
+    #--------------------------------
+    #-- filters ---------------------
+    #--------------------------------
+
+    def add_filter(self, f):
+        self.lFilter.append(f)
+        return f
+
+    def publish(self, iRange):
+        self.iRange = iRange
+        self.iTime = ticks_ms()
+        self.iCount += 1
+        for f in self.lFilter:
+            f.add(iRange, self.iTime)
+        self.evt.set()
+        self.evt.clear()
+
+    #--------------------------------
+    #-- readers (non-blocking) ------
+    #--------------------------------
+
+    def latest(self):
+        # (range in mm, ticks_ms of the sample)
+        return self.iRange, self.iTime
+
+    def age_ms(self):
+        return ticks_diff(ticks_ms(), self.iTime)
+
+    def value(self):
+        # estimate of the default filter, the raw sample until there is one
+        v = self.filter.iValue
+        return self.iRange if v is None else v
+
+    async def wait_samples(self, n=1):
+        # wait until n new samples are in the slot, e.g. after a pose change
+        iCount = self.iCount + n
+        while self.iCount < iCount:
+            await self.evt.wait()
+
+# --------------------------------------------------------
+# host check: samples arrive while the event loop keeps running
+# --------------------------------------------------------
+if __name__ == '__main__':
+
+    from machine import I2C
+    from tof_sensor import vl53l0x
+
+    async def ticker(l):
+        while True:
+            await sleep_ms(c._GAIT_LOOP_TIME)
+            l[0] += 1
+
+    async def demo():
+        # polled (no interrupt pin), the sensor model reads 500 mm
+        vl53 = vl53l0x(I2C(c._I2C_BUS))
+        tof = rbtof(vl53, 'fast', None)
+        l = [0]
+        t1 = asyncio.create_task(tof.run())
+        t2 = asyncio.create_task(ticker(l))
+        t0 = ticks_ms()
+        await tof.wait_samples(6)
+        iElapsed = ticks_diff(ticks_ms(), t0)
+        print('range', tof.latest()[0], 'filtered', tof.value(), 'samples', tof.iCount,
+              'frames', l[0], 'in', iElapsed, 'ms')
+        assert tof.iCount >= 6 and tof.latest()[0] == 500 and tof.value() == 500
+        # the gait ticker kept its pace while the ranging task waited
+        assert l[0] >= iElapsed // c._GAIT_LOOP_TIME // 2 > 0, (l[0], iElapsed)
+        # a profile change is applied by the ranging task between two results
+        iBudget = vl53.measurement_timing_budget
+        tof.set_profile('accurate')
+        await tof.wait_samples(1)
+        assert tof.get_profile() == 'accurate' and tof.iPeriodMs == c._TOF_PROFILES['accurate'][1]
+        assert vl53.measurement_timing_budget > iBudget, (iBudget, vl53.measurement_timing_budget)
+        print('timing budget', iBudget, '->', vl53.measurement_timing_budget, 'us')
+        t1.cancel()
+        t2.cancel()
+        print('OK')
+
+    asyncio.run(demo())
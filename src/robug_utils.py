@@ -13,10 +13,16 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import copy
+from math import sin, cos
 
 class v3:
 
+    # fixed attribute layout, no per instance dict (where supported)
+    # all arithmetic works in place and returns self, so calls can be
+    # chained without allocating temporary vectors
+
+    __slots__ = ('x', 'y', 'z')
+
     def __init__(self, x=0.0, y=0.0, z=0.0):
         self.x = x
         self.y = y
@@ -35,26 +41,86 @@ class v3:
         self.x -= A.x
         self.y -= A.y
         self.z -= A.z
-        
+        return(self)
+
+    def scale(self, k):
+        self.x *= k
+        self.y *= k
+        self.z *= k
+        return(self)
+
     def mult(self, k):
-        self.x = self.x * k
-        self.y = self.y * k
-        self.z = self.z * k 
+        return self.scale(k)
+
+    def rotate_xz(self, theta):
+        # rotate around y axis (x/z plane)
+        cos_theta = cos(theta)
+        sin_theta = sin(theta)
+        x = self.x
+        self.x = x * cos_theta - self.z * sin_theta
+        self.z = x * sin_theta + self.z * cos_theta
+        return(self)
+
+    def lerp_into(self, A, B, t):
+        # self = A + (B - A) * t
+        self.x = A.x + (B.x - A.x) * t
+        self.y = A.y + (B.y - A.y) * t
+        self.z = A.z + (B.z - A.z) * t
+        return(self)
 
     def set(self, A):
         self.x = A.x
         self.y = A.y
         self.z = A.z
-        
+        return(self)
+
+    def copy_into(self, A):
+        A.x = self.x
+        A.y = self.y
+        A.z = self.z
+        return(A)
+
     def set_from_list(self, L):
         self.x = L[0]
         self.y = L[1]
-        self.z = L[2]       
-    
+        self.z = L[2]
+        return(self)
+
     def to_list(self):
         return [self.x, self.y, self.z]
-    
-    # micropython says: not deepcopy-able
-    # works in cpython -> investigate
-#     def copy(self):
-#         return copy.deepcopy(self)    
+
+    def copy(self):
+        return v3(self.x, self.y, self.z)
+
+class v3view(v3):
+
+    # v3 whose components live in a float array at a[k], a[k+1], a[k+2]
+    # (struct of arrays state, robug_state), all v3 methods work on it
+
+    __slots__ = ('a', 'k')
+
+    def __init__(self, a, k):
+        self.a = a
+        self.k = k
+
+    def _get_x(self):
+        return self.a[self.k]
+
+    def _set_x(self, v):
+        self.a[self.k] = v
+
+    def _get_y(self):
+        return self.a[self.k+1]
+
+    def _set_y(self, v):
+        self.a[self.k+1] = v
+
+    def _get_z(self):
+        return self.a[self.k+2]
+
+    def _set_z(self, v):
+        self.a[self.k+2] = v
+
+    x = property(_get_x, _set_x)
+    y = property(_get_y, _set_y)
+    z = property(_get_z, _set_z)
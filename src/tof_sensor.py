@@ -23,70 +23,71 @@ SOFTWARE.'''
 import time
 from micropython import const
 
+# Configuration constants (module level, so the methods also see them on CPython):
+_SYSRANGE_START = const(0x00)
+_SYSTEM_THRESH_HIGH = const(0x0C)
+_SYSTEM_THRESH_LOW = const(0x0E)
+_SYSTEM_SEQUENCE_CONFIG = const(0x01)
+_SYSTEM_RANGE_CONFIG = const(0x09)
+_SYSTEM_INTERMEASUREMENT_PERIOD = const(0x04)
+_SYSTEM_INTERRUPT_CONFIG_GPIO = const(0x0A)
+_GPIO_HV_MUX_ACTIVE_HIGH = const(0x84)
+_SYSTEM_INTERRUPT_CLEAR = const(0x0B)
+_RESULT_INTERRUPT_STATUS = const(0x13)
+_RESULT_RANGE_STATUS = const(0x14)
+_RESULT_CORE_AMBIENT_WINDOW_EVENTS_RTN = const(0xBC)
+_RESULT_CORE_RANGING_TOTAL_EVENTS_RTN = const(0xC0)
+_RESULT_CORE_AMBIENT_WINDOW_EVENTS_REF = const(0xD0)
+_RESULT_CORE_RANGING_TOTAL_EVENTS_REF = const(0xD4)
+_RESULT_PEAK_SIGNAL_RATE_REF = const(0xB6)
+_ALGO_PART_TO_PART_RANGE_OFFSET_MM = const(0x28)
+_I2C_SLAVE_DEVICE_ADDRESS = const(0x8A)
+_MSRC_CONFIG_CONTROL = const(0x60)
+_PRE_RANGE_CONFIG_MIN_SNR = const(0x27)
+_PRE_RANGE_CONFIG_VALID_PHASE_LOW = const(0x56)
+_PRE_RANGE_CONFIG_VALID_PHASE_HIGH = const(0x57)
+_PRE_RANGE_MIN_COUNT_RATE_RTN_LIMIT = const(0x64)
+_FINAL_RANGE_CONFIG_MIN_SNR = const(0x67)
+_FINAL_RANGE_CONFIG_VALID_PHASE_LOW = const(0x47)
+_FINAL_RANGE_CONFIG_VALID_PHASE_HIGH = const(0x48)
+_FINAL_RANGE_CONFIG_MIN_COUNT_RATE_RTN_LIMIT = const(0x44)
+_PRE_RANGE_CONFIG_SIGMA_THRESH_HI = const(0x61)
+_PRE_RANGE_CONFIG_SIGMA_THRESH_LO = const(0x62)
+_PRE_RANGE_CONFIG_VCSEL_PERIOD = const(0x50)
+_PRE_RANGE_CONFIG_TIMEOUT_MACROP_HI = const(0x51)
+_PRE_RANGE_CONFIG_TIMEOUT_MACROP_LO = const(0x52)
+_SYSTEM_HISTOGRAM_BIN = const(0x81)
+_HISTOGRAM_CONFIG_INITIAL_PHASE_SELECT = const(0x33)
+_HISTOGRAM_CONFIG_READOUT_CTRL = const(0x55)
+_FINAL_RANGE_CONFIG_VCSEL_PERIOD = const(0x70)
+_FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI = const(0x71)
+_FINAL_RANGE_CONFIG_TIMEOUT_MACROP_LO = const(0x72)
+_CROSSTALK_COMPENSATION_PEAK_RATE_MCPS = const(0x20)
+_MSRC_CONFIG_TIMEOUT_MACROP = const(0x46)
+_SOFT_RESET_GO2_SOFT_RESET_N = const(0xBF)
+_IDENTIFICATION_MODEL_ID = const(0xC0)
+_IDENTIFICATION_REVISION_ID = const(0xC2)
+_OSC_CALIBRATE_VAL = const(0xF8)
+_GLOBAL_CONFIG_VCSEL_WIDTH = const(0x32)
+_GLOBAL_CONFIG_SPAD_ENABLES_REF_0 = const(0xB0)
+_GLOBAL_CONFIG_SPAD_ENABLES_REF_1 = const(0xB1)
+_GLOBAL_CONFIG_SPAD_ENABLES_REF_2 = const(0xB2)
+_GLOBAL_CONFIG_SPAD_ENABLES_REF_3 = const(0xB3)
+_GLOBAL_CONFIG_SPAD_ENABLES_REF_4 = const(0xB4)
+_GLOBAL_CONFIG_SPAD_ENABLES_REF_5 = const(0xB5)
+_GLOBAL_CONFIG_REF_EN_START_SELECT = const(0xB6)
+_DYNAMIC_SPAD_NUM_REQUESTED_REF_SPAD = const(0x4E)
+_DYNAMIC_SPAD_REF_EN_START_OFFSET = const(0x4F)
+_POWER_MANAGEMENT_GO1_POWER_FORCE = const(0x80)
+_VHV_CONFIG_PAD_SCL_SDA__EXTSUP_HV = const(0x89)
+_ALGO_PHASECAL_LIM = const(0x30)
+_ALGO_PHASECAL_CONFIG_TIMEOUT = const(0x30)
+_VCSEL_PERIOD_PRE_RANGE = const(0)
+_VCSEL_PERIOD_FINAL_RANGE = const(1)
+
+
 class vl53l0x:
     
-    # Configuration constants:
-    _SYSRANGE_START = const(0x00)
-    _SYSTEM_THRESH_HIGH = const(0x0C)
-    _SYSTEM_THRESH_LOW = const(0x0E)
-    _SYSTEM_SEQUENCE_CONFIG = const(0x01)
-    _SYSTEM_RANGE_CONFIG = const(0x09)
-    _SYSTEM_INTERMEASUREMENT_PERIOD = const(0x04)
-    _SYSTEM_INTERRUPT_CONFIG_GPIO = const(0x0A)
-    _GPIO_HV_MUX_ACTIVE_HIGH = const(0x84)
-    _SYSTEM_INTERRUPT_CLEAR = const(0x0B)
-    _RESULT_INTERRUPT_STATUS = const(0x13)
-    _RESULT_RANGE_STATUS = const(0x14)
-    _RESULT_CORE_AMBIENT_WINDOW_EVENTS_RTN = const(0xBC)
-    _RESULT_CORE_RANGING_TOTAL_EVENTS_RTN = const(0xC0)
-    _RESULT_CORE_AMBIENT_WINDOW_EVENTS_REF = const(0xD0)
-    _RESULT_CORE_RANGING_TOTAL_EVENTS_REF = const(0xD4)
-    _RESULT_PEAK_SIGNAL_RATE_REF = const(0xB6)
-    _ALGO_PART_TO_PART_RANGE_OFFSET_MM = const(0x28)
-    _I2C_SLAVE_DEVICE_ADDRESS = const(0x8A)
-    _MSRC_CONFIG_CONTROL = const(0x60)
-    _PRE_RANGE_CONFIG_MIN_SNR = const(0x27)
-    _PRE_RANGE_CONFIG_VALID_PHASE_LOW = const(0x56)
-    _PRE_RANGE_CONFIG_VALID_PHASE_HIGH = const(0x57)
-    _PRE_RANGE_MIN_COUNT_RATE_RTN_LIMIT = const(0x64)
-    _FINAL_RANGE_CONFIG_MIN_SNR = const(0x67)
-    _FINAL_RANGE_CONFIG_VALID_PHASE_LOW = const(0x47)
-    _FINAL_RANGE_CONFIG_VALID_PHASE_HIGH = const(0x48)
-    _FINAL_RANGE_CONFIG_MIN_COUNT_RATE_RTN_LIMIT = const(0x44)
-    _PRE_RANGE_CONFIG_SIGMA_THRESH_HI = const(0x61)
-    _PRE_RANGE_CONFIG_SIGMA_THRESH_LO = const(0x62)
-    _PRE_RANGE_CONFIG_VCSEL_PERIOD = const(0x50)
-    _PRE_RANGE_CONFIG_TIMEOUT_MACROP_HI = const(0x51)
-    _PRE_RANGE_CONFIG_TIMEOUT_MACROP_LO = const(0x52)
-    _SYSTEM_HISTOGRAM_BIN = const(0x81)
-    _HISTOGRAM_CONFIG_INITIAL_PHASE_SELECT = const(0x33)
-    _HISTOGRAM_CONFIG_READOUT_CTRL = const(0x55)
-    _FINAL_RANGE_CONFIG_VCSEL_PERIOD = const(0x70)
-    _FINAL_RANGE_CONFIG_TIMEOUT_MACROP_HI = const(0x71)
-    _FINAL_RANGE_CONFIG_TIMEOUT_MACROP_LO = const(0x72)
-    _CROSSTALK_COMPENSATION_PEAK_RATE_MCPS = const(0x20)
-    _MSRC_CONFIG_TIMEOUT_MACROP = const(0x46)
-    _SOFT_RESET_GO2_SOFT_RESET_N = const(0xBF)
-    _IDENTIFICATION_MODEL_ID = const(0xC0)
-    _IDENTIFICATION_REVISION_ID = const(0xC2)
-    _OSC_CALIBRATE_VAL = const(0xF8)
-    _GLOBAL_CONFIG_VCSEL_WIDTH = const(0x32)
-    _GLOBAL_CONFIG_SPAD_ENABLES_REF_0 = const(0xB0)
-    _GLOBAL_CONFIG_SPAD_ENABLES_REF_1 = const(0xB1)
-    _GLOBAL_CONFIG_SPAD_ENABLES_REF_2 = const(0xB2)
-    _GLOBAL_CONFIG_SPAD_ENABLES_REF_3 = const(0xB3)
-    _GLOBAL_CONFIG_SPAD_ENABLES_REF_4 = const(0xB4)
-    _GLOBAL_CONFIG_SPAD_ENABLES_REF_5 = const(0xB5)
-    _GLOBAL_CONFIG_REF_EN_START_SELECT = const(0xB6)
-    _DYNAMIC_SPAD_NUM_REQUESTED_REF_SPAD = const(0x4E)
-    _DYNAMIC_SPAD_REF_EN_START_OFFSET = const(0x4F)
-    _POWER_MANAGEMENT_GO1_POWER_FORCE = const(0x80)
-    _VHV_CONFIG_PAD_SCL_SDA__EXTSUP_HV = const(0x89)
-    _ALGO_PHASECAL_LIM = const(0x30)
-    _ALGO_PHASECAL_CONFIG_TIMEOUT = const(0x30)
-    _VCSEL_PERIOD_PRE_RANGE = const(0)
-    _VCSEL_PERIOD_FINAL_RANGE = const(1)    
-    
     # Class-level buffer for reading and writing data with the sensor.
     # Less memory but not re-entrant or thread safe!
     _BUFFER_8 = bytearray(1)
@@ -517,6 +518,19 @@ class vl53l0x:
         self._write_u8(_SYSTEM_INTERRUPT_CLEAR, 0x01)
         return range_mm
 
+    def data_ready(self):
+        """Returns True if a new range result is available (non-blocking).
+        """
+        return (self._read_u8(_RESULT_INTERRUPT_STATUS) & 0x07) != 0
+
+    def read_range_result(self):
+        """Returns the range result in millimeters and clears the interrupt
+        without waiting, call when data_ready() is True.
+        """
+        range_mm = self._read_u16(_RESULT_RANGE_STATUS + 10)
+        self._write_u8(_SYSTEM_INTERRUPT_CLEAR, 0x01)
+        return range_mm
+
     def read_range_single_millimeters(self):
         """Perform a single reading of the range for an object in front of
         the sensor and return the distance in millimeters.